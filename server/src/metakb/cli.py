@@ -6,20 +6,13 @@ import asyncio
 import importlib.metadata as importlib_metadata
 import logging
 import os
-import re
-import tempfile
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from enum import Enum
 from pathlib import Path
 from timeit import default_timer as timer
-from zipfile import ZipFile
 
-import boto3
 import click
-from boto3.exceptions import ResourceLoadException
-from botocore import UNSIGNED
-from botocore.config import Config
 from botocore.exceptions import ClientError, EndpointConnectionError
 
 from metakb import __version__
@@ -42,12 +35,34 @@ from metakb.normalizers import (
 )
 from metakb.normalizers import check_normalizers as check_normalizer_health
 from metakb.repository.base import AbstractRepository
+from metakb.repository.neo4j_bulk_import import get_import_command
 from metakb.repository.neo4j_repository import (
     Neo4jRepository,
+    create_database,
+    database_exists,
+    get_database_alias_target,
     get_driver,
+    set_database_alias,
 )
+from metakb.repository.neo4j_schema import (
+    await_indexes,
+    get_index_status,
+    get_schema_version,
+    migrate_schema,
+)
+from metakb.repository.query_metrics import QueryMetrics
 from metakb.schemas.app import SourceName
-from metakb.services.load_data import load_from_json
+from metakb.services.load_checkpoint import LoadCheckpoint
+from metakb.services.load_data import (
+    LOAD_BATCH_SIZE,
+    StagedLoadValidationError,
+    export_bulk_import,
+    load_from_json,
+    load_from_json_concurrent,
+    load_from_json_differential,
+    validate_staged_stats,
+)
+from metakb.services.s3_snapshot import retrieve_snapshot
 from metakb.source_data import SourceDataStore
 from metakb.transformers import CivicTransformer, MoaTransformer
 from metakb.transformers.fda_poda import FdaPodaTransformer
@@ -64,6 +79,15 @@ def _echo_info(msg: str) -> None:
     _logger.info(msg)
 
 
+def _echo_query_metrics(query_metrics: QueryMetrics | None) -> None:
+    """Log and echo a summary of query timings, if they were collected
+
+    :param query_metrics: collected timings
+    """
+    if query_metrics is not None:
+        _echo_info(f"Query timings:\n{query_metrics.format_summary()}")
+
+
 def _help_msg(msg: str = "") -> None:
     """Handle invalid user input.
 
@@ -454,24 +478,59 @@ async def transform_file(
 
 
 @asynccontextmanager
-async def _get_repository(db_url: str | None) -> AsyncGenerator[AbstractRepository]:
+async def _get_repositories(
+    db_url: str | None,
+    count: int,
+    query_metrics: QueryMetrics | None = None,
+    database: str | None = None,
+) -> AsyncGenerator[list[AbstractRepository]]:
+    """Acquire several repository instances for CLI functions, each backed by its own
+    session from a single shared driver.
+
+    Useful for issuing DB operations concurrently. The DB schema is initialized via the
+    first repository.
+
+    :param db_url: URL endpoint for the application Neo4j database.
+    :param count: number of repository instances to create
+    :param query_metrics: if given, record query timings from all repositories here
+    :param database: name of database (or alias) to use. Defaults to the configured
+        DB name, or the server default if that's not set.
+    :return: list of repository instances
+    """
+    driver = get_driver(db_url)
+    database = database or get_config().db_name
+    sessions = [driver.session(database=database) for _ in range(count)]
+    repos: list[AbstractRepository] = [
+        Neo4jRepository(s, query_metrics) for s in sessions
+    ]
+    try:
+        await repos[0].initialize()
+        yield repos
+    finally:
+        for session in sessions:
+            await session.close()
+        await driver.close()
+
+
+@asynccontextmanager
+async def _get_repository(
+    db_url: str | None,
+    query_metrics: QueryMetrics | None = None,
+    database: str | None = None,
+) -> AsyncGenerator[AbstractRepository]:
     """Acquire repository session instance for CLI functions.
 
     This function wraps the driver factory function in a context manager to ensure proper
     lifespan management (i.e. close it when the session concludes)
 
     :param db_url: URL endpoint for the application Neo4j database.
+    :param query_metrics: if given, record query timings here
+    :param database: name of database (or alias) to use. Defaults to the configured
+        DB name, or the server default if that's not set.
     :return: Graph driver instance
     """
-    driver = get_driver(db_url)
-    session = driver.session()
-    repo = Neo4jRepository(session)
-    try:
-        await repo.initialize()
+    async with _get_repositories(db_url, 1, query_metrics, database) as (repo,):
         yield repo
-    finally:
-        await session.close()
-        await driver.close()
 
 
 async def _clear_db(db_url: str) -> None:
@@ -503,43 +562,309 @@ def clear_db(db_url: str) -> None:
     asyncio.run(_clear_db(db_url))
 
 
-async def _load_cdm(db_url: str, from_s3: bool, cdm_files: tuple[Path, ...]) -> None:
+async def _migrate_db(db_url: str, wait: int) -> None:
+    """Apply pending schema migrations and report index status
+
+    Dispatch with asyncio.run() from a `click` function
+
+    :param db_url: URL endpoint for the application Neo4j database.
+    :param wait: seconds to wait for indexes to come online. Don't wait if 0.
+    """
+    driver = get_driver(db_url)
+    try:
+        async with driver.session(database=get_config().db_name) as session:
+            applied = await migrate_schema(session)
+            version = await get_schema_version(session)
+            if applied:
+                _echo_info(f"Applied schema migrations {applied}")
+            _echo_info(f"DB schema is at version {version}")
+            if wait:
+                click.echo("Waiting for indexes to come online...")
+                await await_indexes(session, wait)
+            for index in await get_index_status(session):
+                click.echo(
+                    f"{index.name:<48} {index.state:<10} "
+                    f"{index.population_percent:>6.1f}%  "
+                    f"{':'.join(index.labels)}({', '.join(index.properties)})"
+                )
+    finally:
+        await driver.close()
+
+
+@cli.command()
+@click.option("--db_url", "-u", default="", help=_neo4j_db_url_description)
+@click.option(
+    "--wait",
+    "-w",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Wait up to this many seconds for all indexes to finish populating.",
+)
+def migrate_db(db_url: str, wait: int) -> None:
+    """Bring the graph DB schema (constraints and indexes) up to date, and report the
+    population status of each index.
+
+        $ metakb migrate-db
+
+    Pending migrations are also applied automatically whenever data is loaded, but new
+    indexes are populated in the background and aren't used until they're online. To
+    block until they are:
+
+        $ metakb migrate-db --wait 600
+
+    \f
+    :param db_url: connection string for the application Neo4j database.
+    :param wait: seconds to wait for indexes to come online. Don't wait if 0.
+    """  # noqa: D301
+    asyncio.run(_migrate_db(db_url, wait))
+
+
+async def _refresh_documents(db_url: str) -> None:
+    """Build stored statement documents
+
+    Dispatch with asyncio.run() from a `click` function
+
+    :param db_url: URL endpoint for the application Neo4j database.
+    """
+    start = timer()
+    async with _get_repository(db_url) as repo:
+        refreshed = await repo.refresh_statement_documents()
+    end = timer()
+    _echo_info(f"Built {refreshed} statement documents in {(end - start):.5f} s")
+
+
+@cli.command()
+@click.option("--db_url", "-u", default="", help=_neo4j_db_url_description)
+def refresh_documents(db_url: str) -> None:
+    """Build the stored copies of statements that API reads are served from, for any
+    statements that don't have a current one.
+
+        $ metakb refresh-documents
+
+    Loads do this automatically, so this is only needed for graphs built some other
+    way, e.g. with `export-import` and `neo4j-admin`. Until then, statements are
+    rebuilt from the graph on every read, which is much slower.
+
+    \f
+    :param db_url: connection string for the application Neo4j database.
+    """  # noqa: D301
+    asyncio.run(_refresh_documents(db_url))
+
+
+def _get_cdm_paths(from_s3: bool, cdm_files: tuple[Path, ...]) -> list[Path]:
+    """Resolve which CDM files to load
+
+    :param from_s3: whether to fetch the latest snapshot files from the VICC S3 bucket
+    :param cdm_files: specific files to load. If given, just use these.
+    :return: paths to CDM files, in load order
+    """
+    if cdm_files:
+        return list(cdm_files)
+    paths = []
+    if from_s3:
+        snapshot_paths = _retrieve_s3_cdms()
+        for src in sorted([s.value for s in SourceName]):
+            if src == SourceName.CBIOPORTAL:
+                continue  # TODO implement in GH issue #729
+            try:
+                paths.append(snapshot_paths[src])
+            except KeyError as e:
+                msg = f"No CDM file found for {src} in S3 snapshot"
+                raise FileNotFoundError(msg) from e
+    else:
+        for src in sorted(SourceName):
+            if src == SourceName.CBIOPORTAL:
+                continue  # TODO implement in GH issue #729
+            src_data = SourceDataStore(src_name=src)
+            paths.append(src_data.get_latest_transformed_file())
+    return paths
+
+
+async def _load_paths(
+    paths: list[Path],
+    repositories: list[AbstractRepository],
+    batch_size: int,
+    concurrent_sources: bool,
+    checkpoint: LoadCheckpoint | None = None,
+) -> None:
+    """Load CDM files, either one after another or concurrently
+
+    :param paths: CDM files to load, in order
+    :param repositories: repository instances to load with. For a concurrent load,
+        there must be at least one per file.
+    :param batch_size: target number of assertions to write per transaction
+    :param concurrent_sources: whether to load files concurrently
+    :param checkpoint: if given, record progress of a sequential load here
+    """
+    if concurrent_sources:
+        await load_from_json_concurrent(
+            paths, repositories, silent=False, batch_size=batch_size
+        )
+        return
+    for path in paths:
+        await load_from_json(
+            path,
+            repositories[0],
+            silent=False,
+            batch_size=batch_size,
+            worker_repositories=repositories,
+            checkpoint=checkpoint,
+        )
+
+
+def _get_batch_size(batch_size: int | None) -> int:
+    """Resolve number of assertions to write per transaction
+
+    :param batch_size: value given on the command line, if any
+    :return: given value, or else the configured one, or else the loader default
+    """
+    return batch_size or get_config().load_batch_size or LOAD_BATCH_SIZE
+
+
+async def _load_blue_green(
+    db_url: str,
+    paths: list[Path],
+    workers: int,
+    query_metrics: QueryMetrics | None,
+    batch_size: int,
+    concurrent_sources: bool,
+) -> None:
+    """Load CDM files into a fresh staging database, and then switch readers over to
+    it by repointing the configured DB alias.
+
+    Readers never see a partially-loaded graph, and don't contend with load
+    transactions. The previously-live database is left in place, so that the alias can
+    be pointed back to it if needed; it's replaced by the next blue/green load.
+
+    :param db_url: URL endpoint for the application Neo4j database.
+    :param paths: CDM files to load, in order
+    :param workers: number of concurrent DB sessions to load assertions with
+    :param query_metrics: if given, record query timings here
+    :param batch_size: target number of assertions to write per transaction
+    :param concurrent_sources: whether to load files concurrently. If so, ``workers``
+        sessions are used per file.
+    :raise click.ClickException: if the configured alias name is taken by a database,
+        or if the staged data fails validation
+    """
+    alias = get_config().db_name
+    if not alias:
+        _help_msg(
+            "Error: --blue_green requires METAKB_DB_NAME to be set to the DB alias that readers use."
+        )
+        return
+
+    driver = get_driver(db_url)
+    try:
+        live_database = await get_database_alias_target(driver, alias)
+        if live_database is None and await database_exists(driver, alias):
+            msg = (
+                f"{alias} is a database rather than an alias, so it can't be switched "
+                "to a staging database. To migrate, either set METAKB_DB_NAME to a new "
+                "alias name, load with --blue_green, and then point readers at that "
+                f"alias; or drop {alias} and load with --blue_green, leaving readers "
+                "without data until the load completes."
+            )
+            raise click.ClickException(msg)
+        staging_database = (
+            f"{alias}-green" if live_database == f"{alias}-blue" else f"{alias}-blue"
+        )
+        _echo_info(f"Creating staging database {staging_database}...")
+        await create_database(driver, staging_database)
+
+        async with _get_repositories(
+            db_url,
+            workers * len(paths) if concurrent_sources else workers,
+            query_metrics,
+            staging_database,
+        ) as repositories:
+            await _load_paths(paths, repositories, batch_size, concurrent_sources)
+            staged_stats = await repositories[0].get_stats()
+
+        live_stats = None
+        if live_database:
+            async with _get_repository(db_url, database=live_database) as repository:
+                live_stats = await repository.get_stats()
+        try:
+            validate_staged_stats(staged_stats, live_stats)
+        except StagedLoadValidationError as e:
+            msg = f"Not switching to {staging_database}: {e}"
+            _logger.exception(msg)
+            raise click.ClickException(msg) from e
+
+        await set_database_alias(driver, alias, staging_database)
+        _echo_info(
+            f"Switched {alias} from {live_database or '(none)'} to {staging_database}"
+        )
+    finally:
+        await driver.close()
+
+
+async def _load_cdm(
+    db_url: str,
+    from_s3: bool,
+    cdm_files: tuple[Path, ...],
+    workers: int,
+    differential: bool,
+    resume: bool,
+    profile_queries: bool,
+    blue_green: bool,
+    batch_size: int | None,
+    concurrent_sources: bool,
+) -> None:
     """Load cdms from an asyncio event loop"""
     if from_s3 and cdm_files:
         _help_msg("Error: Cannot use both cdm_file args and --from_s3 option.")
+    if differential and resume:
+        _help_msg("Error: Cannot use both --differential and --resume options.")
+    if blue_green and (differential or resume):
+        _help_msg(
+            "Error: Cannot use --blue_green with --differential or --resume options."
+        )
+    if concurrent_sources and (differential or resume):
+        _help_msg(
+            "Error: Cannot use --concurrent_sources with --differential or --resume options."
+        )
 
     start = timer()
     _echo_info("Loading Neo4j database...")
 
-    async with _get_repository(db_url) as repository:
-        if cdm_files:
-            for file in cdm_files:
-                await load_from_json(file, repository, silent=False)
-        elif from_s3:
-            version = _retrieve_s3_cdms()
-            for src in sorted([s.value for s in SourceName]):
-                if src == SourceName.CBIOPORTAL:
-                    continue  # TODO implement in GH issue #729
-                pattern = f"{src}_cdm_{version}.json"
-                globbed = (get_config().data_dir / src / "transformers").glob(pattern)
-
-                try:
-                    path = sorted(globbed)[-1]
-                except IndexError as e:
-                    msg = f"No valid transformation file found matching pattern: {pattern}"
-                    raise FileNotFoundError(msg) from e
-
-                await load_from_json(path, repository, silent=False)
+    paths = _get_cdm_paths(from_s3, cdm_files)
+    query_metrics = QueryMetrics() if profile_queries else None
+    batch_size = _get_batch_size(batch_size)
+    if blue_green:
+        await _load_blue_green(
+            db_url, paths, workers, query_metrics, batch_size, concurrent_sources
+        )
+        end = timer()
+        _echo_info(f"Successfully loaded neo4j database in {(end - start):.5f} s")
+        _echo_query_metrics(query_metrics)
+        return
+
+    async with _get_repositories(
+        db_url,
+        workers * len(paths) if concurrent_sources else workers,
+        query_metrics,
+    ) as repositories:
+        if differential:
+            await load_from_json_differential(
+                paths,
+                repositories[0],
+                silent=False,
+                batch_size=batch_size,
+                worker_repositories=repositories,
+            )
+        elif concurrent_sources:
+            await _load_paths(paths, repositories, batch_size, True)
         else:
-            for src in sorted(SourceName):
-                if src == SourceName.CBIOPORTAL:
-                    continue  # TODO implement in GH issue #729
-                src_data = SourceDataStore(src_name=src)
-                cdm_file = src_data.get_latest_transformed_file()
-                await load_from_json(cdm_file, repository, silent=False)
+            checkpoint = LoadCheckpoint()
+            if not resume:
+                checkpoint.clear()
+            await _load_paths(paths, repositories, batch_size, False, checkpoint)
+            checkpoint.clear()
 
     end = timer()
     _echo_info(f"Successfully loaded neo4j database in {(end - start):.5f} s")
+    _echo_query_metrics(query_metrics)
 
 
 @cli.command()
@@ -550,6 +875,55 @@ async def _load_cdm(db_url: str, from_s3: bool, cdm_files: tuple[Path, ...]) ->
     is_flag=True,
     help="Retrieves most recent data snapshot from the VICC S3 bucket and loads it. Mutually exclusive with target file arguments.",
 )
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of concurrent DB sessions to load assertions with.",
+)
+@click.option(
+    "--differential",
+    "-d",
+    is_flag=True,
+    default=False,
+    help="Only write assertions that have changed since the last differential load, and remove any that are no longer present. The given CDM files must make up the complete set of data that should be in the DB.",
+)
+@click.option(
+    "--resume",
+    "-r",
+    is_flag=True,
+    default=False,
+    help="Continue an interrupted load from its last checkpoint, skipping any assertions that were already committed. Mutually exclusive with --differential.",
+)
+@click.option(
+    "--profile_queries",
+    "-p",
+    is_flag=True,
+    default=False,
+    help="Record timings for each kind of DB query, and print a summary at the end.",
+)
+@click.option(
+    "--blue_green",
+    "-b",
+    is_flag=True,
+    default=False,
+    help="Load into a fresh staging database, check entity counts, and then atomically switch the DB alias named by METAKB_DB_NAME over to it. Requires Neo4j Enterprise Edition.",
+)
+@click.option(
+    "--batch_size",
+    "-t",
+    type=click.IntRange(min=1),
+    help=f"Target number of assertions to write per DB transaction. Batches that exceed the DB's transaction memory limits are split automatically. Defaults to METAKB_LOAD_BATCH_SIZE if set, otherwise {LOAD_BATCH_SIZE}.",
+)
+@click.option(
+    "--concurrent_sources",
+    "-c",
+    is_flag=True,
+    default=False,
+    help="Load each source's CDM file at the same time, rather than one after another. Assertions that appear in more than one source are still merged in order.",
+)
 @click.argument(
     "cdm_files",
     metavar="[CDM_FILE]...",
@@ -559,6 +933,13 @@ async def _load_cdm(db_url: str, from_s3: bool, cdm_files: tuple[Path, ...]) ->
 def load_cdm(
     db_url: str,
     from_s3: bool,
+    workers: int,
+    differential: bool,
+    resume: bool,
+    profile_queries: bool,
+    blue_green: bool,
+    batch_size: int | None,
+    concurrent_sources: bool,
     cdm_files: tuple[Path, ...],
 ) -> None:
     """Load one or more CDM_FILEs into Neo4j graph.
@@ -576,6 +957,42 @@ def load_cdm(
 
         $ metakb load-cdm --from_s3
 
+    Use --workers to load with several concurrent DB sessions:
+
+        $ metakb load-cdm --workers 4
+
+    Use --differential to skip assertions that are unchanged since the last
+    differential load, and to remove assertions that are no longer present in any
+    CDM file:
+
+        $ metakb load-cdm --differential
+
+    Progress is checkpointed as assertions are committed. If a load is interrupted,
+    rerun it with the same arguments plus --resume to pick up where it left off:
+
+        $ metakb load-cdm --resume
+
+    Use --profile_queries to print a breakdown of time spent in each DB query once
+    loading is done:
+
+        $ metakb load-cdm --profile_queries
+
+    Use --blue_green to build into a separate staging database, leaving the live data
+    untouched until loading has finished, and then atomically switch readers to it.
+    Readers must connect via the DB alias set by METAKB_DB_NAME:
+
+        $ METAKB_DB_NAME=metakb metakb load-cdm --blue_green
+
+    Use --batch_size to trade off commit overhead against transaction memory use,
+    when loading many small assertions or against a memory-constrained DB:
+
+        $ metakb load-cdm --batch_size 500
+
+    Use --concurrent_sources to load all files at once. With --workers, each file
+    gets that many DB sessions:
+
+        $ metakb load-cdm --concurrent_sources --workers 2
+
     Note that the Neo4j database URL, username, and password can either be set by a CLI
     options, or by the environment variable METAKB_DB_URL. For example:
 
@@ -585,10 +1002,87 @@ def load_cdm(
     :param db_url: URL endpoint for the application Neo4j database.
     :param from_s3: Skip data harvest/transform and load latest existing CDM files from
         VICC S3 bucket. Exclusive with ``cdm_file`` arguments.
+    :param workers: number of concurrent DB sessions to load assertions with
+    :param differential: whether to only write changed assertions, and remove ones
+        that are no longer present
+    :param resume: whether to continue from the last checkpoint of an interrupted
+        load
+    :param profile_queries: whether to record and print per-query timings
+    :param blue_green: whether to load into a staging database and then switch
+        readers over to it
+    :param batch_size: target number of assertions to write per transaction. If not
+        given, use the configured default.
+    :param concurrent_sources: whether to load files concurrently
     :param cdm_files: tuple of specific file(s) to load from. If empty, just get latest
         available locally for each source.
     """  # noqa: D301
-    asyncio.run(_load_cdm(db_url, from_s3, cdm_files))
+    asyncio.run(
+        _load_cdm(
+            db_url,
+            from_s3,
+            cdm_files,
+            workers,
+            differential,
+            resume,
+            profile_queries,
+            blue_green,
+            batch_size,
+            concurrent_sources,
+        )
+    )
+
+
+@cli.command()
+@click.option(
+    "--output_dir",
+    "-o",
+    type=click.Path(file_okay=False, writable=True, path_type=Path),
+    help="Directory to write import files to. Defaults to `neo4j_import/` under the configured data directory.",
+)
+@click.argument(
+    "cdm_files",
+    metavar="[CDM_FILE]...",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+    nargs=-1,
+)
+def export_import(output_dir: Path | None, cdm_files: tuple[Path, ...]) -> None:
+    """Convert one or more CDM_FILEs into node and relationship CSVs for the offline
+    Neo4j bulk importer, for building a fresh graph without going through Cypher.
+
+    Once imported, the graph is the same as what `load-cdm` would produce in an empty
+    DB, except that stored statement documents still need to be built with
+    `refresh-documents`. If no arguments are provided, use latest available from
+    default transformed data location for each MetaKB source:
+
+        $ metakb export-import
+
+    Pass path to file(s) to use files from a custom location:
+
+        $ metakb export-import path/to/file1.json path/to/file2.json
+
+    The `neo4j-admin` command to run the import is printed at the end. The importer
+    doesn't create constraints or indexes, so afterward, run the generated
+    `schema.cypher` file against the new DB (e.g. with `cypher-shell -f`), and then
+    run `metakb refresh-documents`.
+
+    \f
+    :param output_dir: directory to write import files to
+    :param cdm_files: tuple of specific file(s) to export. If empty, just get latest
+        available locally for each source.
+    """  # noqa: D301
+    start = timer()
+    if output_dir is None:
+        output_dir = get_config().data_dir / "neo4j_import"
+
+    files = export_bulk_import(
+        _get_cdm_paths(False, cdm_files), output_dir, silent=False
+    )
+
+    end = timer()
+    _echo_info(f"Wrote bulk import files to {output_dir} in {(end - start):.5f} s")
+    click.echo(f"To import (with the DB stopped):\n\n{get_import_command(files)}\n")
+    click.echo(f"Then, create constraints and indexes from {files.schema}")
+    click.echo("Finally, build statement documents with `metakb refresh-documents`")
 
 
 async def _update(
@@ -596,6 +1090,11 @@ async def _update(
     normalizer_db_url: str | None,
     refresh_source_caches: bool,
     sources: tuple[SourceName, ...],
+    profile_queries: bool,
+    blue_green: bool,
+    batch_size: int | None,
+    concurrent_sources: bool,
+    workers: int,
 ) -> None:
     """Update a source or sources from a sync click function"""
     _harvest_sources(sources, refresh_source_caches)
@@ -604,23 +1103,41 @@ async def _update(
     start = timer()
     _echo_info("Loading Neo4j database...")
 
+    query_metrics = QueryMetrics() if profile_queries else None
+    batch_size = _get_batch_size(batch_size)
+    if blue_green:
+        # the staging DB starts out empty, so it needs every source, not just the
+        # ones that were updated
+        await _load_blue_green(
+            db_url,
+            _get_cdm_paths(False, ()),
+            workers,
+            query_metrics,
+            batch_size,
+            concurrent_sources,
+        )
+        end = timer()
+        _echo_info(f"Successfully loaded neo4j database in {(end - start):.5f} s")
+        _echo_query_metrics(query_metrics)
+        return
+
     if not sources:
         sources = tuple(SourceName)
-    async with _get_repository(db_url) as repository:
-        for src in sorted([s.value for s in sources]):
-            pattern = f"{src}_cdm_*.json"
-            globbed = (get_config().data_dir / src / "transformers").glob(pattern)
-
-            try:
-                path = sorted(globbed)[-1]
-            except IndexError as e:
-                msg = f"No valid transformation files found matching pattern: {pattern}"
-                raise FileNotFoundError(msg) from e
-
-            await load_from_json(path, repository)
+    paths = [
+        SourceDataStore(src_name=src).get_latest_transformed_file()
+        for src in sorted(sources)
+    ]
+
+    async with _get_repositories(
+        db_url,
+        workers * len(paths) if concurrent_sources else workers,
+        query_metrics,
+    ) as repositories:
+        await _load_paths(paths, repositories, batch_size, concurrent_sources)
 
         end = timer()
         _echo_info(f"Successfully loaded neo4j database in {(end - start):.5f} s")
+    _echo_query_metrics(query_metrics)
 
 
 @cli.command()
@@ -635,6 +1152,41 @@ async def _update(
         "`True` if source caches (e.g. CIViCPy) should be updated prior to data regeneration. Note this will take several minutes. `False` if local cache should be used"
     ),
 )
+@click.option(
+    "--profile_queries",
+    "-p",
+    is_flag=True,
+    default=False,
+    help="Record timings for each kind of DB query, and print a summary at the end.",
+)
+@click.option(
+    "--blue_green",
+    "-b",
+    is_flag=True,
+    default=False,
+    help="Load into a fresh staging database, check entity counts, and then atomically switch the DB alias named by METAKB_DB_NAME over to it. Requires Neo4j Enterprise Edition.",
+)
+@click.option(
+    "--batch_size",
+    "-t",
+    type=click.IntRange(min=1),
+    help=f"Target number of assertions to write per DB transaction. Batches that exceed the DB's transaction memory limits are split automatically. Defaults to METAKB_LOAD_BATCH_SIZE if set, otherwise {LOAD_BATCH_SIZE}.",
+)
+@click.option(
+    "--concurrent_sources",
+    "-c",
+    is_flag=True,
+    default=False,
+    help="Load each source's CDM file at the same time, rather than one after another. Assertions that appear in more than one source are still merged in order.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of concurrent DB sessions to load assertions with.",
+)
 @click.argument(
     "sources",
     metavar=_print_enum_metavar(SourceName),
@@ -645,6 +1197,11 @@ async def update(
     db_url: str,
     normalizer_db_url: str | None,
     refresh_source_caches: bool,
+    profile_queries: bool,
+    blue_green: bool,
+    batch_size: int | None,
+    concurrent_sources: bool,
+    workers: int,
     sources: tuple[SourceName, ...],
 ) -> None:
     """Execute data harvest and transformation from resources and upload to graph
@@ -672,9 +1229,30 @@ async def update(
     :param refresh_source_caches: ``True`` if source caches, i.e. CIViCPy, should be
         refreshed before loading data. Note this will take several minutes. Defaults to
         ``False``.
+    :param profile_queries: whether to record and print per-query timings for the
+        DB load
+    :param blue_green: whether to load all sources into a staging database and then
+        switch readers over to it
+    :param batch_size: target number of assertions to write per transaction. If not
+        given, use the configured default.
+    :param concurrent_sources: whether to load sources' CDM files concurrently
+    :param workers: number of concurrent DB sessions to load assertions with. With
+        ``concurrent_sources``, this many are used per file.
     :param sources: source name(s) to update. If empty, update all sources.
     """  # noqa: D301
-    asyncio.run(_update(db_url, normalizer_db_url, refresh_source_caches, sources))
+    asyncio.run(
+        _update(
+            db_url,
+            normalizer_db_url,
+            refresh_source_caches,
+            sources,
+            profile_queries,
+            blue_green,
+            batch_size,
+            concurrent_sources,
+            workers,
+        )
+    )
 
 
 def _harvest_sources(
@@ -773,61 +1351,19 @@ async def _transform_sources(
     )
 
 
-def _retrieve_s3_cdms() -> str:
+def _retrieve_s3_cdms() -> dict[str, Path]:
     """Retrieve most recent CDM files from VICC S3 bucket.
 
-    Expects to find files in a path like the following:
-        s3://vicc-metakb/cdm/20220201/civic_cdm_20220201.json.zip
-
-    :return: date string from retrieved files to use when loading to DB.
-    :raise ResourceLoadException: if S3 initialization fails
+    :return: local path to each source's retrieved CDM file
     :raise FileNotFoundError:  if unable to find files matching expected pattern in
         VICC MetaKB bucket.
     """
     _echo_info("Attempting to fetch CDM files from S3 bucket")
-    s3 = boto3.resource(
-        "s3", config=Config(region_name="us-east-2", signature_version=UNSIGNED)
-    )
-
-    if not s3:
-        msg = "Unable to initiate AWS S3 Resource"
-        raise ResourceLoadException(msg)
-
-    bucket = sorted(  # noqa: C414
-        list(s3.Bucket("vicc-metakb").objects.filter(Prefix="cdm").all()),
-        key=lambda f: f.key,
-        reverse=True,
-    )
-    newest_version: str | None = None
-
-    for file in bucket:
-        match = re.match(
-            re.compile(r"cdm/20[23]\d[01]\d[0123]\d/(.*)_cdm_(.*).json.zip"), file.key
-        )
-
-        if match:
-            source = match.group(1)
-            if newest_version is None:
-                newest_version = match.group(2)
-            elif match.group(2) != newest_version:
-                continue
-        else:
-            continue
-
-        tmp_path = Path(tempfile.gettempdir()) / "metakb_dl_tmp"
-        with tmp_path.open("wb") as f:
-            file.Object().download_fileobj(f)
-
-        cdm_dir = get_config().data_dir / source / "transformers"
-        cdm_zip = ZipFile(tmp_path, "r")
-        cdm_zip.extract(f"{source}_cdm_{newest_version}.json", cdm_dir)
-
-    if newest_version is None:
-        msg = "Unable to locate files matching expected resource pattern in VICC s3 bucket"
-        raise FileNotFoundError(msg)
-
-    _echo_info(f"Retrieved CDM files dated {newest_version}")
-    return newest_version
+    retrieval = retrieve_snapshot()
+    if retrieval.skipped:
+        _echo_info(f"Already up to date: {', '.join(retrieval.skipped)}")
+    _echo_info(f"Retrieved CDM files dated {retrieval.version}")
+    return retrieval.paths
 
 
 if __name__ == "__main__":
@@ -16,9 +16,13 @@ from metakb.config import get_config
 from metakb.log_config import configure_logs
 from metakb.normalizers import ViccNormalizers
 from metakb.repository.neo4j_repository import get_driver
+from metakb.repository.query_metrics import QueryMetrics
+from metakb.repository.statement_cache import STATEMENT_CACHE_SIZE, StatementCache
 from metakb.restapi.meta import api_router as meta_router
+from metakb.restapi.response_cache import ResponseCache
 from metakb.restapi.search import api_router as search_router
 from metakb.schemas.api import METAKB_DESCRIPTION
+from metakb.services.search import create_normalizer_executor
 
 _logger = logging.getLogger(__name__)
 
@@ -34,7 +38,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     driver = get_driver()
     app.state.driver = driver
     app.state.normalizer = ViccNormalizers()
+    app.state.normalizer_executor = create_normalizer_executor()
+    app.state.query_metrics = QueryMetrics() if get_config().query_metrics else None
+    cache_size = get_config().statement_cache_size
+    if cache_size is None:
+        cache_size = STATEMENT_CACHE_SIZE
+    app.state.statement_cache = StatementCache(cache_size) if cache_size else None
+    response_cache_mb = get_config().response_cache_size_mb
+    app.state.response_cache = (
+        ResponseCache(response_cache_mb * 1024 * 1024, get_config().response_cache_dir)
+        if response_cache_mb
+        else None
+    )
     yield
+    app.state.normalizer_executor.shutdown()
     await driver.close()
 
 
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from enum import StrEnum
 from functools import lru_cache
 from os import environ
+from threading import local
 
 from async_lru import alru_cache
 from botocore.exceptions import TokenRetrievalError
@@ -50,6 +51,15 @@ _logger = logging.getLogger(__name__)
 DEFAULT_CACHE_SIZE = 1024
 
 
+@dataclass
+class _ConceptQueryHandlers:
+    """Hold one thread's gene, disease, and therapy normalizer instances"""
+
+    gene: GeneQueryHandler
+    disease: DiseaseQueryHandler
+    therapy: TherapyQueryHandler
+
+
 class ViccNormalizers:
     """Manage VICC concept normalization services.
 
@@ -70,8 +80,11 @@ class ViccNormalizers:
         """Initialize normalizers. Construct a normalizer instance for each service
         (gene, variation, disease, therapy) and retain them as instance properties.
 
-        * Gene concept lookups within the Variation Normalizer are resolved using the
-          Gene Normalizer instance, rather than creating a second sub-instance.
+        * Database connections (e.g. boto3 DynamoDB resources) can't be shared
+          between threads, so each thread that looks up genes, diseases, or therapies
+          gets its own Gene, Disease, and Therapy Normalizer instances, built on first
+          use. The Variation Normalizer runs on the event loop, so its gene concept
+          lookups are resolved using another, separate Gene Normalizer instance.
         * The normalizers are exposed interally as callback functions wrapped in an
           ``lru_cache`` at initialization, so that a configurable cache size variable
           can be passed to the caching wrapper
@@ -84,14 +97,22 @@ class ViccNormalizers:
         :param cache_size: size of LRU cache used for each normalizer. Use ``None`` to
             use an unbounded cache (ie no max size).
         """
-        gene_query_handler = GeneQueryHandler(create_gene_db(db_url))
-        self._normalize_gene = lru_cache(cache_size)(gene_query_handler.normalize)
-        disease_query_handler = DiseaseQueryHandler(create_disease_db(db_url))
-        self._normalize_disease = lru_cache(cache_size)(disease_query_handler.normalize)
-        therapy_query_handler = TherapyQueryHandler(create_therapy_db(db_url))
-        self._normalize_therapy = lru_cache(cache_size)(therapy_query_handler.normalize)
+        self._db_url = db_url
+        self._thread_query_handlers = local()
+        # build this thread's instances now, so that connection problems surface early
+        self._get_query_handlers()
+        # caches are shared by all threads
+        self._normalize_gene = lru_cache(cache_size)(
+            lambda query: self._get_query_handlers().gene.normalize(query)
+        )
+        self._normalize_disease = lru_cache(cache_size)(
+            lambda query: self._get_query_handlers().disease.normalize(query)
+        )
+        self._normalize_therapy = lru_cache(cache_size)(
+            lambda query: self._get_query_handlers().therapy.normalize(query)
+        )
         variation_query_handler = VariationQueryHandler(
-            gene_query_handler=gene_query_handler
+            gene_query_handler=GeneQueryHandler(create_gene_db(db_url))
         )
         self._normalize_variation = alru_cache(cache_size)(
             variation_query_handler.normalize_handler.normalize
@@ -101,6 +122,22 @@ class ViccNormalizers:
         self.seqrepo_access = variation_query_handler.seqrepo_access
         self.transcript_mappings = variation_query_handler.gnomad_vcf_to_protein_handler.mane_transcript.transcript_mappings
 
+    def _get_query_handlers(self) -> _ConceptQueryHandlers:
+        """Get the current thread's gene, disease, and therapy normalizer instances,
+        building them if needed
+
+        :return: query handlers owned by the current thread
+        """
+        handlers = getattr(self._thread_query_handlers, "handlers", None)
+        if handlers is None:
+            handlers = _ConceptQueryHandlers(
+                gene=GeneQueryHandler(create_gene_db(self._db_url)),
+                disease=DiseaseQueryHandler(create_disease_db(self._db_url)),
+                therapy=TherapyQueryHandler(create_therapy_db(self._db_url)),
+            )
+            self._thread_query_handlers.handlers = handlers
+        return handlers
+
     async def normalize_variation(
         self, query: str
     ) -> Allele | CopyNumberChange | CopyNumberCount | None:
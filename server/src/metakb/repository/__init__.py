@@ -1 +1 @@
-"""Define storage abstraction and provide a Neo4j implementation."""
+"""Define storage abstraction and provide Neo4j and in-memory implementations."""
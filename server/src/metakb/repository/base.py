@@ -26,6 +26,13 @@ class RepositoryStats(BaseModel):
     num_metakb_assertions: int
 
 
+class RepositoryMemoryError(Exception):
+    """Raise if a write is too large for the repository to hold in memory at once.
+
+    Retrying the same write won't help, but splitting it into smaller ones might.
+    """
+
+
 class AbstractRepository(abc.ABC):
     """Abstract definition of a repository class.
 
@@ -44,6 +51,23 @@ class AbstractRepository(abc.ABC):
         :return: complete statement if available
         """
 
+    @abc.abstractmethod
+    async def get_statements(self, statement_ids: list[str]) -> list[Statement]:
+        """Retrieve several statements at once
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: complete statements for all IDs that are available, in no particular
+            order
+        """
+
+    @abc.abstractmethod
+    async def get_existing_assertion_ids(self, statement_ids: list[str]) -> set[str]:
+        """Check which of the given statements already exist, without fetching them
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: the subset of given IDs that are present in the DB
+        """
+
     @abc.abstractmethod
     async def search_statements(
         self,
@@ -54,6 +78,7 @@ class AbstractRepository(abc.ABC):
         statement_ids: list[str] | None = None,
         start: int = 0,
         limit: int | None = None,
+        after_id: str | None = None,
     ) -> list[
         Statement
         | VariantDiagnosticStudyStatement
@@ -79,7 +104,9 @@ class AbstractRepository(abc.ABC):
         :param statement_ids: list of source statement IDs
         :param start: pagination start point
         :param limit: page size
-        :return: list of statements matching provided criteria
+        :param after_id: if given, only include statements with IDs that sort after
+            this one. Applied before ``start``, for keyset pagination.
+        :return: list of statements matching provided criteria, ordered by ID
         """
 
     @abc.abstractmethod
@@ -104,6 +131,84 @@ class AbstractRepository(abc.ABC):
         :param assertion: metakb assertion
         """
 
+    @abc.abstractmethod
+    async def load_entities(self, assertions: list[Statement]) -> None:
+        """Add all shared entities (genes, conditions, therapeutics, variants,
+        documents, methods, strengths) referenced anywhere within the given assertions.
+
+        Statements and evidence lines themselves aren't loaded.
+
+        :param assertions: metakb assertions
+        """
+
+    @abc.abstractmethod
+    async def load_assertions(
+        self, assertions: list[Statement], include_entities: bool = True
+    ) -> None:
+        """Add or update a batch of complete assertion objects to the DB
+
+        :param assertions: metakb assertions. IDs should be unique within the batch.
+        :param include_entities: if ``False``, assume that shared entities have
+            already been added via ``load_entities()``
+        :raise RepositoryMemoryError: if the batch is too large to write at once. No
+            part of it is written.
+        """
+
+    @abc.abstractmethod
+    async def get_assertion_hashes(self) -> dict[str, str]:
+        """Get stored content hashes for all assertions that have one
+
+        See ``set_assertion_hashes()``.
+
+        :return: mapping from assertion ID to content hash
+        """
+
+    @abc.abstractmethod
+    async def set_assertion_hashes(self, hashes: dict[str, str]) -> None:
+        """Store content hashes for loaded assertions, to enable later detection of
+        unchanged assertions.
+
+        Any subsequent update to an assertion clears its hash.
+
+        :param hashes: mapping from assertion ID to content hash
+        """
+
+    @abc.abstractmethod
+    async def delete_assertions(self, statement_ids: list[str]) -> None:
+        """Remove assertions and their evidence lines
+
+        Contained evidence items are also removed, along with their own evidence, once
+        nothing else cites them. A given statement that is itself still an evidence
+        item elsewhere only loses its evidence lines.
+
+        :param statement_ids: IDs of assertions to remove
+        """
+
+    @abc.abstractmethod
+    async def refresh_statement_documents(self) -> int:
+        """Precompute read-ready documents for statements that have changed since
+        their documents were last computed, e.g. once a load is complete
+
+        Statements without a current document are built from scratch when read, so
+        this only affects how quickly statements are read, not their contents.
+
+        :return: number of documents computed
+        """
+
+    @abc.abstractmethod
+    async def get_data_version(self) -> str:
+        """Identify the current version of the stored data
+
+        :return: opaque version stamp, or an empty string if none has been recorded
+        """
+
+    @abc.abstractmethod
+    async def update_data_version(self) -> str:
+        """Record that stored data has changed, e.g. once a load is complete
+
+        :return: new version stamp
+        """
+
     @abc.abstractmethod
     async def teardown_db(self) -> None:
         """Reset repository storage."""
@@ -111,3 +216,12 @@ class AbstractRepository(abc.ABC):
     @abc.abstractmethod
     async def get_all_assertion_ids(self) -> list[str]:
         """Return all assertion IDs"""
+
+    @abc.abstractmethod
+    async def get_citing_assertion_ids(self, statement_ids: list[str]) -> set[str]:
+        """Find assertions that include any of the given statements anywhere within
+        their evidence
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: IDs of assertions citing them, directly or indirectly
+        """
@@ -0,0 +1,626 @@
+"""In-memory implementation of the repository abstraction.
+
+Intended for benchmarking, testing, and small read-only deployments where running a
+graph database isn't worthwhile. Statements are held as the same node models that the
+Neo4j repository reads and writes, so loaded data round-trips identically.
+"""
+
+from typing import NamedTuple
+from uuid import uuid4
+
+from ga4gh.core.models import Extension, MappableConcept
+from ga4gh.va_spec.base import Statement
+
+from metakb.repository.base import AbstractRepository, RepositoryStats
+from metakb.repository.neo4j_models import (
+    CategoricalVariantNode,
+    ClassificationNode,
+    ConditionSetNode,
+    DefiningAlleleConstraintNode,
+    DiagnosticStatementNode,
+    DiseaseNode,
+    DocumentNode,
+    DrugNode,
+    EvidenceLineNode,
+    FeatureContextConstraintNode,
+    GeneNode,
+    MethodNode,
+    PhenotypeNode,
+    PrognosticStatementNode,
+    StrengthNode,
+    TherapeuticResponseStatementNode,
+    TherapyGroupNode,
+)
+from metakb.repository.neo4j_repository import _make_statement_node
+
+_StatementNode = (
+    TherapeuticResponseStatementNode | DiagnosticStatementNode | PrognosticStatementNode
+)
+
+
+class _SearchKeys(NamedTuple):
+    """Entity IDs that a statement can be found by"""
+
+    variation_ids: set[str]
+    gene_ids: set[str]
+    therapy_ids: set[str]
+    condition_ids: set[str]
+
+
+def _get_condition_ids(
+    condition: ConditionSetNode | DiseaseNode | PhenotypeNode,
+) -> set[str]:
+    """Get IDs of a condition, or of all conditions within a (nested) condition set
+
+    :param condition: condition node
+    :return: IDs of individual conditions
+    """
+    if isinstance(condition, ConditionSetNode):
+        return {i for c in condition.conditions for i in _get_condition_ids(c)}
+    return {condition.id}
+
+
+def _get_search_keys(statement: _StatementNode) -> _SearchKeys:
+    """Get entity IDs that a statement should be indexed by
+
+    Mirrors the matching rules of the Neo4j statement search query.
+
+    :param statement: statement node
+    :return: IDs to index statement under
+    """
+    variation_ids = {m.id for m in statement.has_variant.has_members}
+    if isinstance(statement.has_variant.has_constraint, DefiningAlleleConstraintNode):
+        variation_ids.add(statement.has_variant.has_constraint.has_defining_allele.id)
+    therapy_ids = set()
+    if isinstance(statement, TherapeuticResponseStatementNode):
+        therapy_ids.add(statement.has_therapeutic.id)
+        if isinstance(statement.has_therapeutic, TherapyGroupNode):
+            therapy_ids.update(d.id for d in statement.has_therapeutic.has_therapies)
+    return _SearchKeys(
+        variation_ids=variation_ids,
+        gene_ids={statement.has_gene.id},
+        therapy_ids=therapy_ids,
+        condition_ids=_get_condition_ids(statement.has_condition),
+    )
+
+
+def _iter_evidence_items(
+    evidence_lines: list[EvidenceLineNode],
+) -> list[_StatementNode]:
+    """Get statements directly supporting a set of evidence lines, descending through
+    any nested evidence lines
+
+    :param evidence_lines: evidence line nodes
+    :return: statement nodes used as evidence items
+    """
+    items = []
+    pending = list(evidence_lines)
+    while pending:
+        evidence_line = pending.pop()
+        for item in evidence_line.has_evidence_items:
+            if isinstance(item, EvidenceLineNode):
+                pending.append(item)
+            else:
+                items.append(item)
+    return items
+
+
+def _iter_statements(statement: _StatementNode) -> list[_StatementNode]:
+    """Get a statement and every statement nested anywhere within its evidence
+
+    :param statement: statement node
+    :return: all statement nodes in the evidence tree, including the given one
+    """
+    statements = []
+    pending = [statement]
+    while pending:
+        current = pending.pop()
+        statements.append(current)
+        pending.extend(_iter_evidence_items(current.has_evidence_lines))
+    return statements
+
+
+class InMemoryRepository(AbstractRepository):
+    """In-memory implementation of a repository abstraction.
+
+    Statement search uses hash indexes from variation, gene, therapy, and condition
+    IDs (including members of therapy groups and condition sets) to statement IDs.
+    As in the graph, statements that are evidence items are stored once and shared
+    between every statement that cites them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty repository"""
+        self._reset()
+
+    def _reset(self) -> None:
+        """Discard all stored data"""
+        self._statements: dict[str, _StatementNode] = {}
+        self._search_keys: dict[str, _SearchKeys] = {}
+        self._variation_index: dict[str, set[str]] = {}
+        self._gene_index: dict[str, set[str]] = {}
+        self._therapy_index: dict[str, set[str]] = {}
+        self._condition_index: dict[str, set[str]] = {}
+        # evidence item statement ID -> IDs of statements that cite it
+        self._cited_by: dict[str, set[str]] = {}
+        self._hashes: dict[str, str] = {}
+        self._data_version = ""
+
+        self._genes: dict[str, GeneNode] = {}
+        self._drugs: dict[str, DrugNode] = {}
+        self._diseases: dict[str, DiseaseNode] = {}
+        self._catvars: dict[str, CategoricalVariantNode] = {}
+        self._documents: dict[str, DocumentNode] = {}
+        self._conditions: dict[str, ConditionSetNode | DiseaseNode | PhenotypeNode] = {}
+        self._therapy_groups: dict[str, TherapyGroupNode] = {}
+        self._methods: dict[str, MethodNode] = {}
+        self._strengths: dict[str, StrengthNode] = {}
+        self._classifications: dict[str, ClassificationNode] = {}
+
+    def _indexes(self) -> list[tuple[dict[str, set[str]], str]]:
+        return [
+            (self._variation_index, "variation_ids"),
+            (self._gene_index, "gene_ids"),
+            (self._therapy_index, "therapy_ids"),
+            (self._condition_index, "condition_ids"),
+        ]
+
+    def _add_gene(self, gene: GeneNode) -> GeneNode:
+        return self._genes.setdefault(gene.id, gene)
+
+    def _add_drug(self, drug: DrugNode) -> DrugNode:
+        return self._drugs.setdefault(drug.id, drug)
+
+    def _add_document(self, document: DocumentNode) -> DocumentNode:
+        return self._documents.setdefault(document.id, document)
+
+    def _add_strength(self, strength: StrengthNode) -> StrengthNode:
+        return self._strengths.setdefault(strength.id, strength)
+
+    def _add_catvar(self, catvar: CategoricalVariantNode) -> CategoricalVariantNode:
+        if catvar.id in self._catvars:
+            return self._catvars[catvar.id]
+        if isinstance(catvar.has_constraint, FeatureContextConstraintNode):
+            constraint = catvar.has_constraint
+            catvar = catvar.model_copy(
+                update={
+                    "has_constraint": constraint.model_copy(
+                        update={
+                            "has_feature_context": self._add_gene(
+                                constraint.has_feature_context
+                            )
+                        }
+                    )
+                }
+            )
+        self._catvars[catvar.id] = catvar
+        return catvar
+
+    def _add_condition(
+        self, condition: ConditionSetNode | DiseaseNode | PhenotypeNode
+    ) -> ConditionSetNode | DiseaseNode | PhenotypeNode:
+        if condition.id in self._conditions:
+            return self._conditions[condition.id]
+        if isinstance(condition, ConditionSetNode):
+            condition = condition.model_copy(
+                update={
+                    "conditions": [self._add_condition(c) for c in condition.conditions]
+                }
+            )
+        elif isinstance(condition, DiseaseNode):
+            self._diseases[condition.id] = condition
+        self._conditions[condition.id] = condition
+        return condition
+
+    def _add_therapeutic(
+        self, therapeutic: TherapyGroupNode | DrugNode
+    ) -> TherapyGroupNode | DrugNode:
+        if isinstance(therapeutic, DrugNode):
+            return self._add_drug(therapeutic)
+        if therapeutic.id in self._therapy_groups:
+            return self._therapy_groups[therapeutic.id]
+        therapeutic = therapeutic.model_copy(
+            update={
+                "has_therapies": [self._add_drug(d) for d in therapeutic.has_therapies]
+            }
+        )
+        self._therapy_groups[therapeutic.id] = therapeutic
+        return therapeutic
+
+    def _add_method(self, method: MethodNode) -> MethodNode:
+        if method.id not in self._methods:
+            self._methods[method.id] = method.model_copy(
+                update={"has_document": self._add_document(method.has_document)}
+            )
+        return self._methods[method.id]
+
+    def _add_evidence_line_entities(
+        self, evidence_line: EvidenceLineNode
+    ) -> EvidenceLineNode:
+        return evidence_line.model_copy(
+            update={
+                "has_strength": self._add_strength(evidence_line.has_strength),
+                "has_evidence_items": [
+                    self._add_evidence_line_entities(item)
+                    if isinstance(item, EvidenceLineNode)
+                    else item
+                    for item in evidence_line.has_evidence_items
+                ],
+            }
+        )
+
+    def _add_entities(self, statement: _StatementNode) -> _StatementNode:
+        """Register shared entities referenced by a statement. As in the graph, the
+        first-seen instance of each entity is kept.
+
+        :param statement: statement node
+        :return: copy of statement, referencing the first-seen instance of each entity
+            rather than its own
+        """
+        update = {
+            "has_gene": self._add_gene(statement.has_gene),
+            "has_variant": self._add_catvar(statement.has_variant),
+            "has_condition": self._add_condition(statement.has_condition),
+            "has_documents": [self._add_document(d) for d in statement.has_documents],
+            "has_method": self._add_method(statement.has_method),
+            "has_strength": self._add_strength(statement.has_strength),
+            "has_evidence_lines": [
+                self._add_evidence_line_entities(el)
+                for el in statement.has_evidence_lines
+            ],
+        }
+        if isinstance(statement, TherapeuticResponseStatementNode):
+            update["has_therapeutic"] = self._add_therapeutic(statement.has_therapeutic)
+        if statement.has_classification is not None:
+            update["has_classification"] = self._classifications.setdefault(
+                statement.has_classification.id, statement.has_classification
+            )
+        return statement.model_copy(update=update)
+
+    def _unlink_statement(self, statement_id: str) -> None:
+        """Remove a stored statement from search and evidence indexes
+
+        :param statement_id: ID of stored statement
+        """
+        search_keys = self._search_keys.pop(statement_id)
+        for index, field_name in self._indexes():
+            for key in getattr(search_keys, field_name):
+                index[key].discard(statement_id)
+        for item in _iter_evidence_items(
+            self._statements[statement_id].has_evidence_lines
+        ):
+            self._cited_by[item.id].discard(statement_id)
+
+    def _put_statement(self, statement: _StatementNode) -> None:
+        """Add or replace a single statement, and index it. Nested evidence items must
+        be put separately.
+
+        :param statement: statement node
+        """
+        if statement.id in self._statements:
+            self._unlink_statement(statement.id)
+        self._statements[statement.id] = statement
+        self._hashes.pop(statement.id, None)
+        search_keys = _get_search_keys(statement)
+        self._search_keys[statement.id] = search_keys
+        for index, field_name in self._indexes():
+            for key in getattr(search_keys, field_name):
+                index.setdefault(key, set()).add(statement.id)
+        for item in _iter_evidence_items(statement.has_evidence_lines):
+            self._cited_by.setdefault(item.id, set()).add(statement.id)
+
+    def _hydrate_evidence_line(
+        self, evidence_line: EvidenceLineNode
+    ) -> EvidenceLineNode:
+        return evidence_line.model_copy(
+            update={
+                "has_evidence_items": [
+                    self._hydrate_evidence_line(item)
+                    if isinstance(item, EvidenceLineNode)
+                    else self._hydrate(item.id, item)
+                    for item in evidence_line.has_evidence_items
+                ]
+            }
+        )
+
+    def _hydrate(
+        self, statement_id: str, default: _StatementNode | None = None
+    ) -> _StatementNode:
+        """Get a stored statement, with the current version of each evidence item
+
+        :param statement_id: ID of statement
+        :param default: node to use if statement isn't stored
+        :return: complete statement node
+        """
+        statement = self._statements.get(statement_id, default)
+        return statement.model_copy(
+            update={
+                "has_evidence_lines": [
+                    self._hydrate_evidence_line(el)
+                    for el in statement.has_evidence_lines
+                ]
+            }
+        )
+
+    async def initialize(self) -> None:
+        """Set up DB schema. Nothing is needed in memory."""
+
+    async def get_statement(self, statement_id: str) -> Statement | None:
+        """Retrieve a statement
+
+        :param statement_id: ID of the statement minted by the source
+        :return: complete statement if available
+        """
+        if statement_id not in self._statements:
+            return None
+        return self._hydrate(statement_id).to_gks()
+
+    async def get_statements(self, statement_ids: list[str]) -> list[Statement]:
+        """Retrieve several statements at once
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: complete statements for all IDs that are available, in no particular
+            order
+        """
+        return [
+            self._hydrate(statement_id).to_gks()
+            for statement_id in dict.fromkeys(statement_ids)
+            if statement_id in self._statements
+        ]
+
+    async def get_existing_assertion_ids(self, statement_ids: list[str]) -> set[str]:
+        """Check which of the given statements already exist, without fetching them
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: the subset of given IDs that are present in the DB
+        """
+        return {i for i in statement_ids if i in self._statements}
+
+    async def search_statements(
+        self,
+        variation_ids: list[str] | None = None,
+        gene_ids: list[str] | None = None,
+        therapy_ids: list[str] | None = None,
+        disease_ids: list[str] | None = None,
+        statement_ids: list[str] | None = None,
+        start: int = 0,
+        limit: int | None = None,
+        after_id: str | None = None,
+    ) -> list[Statement]:
+        """Perform entity-based search over all statements.
+
+        Return all statements matching any item within a given list of entity IDs.
+
+        IE: Given a list for [DrugA, DrugB] and [GeneA, GeneB], return all statements
+        that involve both one of the two given drugs AND one of the two given genes.
+
+        :param variation_ids: list of normalized variation IDs
+        :param gene_ids: list of normalized gene IDs
+        :param therapy_ids: list of normalized therapy IDs
+        :param disease_ids: list of normalized disease IDs
+        :param statement_ids: list of source statement IDs
+        :param start: pagination start point
+        :param limit: page size
+        :param after_id: if given, only include statements with IDs that sort after
+            this one. Applied before ``start``, for keyset pagination.
+        :return: list of statements matching provided criteria, ordered by ID
+        """
+        if statement_ids:
+            matches = {i for i in statement_ids if i in self._statements}
+        else:
+            matches = set(self._statements)
+        for index, ids in (
+            (self._variation_index, variation_ids),
+            (self._gene_index, gene_ids),
+            (self._therapy_index, therapy_ids),
+            (self._condition_index, disease_ids),
+        ):
+            if ids:
+                matches &= set().union(*(index.get(i, set()) for i in ids))
+
+        if after_id is not None:
+            matches = {i for i in matches if i > after_id}
+        page = sorted(matches)[start:]
+        if limit is not None:
+            page = page[:limit]
+        return [self._hydrate(statement_id).to_gks() for statement_id in page]
+
+    async def get_gene(self, gene_id: str) -> MappableConcept | None:
+        """Attempt to retrieve a gene given exact ID match
+
+        :param gene_id: exact gene_id as stored in DB (eg `"metakb.gene:hgnc_6407"`)
+        :return: gene if available, with child gene objects in extensions
+        """
+        gene_node = self._genes.get(gene_id)
+        statement_ids = self._gene_index.get(gene_id)
+        if gene_node is None or not statement_ids:
+            return None
+        child_genes: dict[str, GeneNode] = {}
+        for statement_id in sorted(statement_ids):
+            for statement in _iter_statements(self._hydrate(statement_id)):
+                child_genes.setdefault(statement.has_gene.id, statement.has_gene)
+                constraint = statement.has_variant.has_constraint
+                if isinstance(constraint, FeatureContextConstraintNode):
+                    child_genes.setdefault(
+                        constraint.has_feature_context.id,
+                        constraint.has_feature_context,
+                    )
+        gene = gene_node.to_gks()
+        gene.extensions = [
+            *(gene.extensions or []),
+            Extension(
+                name="source_gene_objects",
+                value=[g.to_gks() for g in child_genes.values()],
+            ),
+        ]
+        return gene
+
+    async def get_stats(self) -> RepositoryStats:
+        """Fetch counts for entities
+
+        :return: structured stats data class
+        """
+        return RepositoryStats(
+            num_genes=sum(i.startswith("metakb") for i in self._genes),
+            num_drugs=sum(i.startswith("metakb") for i in self._drugs),
+            num_diseases=sum(i.startswith("metakb") for i in self._diseases),
+            num_variations=sum(i.startswith("metakb") for i in self._catvars),
+            num_source_statements=sum(
+                i.startswith(("civic", "moa")) for i in self._statements
+            ),
+            num_documents=len(self._documents),
+            num_metakb_assertions=sum(i.startswith("metakb") for i in self._statements),
+        )
+
+    async def load_assertion(self, assertion: Statement) -> None:
+        """Add or update a complete assertion object to the DB
+
+        :param assertion: metakb assertion
+        """
+        await self.load_assertions([assertion])
+
+    async def load_entities(self, assertions: list[Statement]) -> None:
+        """Add all shared entities (genes, conditions, therapeutics, variants,
+        documents, methods, strengths) referenced anywhere within the given assertions.
+
+        Statements and evidence lines themselves aren't loaded.
+
+        :param assertions: metakb assertions
+        """
+        for assertion in assertions:
+            for statement in _iter_statements(_make_statement_node(assertion)):
+                self._add_entities(statement)
+
+    async def load_assertions(
+        self,
+        assertions: list[Statement],
+        include_entities: bool = True,  # noqa: ARG002
+    ) -> None:
+        """Add or update a batch of complete assertion objects to the DB
+
+        Every statement within an assertion's evidence tree is also (re)stored, so
+        the most recently loaded version of a shared evidence item wins. Shared
+        entities are taken from the first-seen instance, as in the graph.
+
+        :param assertions: metakb assertions. IDs should be unique within the batch.
+        :param include_entities: ignored. Entities are always registered, since it's
+            cheap to do so.
+        """
+        for assertion in assertions:
+            for statement in _iter_statements(_make_statement_node(assertion)):
+                self._put_statement(self._add_entities(statement))
+
+    async def get_assertion_hashes(self) -> dict[str, str]:
+        """Get stored content hashes for all assertions that have one
+
+        :return: mapping from assertion ID to content hash
+        """
+        return dict(self._hashes)
+
+    async def set_assertion_hashes(self, hashes: dict[str, str]) -> None:
+        """Store content hashes for loaded assertions, to enable later detection of
+        unchanged assertions.
+
+        Any subsequent update to an assertion clears its hash.
+
+        :param hashes: mapping from assertion ID to content hash
+        """
+        self._hashes.update(
+            (assertion_id, content_hash)
+            for assertion_id, content_hash in hashes.items()
+            if assertion_id in self._statements
+        )
+
+    async def delete_assertions(self, statement_ids: list[str]) -> None:
+        """Remove assertions and their evidence lines
+
+        Contained evidence items are also removed, along with their own evidence, once
+        nothing else cites them. A given statement that is itself still an evidence
+        item elsewhere only loses its evidence lines.
+
+        :param statement_ids: IDs of assertions to remove
+        """
+        orphan_ids = set()
+        for statement_id in statement_ids:
+            statement = self._statements.get(statement_id)
+            if statement is None:
+                continue
+            orphan_ids.update(
+                i.id for i in _iter_evidence_items(statement.has_evidence_lines)
+            )
+            if self._cited_by.get(statement_id):
+                self._put_statement(
+                    statement.model_copy(update={"has_evidence_lines": []})
+                )
+            else:
+                self._unlink_statement(statement_id)
+                del self._statements[statement_id]
+                self._hashes.pop(statement_id, None)
+
+        # other assertions can only be removed explicitly
+        while orphan_ids:
+            statement_id = orphan_ids.pop()
+            statement = self._statements.get(statement_id)
+            if (
+                statement is None
+                or self._cited_by.get(statement_id)
+                or (
+                    statement_id.startswith("metakb.assertion:")
+                    and statement_id not in statement_ids
+                )
+            ):
+                continue
+            orphan_ids.update(
+                i.id for i in _iter_evidence_items(statement.has_evidence_lines)
+            )
+            self._unlink_statement(statement_id)
+            del self._statements[statement_id]
+            self._hashes.pop(statement_id, None)
+
+    async def refresh_statement_documents(self) -> int:
+        """Precompute read-ready documents for changed statements
+
+        Statements are already held in a read-ready form, so there's nothing to do.
+
+        :return: number of documents computed, which is always 0
+        """
+        return 0
+
+    async def get_data_version(self) -> str:
+        """Identify the current version of the stored data
+
+        :return: opaque version stamp, or an empty string if none has been recorded
+        """
+        return self._data_version
+
+    async def update_data_version(self) -> str:
+        """Record that stored data has changed, e.g. once a load is complete
+
+        :return: new version stamp
+        """
+        self._data_version = uuid4().hex
+        return self._data_version
+
+    async def teardown_db(self) -> None:
+        """Reset repository storage."""
+        self._reset()
+
+    async def get_all_assertion_ids(self) -> list[str]:
+        """Return all assertion IDs"""
+        return sorted(i for i in self._statements if i.startswith("metakb.assertion:"))
+
+    async def get_citing_assertion_ids(self, statement_ids: list[str]) -> set[str]:
+        """Find assertions that include any of the given statements anywhere within
+        their evidence
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: IDs of assertions citing them, directly or indirectly
+        """
+        citing_ids = set()
+        pending = list(statement_ids)
+        while pending:
+            for citing_id in self._cited_by.get(pending.pop(), ()):
+                if citing_id not in citing_ids:
+                    citing_ids.add(citing_id)
+                    pending.append(citing_id)
+        return {i for i in citing_ids if i.startswith("metakb.assertion:")}
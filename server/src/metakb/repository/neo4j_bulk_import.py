@@ -0,0 +1,796 @@
+"""Build node and relationship CSVs for the offline Neo4j bulk importer.
+
+Fresh graph builds via Cypher ``MERGE`` are slow. Instead, this module replays the
+``batch_*.cypher`` load queries against a small in-memory graph, and writes the result
+out in the format expected by ``neo4j-admin database import full``. Nodes get the same
+labels and properties, and are connected by the same relationships, as they would via
+``Neo4jRepository.load_entities()`` and ``Neo4jRepository.load_assertions()``.
+
+Any changes to those queries MUST be reflected here.
+
+The whole graph is held in memory until it's written, since later files' assertions
+can still merge into nodes from earlier ones. Copies of loaded assertions, which are
+only needed for merging, are kept compressed.
+"""
+
+import logging
+import math
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+from uuid import uuid4
+
+from ga4gh.va_spec.base import Statement
+
+from metakb.repository.neo4j_repository import (
+    _AssertionBatchParams,
+    _make_statement_node,
+)
+from metakb.repository.queries import catalog as queries_catalog
+
+_logger = logging.getLogger(__name__)
+
+
+# Delimiter for array values and labels within a single CSV field. Pass to the importer
+# as ``--array-delimiter=U+001F``.
+ARRAY_DELIMITER = "\x1f"
+
+
+# Node identity: (constrained label, key property value(s)). Mirrors the uniqueness
+# constraints in ``migration_0001_uniqueness_constraints.cypher``, so that e.g.
+# ``MERGE (t:Therapeutic {id: ...})`` matches an existing ``Drug`` node.
+_NodeKey = tuple[str, ...]
+
+# nodes that aren't merged on their ``id`` property
+_NON_ID_KEYED_GROUPS = {
+    "SequenceReference",
+    "LiteralSequenceExpression",
+    "ReferenceLengthExpression",
+}
+
+
+@dataclass
+class _Node:
+    labels: set[str]
+    properties: dict[str, Any] = field(default_factory=dict)
+
+
+class BulkImportFiles(NamedTuple):
+    """Paths to files produced for a bulk import"""
+
+    nodes: list[Path]
+    relationships: list[Path]
+    schema: Path
+
+
+class BulkImportGraph:
+    """In-memory graph that mimics the effects of the batch load queries.
+
+    Nodes are keyed the same way the queries ``MERGE`` them. Properties set via
+    ``ON CREATE SET`` are only applied to new nodes, other property updates always
+    apply, and setting a property to ``None`` removes it, as in Cypher.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty graph"""
+        self.nodes: dict[_NodeKey, _Node] = {}
+        # adjacency indexes: node key -> {(relationship type, other node key)}
+        self._outgoing: dict[_NodeKey, dict[tuple[str, _NodeKey], None]] = {}
+        self._incoming: dict[_NodeKey, dict[tuple[str, _NodeKey], None]] = {}
+        # compressed JSON, since these are only read back for merging
+        self._assertions: dict[str, bytes] = {}
+
+    @property
+    def relationships(self) -> Iterator[tuple[_NodeKey, str, _NodeKey]]:
+        """Iterate over all relationships as (start, type, end)"""
+        for start, outgoing in self._outgoing.items():
+            for rel_type, end in outgoing:
+                yield start, rel_type, end
+
+    def _merge_node(
+        self,
+        key: _NodeKey,
+        labels: Iterable[str],
+        on_create: dict[str, Any] | None = None,
+        properties: dict[str, Any] | None = None,
+    ) -> _NodeKey:
+        """Get or create a node, and update its labels and properties
+
+        :param key: node identity
+        :param labels: labels to ensure the node has
+        :param on_create: properties to set only if the node is new
+        :param properties: properties to set regardless
+        :return: node key, for convenience
+        """
+        node = self.nodes.get(key)
+        if node is None:
+            node = _Node(labels=set(labels))
+            if key[0] not in _NON_ID_KEYED_GROUPS:
+                node.properties["id"] = key[1]
+            self.nodes[key] = node
+            self._set_properties(node, on_create or {})
+        else:
+            node.labels.update(labels)
+        self._set_properties(node, properties or {})
+        return key
+
+    @staticmethod
+    def _set_properties(node: _Node, properties: dict[str, Any]) -> None:
+        """Apply a ``SET n += {...}``-style update
+
+        :param node: node to update
+        :param properties: new property values. ``None`` removes the property.
+        """
+        for name, value in properties.items():
+            if value is None:
+                node.properties.pop(name, None)
+            else:
+                node.properties[name] = value
+
+    def _merge_relationship(
+        self, start: _NodeKey, rel_type: str, end: _NodeKey
+    ) -> None:
+        self._outgoing.setdefault(start, {})[(rel_type, end)] = None
+        self._incoming.setdefault(end, {})[(rel_type, start)] = None
+
+    def _delete_relationship(
+        self, start: _NodeKey, rel_type: str, end: _NodeKey
+    ) -> None:
+        self._outgoing.get(start, {}).pop((rel_type, end), None)
+        self._incoming.get(end, {}).pop((rel_type, start), None)
+
+    def _detach_delete(self, key: _NodeKey) -> None:
+        if self.nodes.pop(key, None) is None:
+            return
+        for rel_type, end in self._outgoing.pop(key, {}):
+            self._incoming[end].pop((rel_type, key), None)
+        for rel_type, start in self._incoming.pop(key, {}):
+            self._outgoing[start].pop((rel_type, key), None)
+
+    def _delete_evidence_subtree(self, statement_id: str) -> None:
+        """Mirror ``delete_evidence_subtrees``
+
+        :param statement_id: ID of statement whose evidence lines should be removed
+        """
+        pending = [
+            end
+            for rel_type, end in self._outgoing.get(("Statement", statement_id), {})
+            if rel_type == "HAS_EVIDENCE_LINE" and end[0] == "EvidenceLine"
+        ]
+        while pending:
+            key = pending.pop()
+            pending.extend(
+                end
+                for rel_type, end in self._outgoing.get(key, {})
+                if rel_type == "HAS_EVIDENCE_ITEM" and end[0] == "EvidenceLine"
+            )
+            self._detach_delete(key)
+
+    def _merge_allele(self, allele: dict) -> _NodeKey:
+        """Mirror the allele portion of ``batch_load_definingalleleconstraint_catvar``
+
+        :param allele: allele node params
+        :return: allele node key
+        """
+        allele_key = self._merge_node(
+            ("Variation", allele["id"]),
+            ("Variation", "MolecularVariation", "Allele"),
+            on_create={
+                "name": allele["name"],
+                "digest": allele.get("digest"),
+                "expressions": allele["expressions"],
+            },
+        )
+        location = allele["has_location"]
+        location_key = self._merge_node(
+            ("Location", location["id"]),
+            ("Location", "SequenceLocation"),
+            on_create={
+                "digest": location.get("digest"),
+                "start": location["start"],
+                "end": location["end"],
+                "sequence": location["sequence"],
+            },
+        )
+        self._merge_relationship(allele_key, "HAS_LOCATION", location_key)
+        refget_accession = location["has_sequence_reference"]["refget_accession"]
+        sequence_reference_key = self._merge_node(
+            ("SequenceReference", refget_accession),
+            ("SequenceReference",),
+            on_create={"refget_accession": refget_accession},
+        )
+        self._merge_relationship(
+            location_key, "HAS_SEQUENCE_REFERENCE", sequence_reference_key
+        )
+
+        state = allele["has_state"]
+        if state["type"] == "LiteralSequenceExpression":
+            state_key = self._merge_node(
+                ("LiteralSequenceExpression", state["sequence"]),
+                ("SequenceExpression", "LiteralSequenceExpression"),
+                on_create={"sequence": state["sequence"]},
+            )
+        else:
+            state_key = self._merge_node(
+                (
+                    "ReferenceLengthExpression",
+                    str(state["length"]),
+                    str(state["repeat_subunit_length"]),
+                    state["sequence"],
+                ),
+                ("SequenceExpression", "ReferenceLengthExpression"),
+                on_create={
+                    "length": state["length"],
+                    "repeat_subunit_length": state["repeat_subunit_length"],
+                    "sequence": state["sequence"],
+                },
+            )
+        self._merge_relationship(allele_key, "HAS_STATE", state_key)
+        return allele_key
+
+    def _merge_catvar(self, catvar: dict, labels: tuple[str, ...]) -> _NodeKey:
+        return self._merge_node(
+            ("Variation", catvar["id"]),
+            labels,
+            on_create={
+                "name": catvar["name"],
+                "description": catvar["description"],
+                "aliases": catvar["aliases"],
+                "extensions": catvar["extensions"],
+                "mappings": catvar["mappings"],
+            },
+        )
+
+    def _load_dac_catvar(self, catvar: dict) -> None:
+        cv_key = self._merge_catvar(
+            catvar, ("Variation", "CategoricalVariant", "ProteinSequenceConsequence")
+        )
+        constraint = catvar["has_constraint"]
+        constraint_key = self._merge_node(
+            ("Constraint", constraint["id"]),
+            ("Constraint", "DefiningAlleleConstraint"),
+            on_create={"relations": constraint["relations"]},
+        )
+        self._merge_relationship(cv_key, "HAS_CONSTRAINT", constraint_key)
+        allele_key = self._merge_allele(constraint["has_defining_allele"])
+        self._merge_relationship(constraint_key, "HAS_DEFINING_ALLELE", allele_key)
+        for member in catvar["has_members"]:
+            member_key = self._merge_allele(member)
+            self._merge_relationship(cv_key, "HAS_MEMBER", member_key)
+
+    def _load_fcc_catvar(self, catvar: dict) -> None:
+        cv_key = self._merge_catvar(catvar, ("Variation", "CategoricalVariant"))
+        constraint = catvar["has_constraint"]
+        constraint_key = self._merge_node(
+            ("Constraint", constraint["id"]),
+            ("Constraint", "FeatureContextConstraint"),
+        )
+        self._merge_relationship(cv_key, "HAS_CONSTRAINT", constraint_key)
+        gene_key = self._load_gene(constraint["has_feature_context"])
+        self._merge_relationship(constraint_key, "HAS_FEATURE_CONTEXT", gene_key)
+
+    def _load_text_catvar(self, catvar: dict) -> None:
+        self._merge_catvar(catvar, ("Variation", "CategoricalVariant", "TextVariant"))
+
+    def _load_gene(self, gene: dict) -> _NodeKey:
+        return self._merge_node(
+            ("Gene", gene["id"]),
+            ("Gene",),
+            on_create={
+                "description": gene["description"],
+                "name": gene["name"],
+                "aliases": gene.get("aliases"),
+                "mappings": gene["mappings"],
+                "extensions": gene["extensions"],
+            },
+        )
+
+    def _load_condition_set(self, condition_set: dict) -> None:
+        condition_set_key = self._merge_node(
+            ("Condition", condition_set["id"]),
+            ("Condition", "ConditionSet"),
+            on_create={
+                "membership_operator": condition_set["membership_operator"],
+                "extensions": condition_set["extensions"],
+            },
+        )
+        for child in condition_set.get("conditions") or []:
+            child_key = ("Condition", child["id"])
+            existing = self.nodes.get(child_key)
+            existing_properties = existing.properties if existing else {}
+            properties = {
+                "name": child.get("name"),
+                "normalized_id": child.get("normalized_id"),
+                "mappings": child.get("mappings"),
+            }
+            # coalesce(child.<name>, c.<name>)
+            for name in ("membership_operator", "extensions"):
+                value = child.get(name)
+                properties[name] = (
+                    existing_properties.get(name) if value is None else value
+                )
+            self._merge_node(child_key, ("Condition",), properties=properties)
+            self._merge_relationship(condition_set_key, "HAS_CONDITION", child_key)
+
+    def _load_disease(self, disease: dict) -> None:
+        self._merge_node(
+            ("Condition", disease["id"]),
+            ("Condition", "Disease"),
+            on_create={"name": disease["name"], "mappings": disease["mappings"]},
+        )
+
+    def _load_phenotype(self, phenotype: dict) -> None:
+        self._merge_node(
+            ("Condition", phenotype["id"]),
+            ("Condition", "Phenotype"),
+            on_create={"name": phenotype["name"], "mappings": phenotype["mappings"]},
+        )
+
+    def _load_drug(self, drug: dict) -> _NodeKey:
+        return self._merge_node(
+            ("Therapeutic", drug["id"]),
+            ("Therapeutic", "Drug"),
+            on_create={
+                "name": drug["name"],
+                "mappings": drug["mappings"],
+                "aliases": drug.get("aliases"),
+                "extensions": drug["extensions"],
+            },
+        )
+
+    def _load_therapy_group(self, therapy_group: dict) -> None:
+        therapy_group_key = self._merge_node(
+            ("Therapeutic", therapy_group["id"]),
+            ("Therapeutic", "TherapyGroup"),
+            on_create={
+                "membership_operator": therapy_group["membership_operator"],
+                "extensions": therapy_group["extensions"],
+            },
+        )
+        for drug in therapy_group["has_therapies"]:
+            drug_key = self._load_drug(drug)
+            self._merge_relationship(therapy_group_key, "HAS_THERAPY", drug_key)
+
+    def _load_document(self, document: dict) -> None:
+        self._merge_node(
+            ("Document", document["id"]),
+            ("Document",),
+            on_create={
+                "title": document["title"],
+                "urls": document["urls"],
+                "pmid": document["pmid"],
+                "name": document["name"],
+                "doi": document["doi"],
+                "source_type": document["source_type"],
+                "extensions": document["extensions"],
+                "aliases": document["aliases"],
+            },
+        )
+
+    def _load_strength(self, strength: dict) -> None:
+        self._merge_node(
+            ("Strength", strength["id"]),
+            ("Strength",),
+            on_create={
+                "name": strength["name"],
+                "mappings": strength["mappings"],
+                "primary_coding": strength["primary_coding"],
+                "extensions": strength["extensions"],
+            },
+        )
+
+    def _load_method(self, method: dict) -> None:
+        method_key = self._merge_node(
+            ("Method", method["id"]),
+            ("Method",),
+            on_create={"name": method["name"], "method_type": method["method_type"]},
+        )
+        document_key = self._merge_node(
+            ("Document", method["has_document"]["id"]), ("Document",)
+        )
+        self._merge_relationship(method_key, "IS_REPORTED_IN", document_key)
+
+    def _load_evidence_line(self, evidence_line: dict) -> None:
+        evidence_line_key = self._merge_node(
+            ("EvidenceLine", evidence_line["id"]),
+            ("EvidenceLine",),
+            on_create={
+                "extensions": evidence_line["extensions"],
+                "direction": evidence_line["direction"],
+                "evidence_outcome": evidence_line["evidence_outcome"],
+            },
+        )
+        strength_key = ("Strength", evidence_line["strength_id"])
+        if strength_key in self.nodes:
+            self._merge_relationship(evidence_line_key, "HAS_STRENGTH", strength_key)
+
+    def _merge_statement_condition(self, condition: dict) -> _NodeKey:
+        """Mirror the condition block of ``batch_load_statement.cypher``
+
+        :param condition: condition node params
+        :return: key of the statement's condition node
+        """
+        condition_key = ("Condition", condition["id"])
+        if condition.get("conditions") is None:
+            return self._merge_node(condition_key, ("Condition",), properties=condition)
+        self._merge_node(
+            condition_key, ("ConditionSet",), properties={"membershipOperator": None}
+        )
+        for child in condition["conditions"]:
+            child_key = ("Condition", child["id"])
+            if child.get("conditions") is not None:
+                self._merge_node(
+                    child_key,
+                    ("ConditionSet",),
+                    properties={"membershipOperator": None},
+                )
+            else:
+                self._merge_node(child_key, ("Condition",), properties=child)
+            self._merge_relationship(condition_key, "HAS_CONDITION", child_key)
+        return condition_key
+
+    def _load_statement(self, statement: dict) -> None:
+        statement_key = self._merge_node(
+            ("Statement", statement["id"]),
+            ("Statement",),
+            properties={
+                "url": statement["url"],
+                "description": statement["description"],
+                "extensions": statement["extensions"],
+                "predicate": statement.get("predicate"),
+                "proposition_type": statement["proposition_type"],
+                "allele_origin_qualifier": statement["allele_origin_qualifier"],
+                "direction": statement["direction"],
+                "gks_document": None,
+                "content_hash": None,
+            },
+        )
+
+        for rel_type, end in list(self._outgoing.get(statement_key, {})):
+            if rel_type == "HAS_STRENGTH" and end[0] == "Strength":
+                self._delete_relationship(statement_key, rel_type, end)
+        strength_key = self._merge_node(
+            ("Strength", statement["has_strength"]["id"]), ("Strength",)
+        )
+        self._merge_relationship(statement_key, "HAS_STRENGTH", strength_key)
+
+        if classification := statement["has_classification"]:
+            classification_key = self._merge_node(
+                ("Classification", classification["id"]),
+                ("Classification",),
+                on_create={"primary_coding": classification["primary_coding"]},
+            )
+            self._merge_relationship(
+                statement_key, "HAS_CLASSIFICATION", classification_key
+            )
+
+        gene_key = self._merge_node(("Gene", statement["has_gene"]["id"]), ("Gene",))
+        self._merge_relationship(statement_key, "HAS_GENE_CONTEXT", gene_key)
+        if therapeutic := statement.get("has_therapeutic"):
+            therapeutic_key = self._merge_node(
+                ("Therapeutic", therapeutic["id"]), ("Therapeutic",)
+            )
+            self._merge_relationship(statement_key, "HAS_THERAPEUTIC", therapeutic_key)
+        if condition := statement["has_condition"]:
+            condition_key = self._merge_statement_condition(condition)
+            self._merge_relationship(statement_key, "HAS_TUMOR_TYPE", condition_key)
+
+        method_key = self._merge_node(
+            ("Method", statement["has_method"]["id"]), ("Method",)
+        )
+        self._merge_relationship(statement_key, "IS_SPECIFIED_BY", method_key)
+        catvar_key = self._merge_node(
+            ("Variation", statement["has_variant"]["id"]), ("CategoricalVariant",)
+        )
+        self._merge_relationship(statement_key, "HAS_SUBJECT_VARIANT", catvar_key)
+
+        for document in statement["has_documents"] or []:
+            document_key = self._merge_node(("Document", document["id"]), ("Document",))
+            self._merge_relationship(statement_key, "IS_REPORTED_IN", document_key)
+        for evidence_line in statement["has_evidence_lines"] or []:
+            evidence_line_key = ("EvidenceLine", evidence_line["id"])
+            if evidence_line_key in self.nodes:
+                self._merge_relationship(
+                    statement_key, "HAS_EVIDENCE_LINE", evidence_line_key
+                )
+
+    def _link_evidence_items(self, evidence_line: dict) -> None:
+        evidence_line_key = ("EvidenceLine", evidence_line["id"])
+        if evidence_line_key not in self.nodes:
+            return
+        item_keys = [("Statement", i) for i in evidence_line["statement_item_ids"]] + [
+            ("EvidenceLine", i) for i in evidence_line["evidence_line_item_ids"]
+        ]
+        for item_key in item_keys:
+            if item_key in self.nodes:
+                self._merge_relationship(
+                    evidence_line_key, "HAS_EVIDENCE_ITEM", item_key
+                )
+
+    def get_statement(self, statement_id: str) -> Statement | None:
+        """Retrieve a previously-loaded assertion, as in
+        ``Neo4jRepository.get_statement()``
+
+        :param statement_id: assertion ID
+        :return: assertion, as it would be read back from the DB, if available
+        """
+        document = self._assertions.get(statement_id)
+        if document is None:
+            return None
+        return Statement.model_validate_json(zlib.decompress(document))
+
+    def load_entities(self, assertions: list[Statement]) -> None:
+        """Add shared entities, as in ``Neo4jRepository.load_entities()``
+
+        :param assertions: metakb assertions
+        """
+        params = _AssertionBatchParams()
+        for assertion in assertions:
+            params.add_assertion(assertion)
+        loaders = (
+            (params.dac_catvars, self._load_dac_catvar),
+            (params.fcc_catvars, self._load_fcc_catvar),
+            (params.text_catvars, self._load_text_catvar),
+            (params.genes, self._load_gene),
+            (params.condition_sets, self._load_condition_set),
+            (params.diseases, self._load_disease),
+            (params.phenotypes, self._load_phenotype),
+            (params.drugs, self._load_drug),
+            (params.therapy_groups, self._load_therapy_group),
+            (params.documents, self._load_document),
+            (params.strengths, self._load_strength),
+            (params.methods, self._load_method),
+        )
+        for rows, loader in loaders:
+            for row in rows.values():
+                loader(row)
+
+    def load_assertions(self, assertions: list[Statement]) -> None:
+        """Add assertions and their evidence, as in
+        ``Neo4jRepository.load_assertions(..., include_entities=False)``
+
+        :param assertions: metakb assertions
+        """
+        params = _AssertionBatchParams()
+        for assertion in assertions:
+            params.add_assertion(assertion)
+            self._assertions[assertion.id] = zlib.compress(
+                _make_statement_node(assertion)
+                .to_gks()
+                .model_dump_json(exclude_none=True)
+                .encode(),
+                1,
+            )
+        for statement_id in params.replaced_statement_ids:
+            self._delete_evidence_subtree(statement_id)
+        for evidence_line in params.evidence_lines.values():
+            self._load_evidence_line(evidence_line)
+        for statement in params.statements.values():
+            self._load_statement(statement)
+        for evidence_line in params.evidence_lines.values():
+            self._link_evidence_items(evidence_line)
+
+
+# header type for a property that's only ever an empty list, which can be imported
+# as an array of any type
+_EMPTY_ARRAY_TYPE = "[]"
+
+
+def _format_csv_scalar(value: Any) -> str:  # noqa: ANN401
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        return repr(value)
+    return str(value)
+
+
+def _format_csv_value(value: Any) -> str:  # noqa: ANN401
+    """Format a property value for the bulk importer
+
+    Strings and arrays are always quoted, so that empty strings and empty arrays are
+    kept as-is rather than treated as a missing property.
+
+    :param value: property value
+    :return: CSV field
+    """
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        value = ARRAY_DELIMITER.join(_format_csv_scalar(v) for v in value)
+    elif not isinstance(value, str):
+        return _format_csv_scalar(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _get_csv_type(value: Any) -> str:  # noqa: ANN401
+    """Get bulk importer header type suffix for a property value
+
+    :param value: property value
+    :return: type suffix, e.g. ``":long"`` or ``":double[]"``, empty string for plain
+        strings, or ``"[]"`` for an empty list
+    :raise ValueError: if the value can't be stored as a Neo4j property, e.g. a list
+        with elements of more than one type
+    """
+    if isinstance(value, list):
+        if not value:
+            return _EMPTY_ARRAY_TYPE
+        element_types = {_get_csv_type(v) for v in value}
+        element_type = element_types.pop()
+        if element_types or element_type.endswith("[]"):
+            msg = f"Can't store list with mixed or nested element types: {value}"
+            raise ValueError(msg)
+        return f"{element_type or ':string'}[]"
+    if isinstance(value, bool):
+        return ":boolean"
+    if isinstance(value, int):
+        return ":long"
+    if isinstance(value, float):
+        return ":double"
+    if isinstance(value, str):
+        return ""
+    msg = f"Can't store value of type {type(value).__name__}: {value}"
+    raise ValueError(msg)
+
+
+def _merge_csv_types(column_types: dict[str, str], types: dict[str, str]) -> bool:
+    """Add a node's property types to a file's column types, if they're compatible
+
+    :param column_types: property name -> type suffix for columns of a file so far.
+        Updated in place if compatible.
+    :param types: property name -> type suffix for a node's properties
+    :return: whether the node can go in the file
+    """
+    merged = {}
+    for name, csv_type in types.items():
+        column_type = column_types.get(name, csv_type)
+        if column_type == _EMPTY_ARRAY_TYPE and csv_type.endswith("[]"):
+            merged[name] = csv_type
+        elif csv_type == _EMPTY_ARRAY_TYPE and column_type.endswith("[]"):
+            merged[name] = column_type
+        elif csv_type == column_type:
+            merged[name] = csv_type
+        else:
+            return False
+    column_types.update(merged)
+    return True
+
+
+def _split_by_csv_types(
+    nodes: list[tuple[_NodeKey, _Node]],
+) -> list[tuple[dict[str, str], list[tuple[_NodeKey, _Node]]]]:
+    """Split nodes into groups whose properties have consistent types
+
+    Each header column has a single type, so e.g. a property that's an integer on
+    some nodes and a float on others needs separate files.
+
+    :param nodes: nodes with the same labels
+    :return: (property name -> type suffix, nodes) for each group
+    """
+    groups: list[tuple[dict[str, str], list[tuple[_NodeKey, _Node]]]] = []
+    for key, node in nodes:
+        types = {name: _get_csv_type(v) for name, v in node.properties.items()}
+        for column_types, group_nodes in groups:
+            if _merge_csv_types(column_types, types):
+                group_nodes.append((key, node))
+                break
+        else:
+            groups.append((types, [(key, node)]))
+    return groups
+
+
+def _write_csv(path: Path, header: list[str], rows: Iterable[list[str]]) -> None:
+    with path.open("w", newline="") as f:
+        f.write(",".join(header) + "\n")
+        for row in rows:
+            f.write(",".join(row) + "\n")
+
+
+def write_bulk_import_files(
+    graph: BulkImportGraph, output_dir: Path
+) -> BulkImportFiles:
+    """Write graph contents as bulk importer CSVs
+
+    Node files are split by label set, with one file per distinct set of labels, and
+    further split if a property has different types on different nodes. All
+    relationships go in a single file. A ``DataVersion`` node with a new version is
+    also written, as ``update_data_version.cypher`` sets after each load, so that
+    caches and cursors from a previously imported graph aren't reused.
+
+    :param graph: graph to write
+    :param output_dir: directory to write files to. Created if it doesn't exist.
+    :return: paths to written files
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    import_ids = {key: str(i) for i, key in enumerate(graph.nodes)}
+
+    nodes_by_labels: dict[tuple[str, ...], list[tuple[_NodeKey, _Node]]] = {}
+    for key, node in graph.nodes.items():
+        nodes_by_labels.setdefault(tuple(sorted(node.labels)), []).append((key, node))
+
+    node_files = []
+    for labels, nodes in sorted(nodes_by_labels.items()):
+        for i, (column_types, group_nodes) in enumerate(_split_by_csv_types(nodes)):
+            property_names = sorted(column_types)
+            header = [":ID", ":LABEL"]
+            for name in property_names:
+                csv_type = column_types[name]
+                if csv_type == _EMPTY_ARRAY_TYPE:
+                    csv_type = ":string[]"
+                header.append(f"{name}{csv_type}")
+            rows = (
+                [
+                    import_ids[key],
+                    _format_csv_value(list(labels)),
+                    *(
+                        _format_csv_value(node.properties.get(p))
+                        for p in property_names
+                    ),
+                ]
+                for key, node in group_nodes
+            )
+            suffix = f"_{i}" if i else ""
+            path = output_dir / f"nodes_{'_'.join(labels)}{suffix}.csv"
+            _write_csv(path, header, rows)
+            node_files.append(path)
+
+    data_version_path = output_dir / "nodes_DataVersion.csv"
+    _write_csv(
+        data_version_path,
+        [":ID", ":LABEL", "version", "updated_at:datetime"],
+        [
+            [
+                str(len(import_ids)),
+                "DataVersion",
+                _format_csv_value(str(uuid4())),
+                datetime.now(tz=UTC).isoformat(),
+            ]
+        ],
+    )
+    node_files.append(data_version_path)
+
+    relationships_path = output_dir / "relationships.csv"
+    _write_csv(
+        relationships_path,
+        [":START_ID", ":TYPE", ":END_ID"],
+        (
+            [import_ids[start], rel_type, import_ids[end]]
+            for start, rel_type, end in graph.relationships
+        ),
+    )
+
+    # importer doesn't create constraints/indexes; run this afterward via cypher-shell.
+    # The schema version isn't recorded, but the next repository initialization will
+    # find the (idempotent) migrations already applied and record it
+    schema_path = output_dir / "schema.cypher"
+    schema_path.write_text(
+        "".join(f"{query.strip()};\n" for query in queries_catalog.initialize())
+    )
+
+    _logger.info("Wrote %s nodes to %s", len(graph.nodes), output_dir)
+    return BulkImportFiles(node_files, [relationships_path], schema_path)
+
+
+def get_import_command(files: BulkImportFiles, database: str = "neo4j") -> str:
+    """Get the ``neo4j-admin`` invocation for importing the given files
+
+    :param files: files written by ``write_bulk_import_files()``
+    :param database: name of DB to (re)create
+    :return: shell command
+    """
+    args = [
+        "neo4j-admin database import full",
+        "--overwrite-destination=true",
+        "--array-delimiter=U+001F",
+        "--multiline-fields=true",
+        *(f"--nodes={path}" for path in files.nodes),
+        *(f"--relationships={path}" for path in files.relationships),
+        database,
+    ]
+    return " \\\n  ".join(args)
@@ -1,7 +1,11 @@
 """Neo4j implementation of the repository abstraction."""
 
 import logging
-from typing import NamedTuple
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import LiteralString, NamedTuple
 from urllib.parse import urlparse, urlunparse
 
 from ga4gh.cat_vrs.models import CategoricalVariant
@@ -27,12 +31,18 @@ from neo4j import (
     AsyncTransaction,
     Record,
 )
+from neo4j.exceptions import Neo4jError
 from neo4j.graph import Node
 
 from metakb.config import get_config
-from metakb.repository.base import AbstractRepository, RepositoryStats
+from metakb.repository.base import (
+    AbstractRepository,
+    RepositoryMemoryError,
+    RepositoryStats,
+)
 from metakb.repository.neo4j_models import (
     AlleleNode,
+    BaseNode,
     CategoricalVariantNode,
     ClassificationNode,
     ConditionSetNode,
@@ -54,18 +64,61 @@ from metakb.repository.neo4j_models import (
     TherapeuticResponseStatementNode,
     TherapyGroupNode,
 )
+from metakb.repository.neo4j_schema import migrate_schema
 from metakb.repository.queries import catalog as queries_catalog
+from metakb.repository.query_metrics import QueryMetrics
+from metakb.repository.statement_cache import StatementCache
 
 _logger = logging.getLogger(__name__)
 
 
 CYPHER_PAGE_LIMIT = 999999999
 
+# max number of nodes to write per transaction when preloading shared entities
+ENTITY_CHUNK_SIZE = 1000
+
+# max number of statements to build documents for at once
+STATEMENT_DOCUMENT_BATCH_SIZE = 100
+
+_StatementNode = (
+    DiagnosticStatementNode | PrognosticStatementNode | TherapeuticResponseStatementNode
+)
+
+# administrative commands (e.g. creating databases) must be issued against this DB
+SYSTEM_DATABASE = "system"
+
+# errors reported when a transaction exceeds the server's memory limits. These are
+# classed as transient, but retrying the same transaction as-is rarely succeeds.
+_MEMORY_ERROR_CODES = frozenset(
+    {
+        "Neo.TransientError.General.MemoryPoolOutOfMemoryError",
+        "Neo.TransientError.General.OutOfMemoryError",
+        "Neo.TransientError.General.TransactionMemoryLimit",
+    }
+)
+
 
 class Neo4jCredentialsError(Exception):
     """Raise for invalid or unparseable Neo4j credentials"""
 
 
+@contextmanager
+def _raise_memory_errors() -> Iterator[None]:
+    """Convert Neo4j out-of-memory errors into ``RepositoryMemoryError``
+
+    Raising a non-driver exception from within a transaction function also stops the
+    driver from retrying it.
+
+    :raise RepositoryMemoryError: if the server ran out of transaction memory
+    """
+    try:
+        yield
+    except Neo4jError as e:
+        if e.code in _MEMORY_ERROR_CODES:
+            raise RepositoryMemoryError(e.message) from e
+        raise
+
+
 class _Neo4jConnectionParams(NamedTuple):
     """Contain components of a Neo4j db connection"""
 
@@ -135,23 +188,338 @@ def get_driver(
     )
 
 
+async def get_database_alias_target(driver: AsyncDriver, alias: str) -> str | None:
+    """Get the database that an alias currently points to
+
+    Database management commands require Neo4j Enterprise Edition.
+
+    :param driver: Neo4j driver
+    :param alias: name of database alias
+    :return: name of target database, or ``None`` if alias doesn't exist
+    """
+    result = await driver.execute_query(
+        queries_catalog.get_database_alias(),
+        alias=alias,
+        database_=SYSTEM_DATABASE,
+    )
+    return result.records[0]["database"] if result.records else None
+
+
+async def database_exists(driver: AsyncDriver, name: str) -> bool:
+    """Check whether a database (rather than an alias) exists
+
+    Database management commands require Neo4j Enterprise Edition.
+
+    :param driver: Neo4j driver
+    :param name: database name
+    :return: ``True`` if a database with this name exists
+    """
+    result = await driver.execute_query(
+        queries_catalog.get_database(), name=name, database_=SYSTEM_DATABASE
+    )
+    return bool(result.records)
+
+
+async def create_database(driver: AsyncDriver, name: str) -> None:
+    """Create an empty database, replacing any existing database of the same name
+
+    Waits until the database is online. Database management commands require Neo4j
+    Enterprise Edition.
+
+    :param driver: Neo4j driver
+    :param name: database name
+    """
+    await driver.execute_query(
+        queries_catalog.create_database(), name=name, database_=SYSTEM_DATABASE
+    )
+
+
+async def set_database_alias(driver: AsyncDriver, alias: str, database: str) -> None:
+    """Atomically point a database alias to a database, creating it if necessary
+
+    Database management commands require Neo4j Enterprise Edition.
+
+    :param driver: Neo4j driver
+    :param alias: name of database alias
+    :param database: name of database for alias to point to
+    """
+    await driver.execute_query(
+        queries_catalog.set_database_alias(),
+        alias=alias,
+        database=database,
+        database_=SYSTEM_DATABASE,
+    )
+
+
+def _make_statement_node(
+    statement: Statement,
+) -> (
+    TherapeuticResponseStatementNode | DiagnosticStatementNode | PrognosticStatementNode
+):
+    """Create the repository node corresponding to a statement's proposition type
+
+    :param statement: va-spec statement
+    :return: statement node, including all contained evidence
+    :raise NotImplementedError: if proposition type is unsupported
+    """
+    match statement.proposition:
+        case VariantTherapeuticResponseProposition():
+            return TherapeuticResponseStatementNode.from_gks(statement)
+        case VariantDiagnosticProposition():
+            return DiagnosticStatementNode.from_gks(statement)
+        case VariantPrognosticProposition():
+            return PrognosticStatementNode.from_gks(statement)
+        case _:
+            msg = f"Unsupported proposition type: {statement.proposition.type}"
+            raise NotImplementedError(msg)
+
+
+@dataclass
+class _AssertionBatchParams:
+    """Collect query parameters for loading a batch of assertions.
+
+    Each collection maps node ID -> query parameters, so that entities shared between
+    statements (genes, methods, strengths, etc) are only sent to the DB once per batch.
+    Most node properties are only set on creation, so the first-seen instance of an
+    entity is kept; statements are always overwritten, so the last-seen instance wins.
+    """
+
+    replaced_statement_ids: dict[str, None] = field(default_factory=dict)
+    dac_catvars: dict[str, dict] = field(default_factory=dict)
+    fcc_catvars: dict[str, dict] = field(default_factory=dict)
+    text_catvars: dict[str, dict] = field(default_factory=dict)
+    genes: dict[str, dict] = field(default_factory=dict)
+    diseases: dict[str, dict] = field(default_factory=dict)
+    phenotypes: dict[str, dict] = field(default_factory=dict)
+    condition_sets: dict[str, dict] = field(default_factory=dict)
+    drugs: dict[str, dict] = field(default_factory=dict)
+    therapy_groups: dict[str, dict] = field(default_factory=dict)
+    documents: dict[str, dict] = field(default_factory=dict)
+    methods: dict[str, dict] = field(default_factory=dict)
+    strengths: dict[str, dict] = field(default_factory=dict)
+    evidence_lines: dict[str, dict] = field(default_factory=dict)
+    statements: dict[str, dict] = field(default_factory=dict)
+
+    @staticmethod
+    def _put(collection: dict[str, dict], node: BaseNode) -> None:
+        """Add node params to collection unless a node with the same ID is present"""
+        if node.id not in collection:
+            collection[node.id] = node.model_dump(mode="json")
+
+    def _add_catvar(self, catvar: CategoricalVariantNode) -> None:
+        """Add categorical variant params
+
+        :param catvar: categorical variant node
+        """
+        match catvar.has_constraint:
+            case DefiningAlleleConstraintNode():
+                self._put(self.dac_catvars, catvar)
+            case FeatureContextConstraintNode():
+                self._put(self.fcc_catvars, catvar)
+            case _:
+                self._put(self.text_catvars, catvar)
+
+    def _add_condition(
+        self, condition: ConditionSetNode | DiseaseNode | PhenotypeNode
+    ) -> None:
+        """Add condition params, including the members of a condition set
+
+        :param condition: condition node
+        """
+        match condition:
+            case ConditionSetNode():
+                self._put(self.condition_sets, condition)
+                for child in condition.conditions:
+                    self._add_condition(child)
+            case DiseaseNode():
+                self._put(self.diseases, condition)
+            case PhenotypeNode():
+                self._put(self.phenotypes, condition)
+
+    def _add_evidence_line(self, evidence_line: EvidenceLineNode) -> None:
+        """Add evidence line params, as well as params for everything it contains
+
+        Nested evidence is referenced by ID only. Edges to evidence items are drawn
+        once every node in the batch exists.
+
+        :param evidence_line: evidence line node
+        """
+        statement_item_ids = []
+        evidence_line_item_ids = []
+        for item in evidence_line.has_evidence_items:
+            if isinstance(item, EvidenceLineNode):
+                self._add_evidence_line(item)
+                evidence_line_item_ids.append(item.id)
+            else:
+                self._add_statement(item)
+                statement_item_ids.append(item.id)
+        self._put(self.strengths, evidence_line.has_strength)
+        if evidence_line.id not in self.evidence_lines:
+            self.evidence_lines[evidence_line.id] = {
+                **evidence_line.model_dump(
+                    mode="json", exclude={"has_evidence_items", "has_strength"}
+                ),
+                "strength_id": evidence_line.has_strength.id,
+                "statement_item_ids": statement_item_ids,
+                "evidence_line_item_ids": evidence_line_item_ids,
+            }
+
+    def _add_statement(
+        self,
+        statement: TherapeuticResponseStatementNode
+        | DiagnosticStatementNode
+        | PrognosticStatementNode,
+    ) -> None:
+        """Add statement params, as well as params for any contained evidence
+
+        :param statement: statement node
+        """
+        for evidence_line in statement.has_evidence_lines:
+            self._add_evidence_line(evidence_line)
+        self._add_catvar(statement.has_variant)
+        self._put(self.genes, statement.has_gene)
+        self._add_condition(statement.has_condition)
+        if isinstance(statement, TherapeuticResponseStatementNode):
+            if isinstance(statement.has_therapeutic, TherapyGroupNode):
+                self._put(self.therapy_groups, statement.has_therapeutic)
+            else:
+                self._put(self.drugs, statement.has_therapeutic)
+        for document in statement.has_documents:
+            self._put(self.documents, document)
+        self._put(self.documents, statement.has_method.has_document)
+        self._put(self.strengths, statement.has_strength)
+        self._put(self.methods, statement.has_method)
+        self.statements[statement.id] = {
+            **statement.model_dump(mode="json", exclude={"has_evidence_lines"}),
+            "has_evidence_lines": [
+                {"id": el.id} for el in statement.has_evidence_lines
+            ],
+        }
+
+    def entity_queries(self) -> list[tuple[LiteralString, str, dict[str, dict]]]:
+        """Get queries for loading shared entities, in load order
+
+        :return: list of (query, parameter name, parameter values) for each entity kind
+        """
+        return [
+            (queries_catalog.batch_load_dac_catvar(), "catvars", self.dac_catvars),
+            (queries_catalog.batch_load_fcc_catvar(), "catvars", self.fcc_catvars),
+            (queries_catalog.batch_load_text_catvar(), "catvars", self.text_catvars),
+            (queries_catalog.batch_load_gene(), "genes", self.genes),
+            (
+                queries_catalog.batch_load_condition_set(),
+                "condition_sets",
+                self.condition_sets,
+            ),
+            (queries_catalog.batch_load_disease(), "diseases", self.diseases),
+            (queries_catalog.batch_load_phenotype(), "phenotypes", self.phenotypes),
+            (queries_catalog.batch_load_drug(), "drugs", self.drugs),
+            (
+                queries_catalog.batch_load_therapy_group(),
+                "therapy_groups",
+                self.therapy_groups,
+            ),
+            (queries_catalog.batch_load_document(), "documents", self.documents),
+            (queries_catalog.batch_load_strength(), "strengths", self.strengths),
+            (queries_catalog.batch_load_method(), "methods", self.methods),
+        ]
+
+    def evidence_queries(self) -> list[tuple[LiteralString, str, dict[str, dict]]]:
+        """Get queries for loading evidence lines and statements, in load order
+
+        Expects that all entities they point to already exist.
+
+        :return: list of (query, parameter name, parameter values)
+        """
+        return [
+            (
+                queries_catalog.batch_load_evidence_line(),
+                "evidence_lines",
+                self.evidence_lines,
+            ),
+            (queries_catalog.batch_load_statement(), "statements", self.statements),
+            (
+                queries_catalog.batch_link_evidence_items(),
+                "evidence_lines",
+                self.evidence_lines,
+            ),
+        ]
+
+    def add_assertion(self, assertion: Statement) -> None:
+        """Add params for a complete assertion
+
+        The assertion's existing evidence tree is marked for replacement, so that it
+        can be recreated from scratch (see ``Neo4jRepository.load_assertion()``).
+
+        :param assertion: metakb assertion
+        """
+        self.replaced_statement_ids[assertion.id] = None
+        self._add_statement(_make_statement_node(assertion))
+
+
 class Neo4jRepository(AbstractRepository):
     """Neo4j implementation of a repository abstraction."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        query_metrics: QueryMetrics | None = None,
+        statement_cache: StatementCache | None = None,
+    ) -> None:
         """Initialize repository instance
 
         :param session: Neo4j driver session
+        :param query_metrics: if given, record timings for every query run
+        :param statement_cache: if given, reuse fully-built statements from here
+            rather than fetching them again, for as long as the data version is
+            unchanged. Statements returned from the cache are shared, so callers
+            must not modify them.
         """
         self.session = session
+        self.query_metrics = query_metrics
+        self.statement_cache = statement_cache
+
+    async def _run(
+        self,
+        tx: AsyncTransaction | AsyncManagedTransaction,
+        query: LiteralString,
+        parameters: dict | None = None,
+        **kwargs,
+    ) -> list[Record]:
+        """Run a query and fetch all of its results
+
+        If query metrics are enabled, time the query, keyed by its name in the
+        queries catalog.
+
+        :param tx: Neo4j transaction
+        :param query: query to run
+        :param parameters: query parameters
+        :param kwargs: additional query parameters
+        :return: all result records
+        """
+        if self.query_metrics is None:
+            result = await tx.run(query, parameters, **kwargs)
+            return [record async for record in result]
+        start = perf_counter()
+        result = await tx.run(query, parameters, **kwargs)
+        records = [record async for record in result]
+        summary = await result.consume()
+        self.query_metrics.record(
+            queries_catalog.get_query_name(query),
+            (perf_counter() - start) * 1000,
+            len(records),
+            summary.result_available_after,
+            summary.result_consumed_after,
+        )
+        return records
 
     async def initialize(
         self,
     ) -> None:
-        """Set up DB schema"""
-        async with await self.session.begin_transaction() as tx:
-            for query in queries_catalog.initialize():
-                await tx.run(query)
+        """Set up DB schema, applying any migrations that haven't been applied yet"""
+        applied = await migrate_schema(self.session)
+        if applied:
+            _logger.info("Migrated DB schema to version %s", applied[-1])
 
     async def _add_catvar(
         self, tx: AsyncTransaction, catvar: CategoricalVariant
@@ -176,7 +544,7 @@ class Neo4jRepository(AbstractRepository):
                 raise NotImplementedError
         else:
             query = queries_catalog.load_text_catvar()
-        await tx.run(query, cv=catvar_node.model_dump(mode="json"))
+        await self._run(tx, query, cv=catvar_node.model_dump(mode="json"))
 
     async def _add_document(self, tx: AsyncTransaction, document: Document) -> None:
         """Add document to DB
@@ -185,7 +553,8 @@ class Neo4jRepository(AbstractRepository):
         :param document: VA-Spec document
         """
         document_node = DocumentNode.from_gks(document)
-        await tx.run(
+        await self._run(
+            tx,
             queries_catalog.load_document(),
             doc=document_node.model_dump(mode="json"),
         )
@@ -201,8 +570,8 @@ class Neo4jRepository(AbstractRepository):
         :param gene: VA-Spec gene object
         """
         gene_node = GeneNode.from_gks(gene)
-        await tx.run(
-            queries_catalog.load_gene(), gene=gene_node.model_dump(mode="json")
+        await self._run(
+            tx, queries_catalog.load_gene(), gene=gene_node.model_dump(mode="json")
         )
 
     async def _add_condition(self, tx: AsyncTransaction, condition: Condition) -> None:
@@ -215,7 +584,8 @@ class Neo4jRepository(AbstractRepository):
         cond = getattr(condition, "root", condition)
         if isinstance(cond, ConditionSet):
             node = ConditionSetNode.from_gks(cond)
-            await tx.run(
+            await self._run(
+                tx,
                 queries_catalog.load_condition_set(),
                 condition_set=node.model_dump(mode="json"),
             )
@@ -230,13 +600,15 @@ class Neo4jRepository(AbstractRepository):
 
         if cond.conceptType == "Disease":
             disease_node = DiseaseNode.from_gks(cond)
-            await tx.run(
+            await self._run(
+                tx,
                 queries_catalog.load_disease(),
                 disease=disease_node.model_dump(mode="json"),
             )
         elif cond.conceptType == "Phenotype":
             phenotype_node = PhenotypeNode.from_gks(cond)
-            await tx.run(
+            await self._run(
+                tx,
                 queries_catalog.load_phenotype(),
                 phenotype=phenotype_node.model_dump(mode="json"),
             )
@@ -255,12 +627,13 @@ class Neo4jRepository(AbstractRepository):
         root = therapeutic.root
         if isinstance(root, MappableConcept):
             drug_node = DrugNode.from_gks(root)
-            await tx.run(
-                queries_catalog.load_drug(), drug=drug_node.model_dump(mode="json")
+            await self._run(
+                tx, queries_catalog.load_drug(), drug=drug_node.model_dump(mode="json")
             )
         elif isinstance(root, TherapyGroup):
             therapy_group_node = TherapyGroupNode.from_gks(root)
-            await tx.run(
+            await self._run(
+                tx,
                 queries_catalog.load_therapy_group(),
                 therapy_group=therapy_group_node.model_dump(mode="json"),
             )
@@ -274,7 +647,8 @@ class Neo4jRepository(AbstractRepository):
         :param tx: Neo4j transaction
         :param method: VA-Spec method object
         """
-        await tx.run(
+        await self._run(
+            tx,
             queries_catalog.load_method(),
             method=MethodNode.from_gks(method).model_dump(mode="json"),
         )
@@ -287,7 +661,8 @@ class Neo4jRepository(AbstractRepository):
         :param tx: Neo4j transaction
         :param strength: VA-Spec strength object
         """
-        await tx.run(
+        await self._run(
+            tx,
             queries_catalog.load_strength(),
             strength=StrengthNode.from_gks(strength).model_dump(mode="json"),
         )
@@ -318,7 +693,8 @@ class Neo4jRepository(AbstractRepository):
             strength_id = None
 
         evline_node = EvidenceLineNode.from_gks(evidence_line)
-        await tx.run(
+        await self._run(
+            tx,
             queries_catalog.load_evidence_line(),
             evidence_line=evline_node.model_dump(mode="json"),
             strength_id=strength_id,
@@ -361,55 +737,100 @@ class Neo4jRepository(AbstractRepository):
             await self._add_document(tx, statement.specifiedBy.reportedIn)
         await self._add_strength(tx, statement.strength)
         await self._add_method(tx, statement.specifiedBy)
-        match statement.proposition:
-            case VariantTherapeuticResponseProposition():
-                statement_node = TherapeuticResponseStatementNode.from_gks(statement)
-            case VariantDiagnosticProposition():
-                statement_node = DiagnosticStatementNode.from_gks(statement)
-            case VariantPrognosticProposition():
-                statement_node = PrognosticStatementNode.from_gks(statement)
-            case _:
-                msg = f"Unsupported proposition type: {statement.proposition.type}"
-                raise NotImplementedError(msg)
-        await tx.run(
+        statement_node = _make_statement_node(statement)
+        await self._run(
+            tx,
             queries_catalog.load_statement(),
             statement=statement_node.model_dump(mode="json"),
         )
 
-    async def _recursive_delete_ev_line(
-        self, tx: AsyncTransaction, ev_line: EvidenceLine
-    ) -> None:
-        """Delete an evidence line and any evidence lines that it contains
-
-        This saves us the effort of manually moving edges around when evidence structure
-        changes. Recursivity means it needs to be factored out into its own method.
-
-        :param tx: neo4j transaction
-        :param assertion:
-        """
-        if not ev_line.hasEvidenceItems:
-            _logger.error(
-                "No evidence items under evidence line (%s)-- something has gone wrong",
-                ev_line,
-            )
-            raise ValueError
-        for item in ev_line.hasEvidenceItems:
-            if isinstance(item, EvidenceLine):
-                await self._recursive_delete_ev_line(tx, item)
-        await tx.run(
-            queries_catalog.delete_evidence_line(), evidence_line_id=ev_line.id
-        )
-
     async def load_assertion(self, assertion: Statement) -> None:
         """Add or update a complete assertion object to the DB
 
         :param assertion: metakb assertion
         """
         async with await self.session.begin_transaction() as tx:
-            for line in assertion.hasEvidenceLines:
-                await self._recursive_delete_ev_line(tx, line)
+            # replace the entire evidence tree, rather than trying to move edges
+            # around when the evidence structure changes
+            await self._run(
+                tx,
+                queries_catalog.delete_evidence_subtrees(),
+                statement_ids=[assertion.id],
+            )
             await self._add_statement(tx, assertion)
 
+    async def load_entities(
+        self, assertions: list[Statement], chunk_size: int = ENTITY_CHUNK_SIZE
+    ) -> None:
+        """Add all shared entities referenced anywhere within the given assertions
+
+        Each distinct entity is written once, in chunks of ``chunk_size`` nodes per
+        transaction. Statements and evidence lines aren't loaded.
+
+        :param assertions: metakb assertions
+        :param chunk_size: max number of nodes to write per transaction
+        """
+        params = _AssertionBatchParams()
+        for assertion in assertions:
+            params.add_assertion(assertion)
+
+        async def _load_entities_tx(
+            tx: AsyncManagedTransaction, query: LiteralString, parameters: dict
+        ) -> None:
+            await self._run(tx, query, parameters)
+
+        for query, param_name, values in params.entity_queries():
+            rows = list(values.values())
+            for i in range(0, len(rows), chunk_size):
+                await self.session.execute_write(
+                    _load_entities_tx, query, {param_name: rows[i : i + chunk_size]}
+                )
+
+    async def load_assertions(
+        self, assertions: list[Statement], include_entities: bool = True
+    ) -> None:
+        """Add or update a batch of complete assertion objects in a single transaction
+
+        Rather than issuing queries for each individual entity, nodes and edges of each
+        kind are sent to the DB as list parameters, so a batch costs a fixed number of
+        round trips regardless of its size.
+
+        The transaction is retried with backoff on transient errors (e.g. deadlocks
+        from concurrent loads elsewhere), so it's safe to call from several sessions at
+        once as long as the batches don't share any statements or evidence lines.
+
+        :param assertions: metakb assertions. IDs should be unique within the batch.
+        :param include_entities: if ``False``, skip writing shared entities (genes,
+            conditions, documents, etc), and only create edges to them. Use when they've
+            already been written via ``load_entities()``.
+        :raise RepositoryMemoryError: if the batch exceeds the server's transaction
+            memory limits. These aren't retried.
+        """
+        params = _AssertionBatchParams()
+        for assertion in assertions:
+            params.add_assertion(assertion)
+
+        # order matters: evidence lines and statements MATCH on the nodes they point to
+        batch_queries = (
+            [*params.entity_queries(), *params.evidence_queries()]
+            if include_entities
+            else params.evidence_queries()
+        )
+
+        async def _load_assertions_tx(tx: AsyncManagedTransaction) -> None:
+            with _raise_memory_errors():
+                await self._run(
+                    tx,
+                    queries_catalog.delete_evidence_subtrees(),
+                    statement_ids=list(params.replaced_statement_ids),
+                )
+                for query, param_name, values in batch_queries:
+                    if values:
+                        await self._run(tx, query, {param_name: list(values.values())})
+
+        with _raise_memory_errors():
+            await self.session.execute_write(_load_assertions_tx)
+
     @staticmethod
     def _make_allele_node(
         allele_record: Node, sl_record: Node, se_record: Node
@@ -559,14 +980,47 @@ class Neo4jRepository(AbstractRepository):
         :param statement_id: ID of the statement minted by the source
         :return: complete statement if available
         """
-        results = await self._execute_statement_search(
-            [], [], [], [], [statement_id], 0, CYPHER_PAGE_LIMIT
-        )
+        results = await self._get_built_statements([statement_id])
         if len(results) == 0:
             return None
         if len(results) > 1:
             raise ValueError
-        return self._get_statement_node_from_result(results[0]).to_gks()
+        return results[0]
+
+    async def get_statements(self, statement_ids: list[str]) -> list[Statement]:
+        """Retrieve several statements at once
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: complete statements for all IDs that are available, in no particular
+            order
+        """
+        if not statement_ids:
+            return []
+        return await self._get_built_statements(statement_ids)
+
+    async def get_existing_assertion_ids(self, statement_ids: list[str]) -> set[str]:
+        """Check which of the given statements already exist, without fetching them
+
+        Unlike ``get_statements()``, this is a single index lookup per ID, with no
+        hydration of the statement's contents or evidence.
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: the subset of given IDs that are present in the DB
+        """
+        if not statement_ids:
+            return set()
+
+        async def _get_existing_statement_ids_tx(
+            tx: AsyncManagedTransaction,
+        ) -> list[Record]:
+            return await self._run(
+                tx,
+                queries_catalog.get_existing_statement_ids(),
+                statement_ids=statement_ids,
+            )
+
+        result = await self.session.execute_read(_get_existing_statement_ids_tx)
+        return {r["s.id"] for r in result}
 
     @staticmethod
     def _renest_evidence_line_chains(chains: list[dict]) -> list[dict]:
@@ -619,12 +1073,18 @@ class Neo4jRepository(AbstractRepository):
 
         return list(roots.values())
 
-    def _build_evidence_line_node(self, ev_line: dict) -> EvidenceLineNode:
+    def _build_evidence_line_node(
+        self, ev_line: dict, node_cache: dict[str, _StatementNode]
+    ) -> EvidenceLineNode:
         """Convert nested evidence line dict into an EvidenceLineNode.
 
         Nothing really needs to get moved around, but this method will reconstruct
         dicts received from the database into propery Node classes so that they
         can be converted back to GKS objects
+
+        :param ev_line: nested evidence line dict
+        :param node_cache: statement nodes already built, keyed by ID. Evidence item
+            statements are looked up here before being built, and added once built.
         """
         item_nodes = []
 
@@ -635,10 +1095,12 @@ class Neo4jRepository(AbstractRepository):
                 raise ValueError(msg)
             if isinstance(item, Record) and "s" in item.keys():  # noqa: SIM118
                 # fetched Neo4j record-like mapping for a statement
-                item_nodes.append(self._get_statement_node_from_result(item))
+                item_nodes.append(
+                    self._get_statement_node_from_result(item, node_cache)
+                )
             elif isinstance(item, dict):
                 # nested evidence line dict
-                item_nodes.append(self._build_evidence_line_node(item))
+                item_nodes.append(self._build_evidence_line_node(item, node_cache))
             else:
                 _logger.error(
                     "Encountered unexpected evidence item: %s of type %s",
@@ -656,23 +1118,32 @@ class Neo4jRepository(AbstractRepository):
             evidence_outcome=ev_line["evidence_outcome"],
         )
 
-    def _build_evidence_line_nodes(self, chains: list[dict]) -> list[EvidenceLineNode]:
+    def _build_evidence_line_nodes(
+        self, chains: list[dict], node_cache: dict[str, _StatementNode]
+    ) -> list[EvidenceLineNode]:
         """Convert flattened evidence-line chains into nested EvidenceLineNodes."""
         nested_lines = self._renest_evidence_line_chains(chains)
-        return [self._build_evidence_line_node(line) for line in nested_lines]
+        return [
+            self._build_evidence_line_node(line, node_cache) for line in nested_lines
+        ]
 
     def _get_statement_node_from_result(
-        self, record: Record
-    ) -> (
-        DiagnosticStatementNode
-        | PrognosticStatementNode
-        | TherapeuticResponseStatementNode
-    ):
+        self, record: Record, node_cache: dict[str, _StatementNode] | None = None
+    ) -> _StatementNode:
         """Given an individual Neo4j result row, produce the repository statement node
 
         :param record: Neo4j result row
+        :param node_cache: statement nodes already built, keyed by ID. If given, a
+            statement cited as evidence in several places is only built once, and the
+            node is shared between them.
         :return: A statement node with all entities/supporting data filled in
         """
+        if node_cache is None:
+            node_cache = {}
+        statement_id = record["s"]["id"]
+        if statement_id in node_cache:
+            return node_cache[statement_id]
+
         if record.get("defining_allele"):
             defining_allele_node = self._make_allele_node(
                 record["defining_allele"],
@@ -716,7 +1187,9 @@ class Neo4jRepository(AbstractRepository):
         )
         document_nodes = [DocumentNode(**d) for d in record["documents"]]
         strength_node = StrengthNode(**record["str"])
-        evidence_line_nodes = self._build_evidence_line_nodes(record["evidence_lines"])
+        evidence_line_nodes = self._build_evidence_line_nodes(
+            record["evidence_lines"], node_cache
+        )
         classification_node = (
             ClassificationNode(**record["classification"])
             if record["classification"]
@@ -766,6 +1239,7 @@ class Neo4jRepository(AbstractRepository):
             case _:
                 msg = f"Unrecognized statement node: {record['s']}"
                 raise ValueError(msg)
+        node_cache[statement_id] = statement
         return statement
 
     def _get_statements_from_results(self, records: list[Record]) -> list[Statement]:
@@ -778,13 +1252,124 @@ class Neo4jRepository(AbstractRepository):
         :param records:
         :return: list of full statement objects
         """
-        statements = []
-        for record in records:
-            statement = self._get_statement_node_from_result(record)
-            statements.append(statement.to_gks())
+        node_cache: dict[str, _StatementNode] = {}
+        return [
+            self._get_statement_node_from_result(record, node_cache).to_gks()
+            for record in records
+        ]
+
+    async def _get_built_statements(self, statement_ids: list[str]) -> list[Statement]:
+        """Get complete statements, from the statement cache where possible
+
+        :param statement_ids: IDs of statements to get
+        :return: statements for all IDs that exist, ordered by ID
+        """
+        if self.statement_cache is None:
+            statements = await self._build_statements(statement_ids)
+            return [statements[i] for i in sorted(statements)]
+
+        data_version = await self.get_data_version()
+        statements = self.statement_cache.get_many(statement_ids, data_version)
+        missing_ids = [i for i in statement_ids if i not in statements]
+        if missing_ids:
+            built = await self._build_statements(missing_ids)
+            self.statement_cache.put_many(list(built.values()), data_version)
+            statements.update(built)
+        return [statements[i] for i in sorted(statements)]
+
+    async def _build_statements(self, statement_ids: list[str]) -> dict[str, Statement]:
+        """Get complete statements from their precomputed documents, rebuilding them
+        from the graph only where there isn't one
+
+        :param statement_ids: IDs of statements to get
+        :return: statements for all IDs that exist, keyed by ID
+        """
+        statements = await self._get_statement_documents(statement_ids)
+        missing_ids = [i for i in statement_ids if i not in statements]
+        if missing_ids:
+            results = await self._hydrate_statements(missing_ids)
+            statements.update(
+                (s.id, s) for s in self._get_statements_from_results(results)
+            )
         return statements
 
-    async def _execute_statement_search(
+    async def _get_statement_documents(
+        self, statement_ids: list[str]
+    ) -> dict[str, Statement]:
+        """Get statements from their precomputed GKS documents
+
+        See ``refresh_statement_documents()``.
+
+        :param statement_ids: IDs of statements to get
+        :return: statements that exist and have a stored document, keyed by ID
+        """
+
+        async def _get_statement_documents_tx(
+            tx: AsyncManagedTransaction,
+        ) -> list[Record]:
+            return await self._run(
+                tx,
+                queries_catalog.get_statement_documents(),
+                statement_ids=statement_ids,
+            )
+
+        results = await self.session.execute_read(_get_statement_documents_tx)
+        return {
+            r["id"]: Statement.model_validate_json(r["gks_document"]) for r in results
+        }
+
+    async def refresh_statement_documents(
+        self, batch_size: int = STATEMENT_DOCUMENT_BATCH_SIZE
+    ) -> int:
+        """Precompute GKS documents for statements that don't have a current one
+
+        Writing a statement clears its document, along with the documents of any
+        statements that cite it as evidence. Documents are rebuilt from the graph in
+        exactly the same way as statements without one are on reads, so reading a
+        statement from its document always gives the same result.
+
+        :param batch_size: max number of statements to build documents for at once
+        :return: number of documents computed
+        """
+
+        async def _get_undocumented_statement_ids_tx(
+            tx: AsyncManagedTransaction, after_id: str
+        ) -> list[Record]:
+            return await self._run(
+                tx,
+                queries_catalog.get_undocumented_statement_ids(),
+                after_id=after_id,
+                limit=batch_size,
+            )
+
+        async def _set_statement_documents_tx(
+            tx: AsyncManagedTransaction, documents: list[dict]
+        ) -> None:
+            await self._run(
+                tx, queries_catalog.set_statement_documents(), documents=documents
+            )
+
+        refreshed = 0
+        after_id = ""
+        while True:
+            results = await self.session.execute_read(
+                _get_undocumented_statement_ids_tx, after_id
+            )
+            if not results:
+                return refreshed
+            statement_ids = [r["id"] for r in results]
+            # page on ID rather than relying on documents being set, so that a
+            # statement which can't be built doesn't stall the refresh
+            after_id = statement_ids[-1]
+            records = await self._hydrate_statements(statement_ids)
+            documents = [
+                {"id": s.id, "gks_document": s.model_dump_json(exclude_none=True)}
+                for s in self._get_statements_from_results(records)
+            ]
+            await self.session.execute_write(_set_statement_documents_tx, documents)
+            refreshed += len(documents)
+
+    async def _search_statement_ids(
         self,
         variation_ids: list[str],
         gene_ids: list[str],
@@ -793,20 +1378,21 @@ class Neo4jRepository(AbstractRepository):
         statement_ids: list[str],
         start: int,
         limit: int,
-    ) -> list[Record]:
-        """Run a statement search query for a level of a "statement tree" of arbitrary depth
-
-        This method is factored out from the public method to support recursion
+        after_id: str | None,
+    ) -> list[str]:
+        """Find IDs of statements matching search criteria, without fetching their
+        contents
 
         The IDs args MUST be lists -- can't be null or the Cypher query will error out
+
+        :return: IDs of matching statements within the requested page, in order
         """
 
-        async def _search_tx(tx: AsyncManagedTransaction, **kwargs) -> list[Record]:
-            result = await tx.run(queries_catalog.search_statements(), **kwargs)
-            return [record async for record in result]
+        async def _search_ids_tx(tx: AsyncManagedTransaction, **kwargs) -> list[Record]:
+            return await self._run(tx, queries_catalog.search_statement_ids(), **kwargs)
 
-        search_results = await self.session.execute_read(
-            _search_tx,
+        results = await self.session.execute_read(
+            _search_ids_tx,
             statement_ids=statement_ids,
             variation_ids=variation_ids,
             condition_ids=disease_ids,
@@ -814,21 +1400,78 @@ class Neo4jRepository(AbstractRepository):
             therapy_ids=therapy_ids,
             start=start,
             limit=limit,
+            after_id=after_id,
         )
-        pending_statement_ids = self._get_pending_statement_ids(search_results)
-        if pending_statement_ids:
-            fetched = await self._execute_statement_search(
-                variation_ids=[],
-                gene_ids=[],
-                therapy_ids=[],
-                disease_ids=[],
-                statement_ids=pending_statement_ids,
-                start=0,
-                limit=CYPHER_PAGE_LIMIT,
+        return [r["id"] for r in results]
+
+    async def _fetch_statement_records(self, statement_ids: list[str]) -> list[Record]:
+        """Fetch full statement records for the given IDs, without resolving their
+        evidence items
+
+        :param statement_ids: IDs of statements to fetch
+        :return: records for all statements that exist, ordered by ID. Evidence items
+            in evidence line chains are left as statement ID references.
+        """
+
+        async def _hydrate_tx(tx: AsyncManagedTransaction, **kwargs) -> list[Record]:
+            return await self._run(tx, queries_catalog.hydrate_statements(), **kwargs)
+
+        return await self.session.execute_read(_hydrate_tx, statement_ids=statement_ids)
+
+    async def _get_evidence_item_ids(self, statement_ids: list[str]) -> list[str]:
+        """Get IDs of all statements cited as evidence items at any depth within the
+        evidence trees of the given statements
+
+        :param statement_ids: IDs of statements at the roots of evidence trees
+        :return: unique evidence item statement IDs
+        """
+
+        async def _get_evidence_item_ids_tx(
+            tx: AsyncManagedTransaction,
+        ) -> list[Record]:
+            return await self._run(
+                tx,
+                queries_catalog.get_evidence_item_ids(),
+                statement_ids=statement_ids,
+            )
+
+        result = await self.session.execute_read(_get_evidence_item_ids_tx)
+        return [r["id"] for r in result]
+
+    async def _hydrate_statements(self, statement_ids: list[str]) -> list[Record]:
+        """Fetch full statement records, including their complete evidence trees
+
+        Rather than walking the evidence trees one level at a time, the IDs of every
+        statement cited anywhere within them are collected up front, and those
+        statements are all fetched at once. Each statement is fetched only once per
+        call, however many times (and at whatever depths) it's cited, so this takes
+        at most three queries regardless of evidence depth or fan-out.
+
+        :param statement_ids: IDs of statements to fetch
+        :return: records for all statements that exist, ordered by ID, with evidence
+            item references in evidence line chains filled in with fetched records
+        """
+        if not statement_ids:
+            return []
+
+        results = await self._fetch_statement_records(statement_ids)
+        fetched_map = {r["s"]["id"]: r for r in results}
+        if not self._get_pending_statement_ids(results):
+            return results
+
+        evidence_item_ids = [
+            i
+            for i in await self._get_evidence_item_ids(list(fetched_map))
+            if i not in fetched_map
+        ]
+        if evidence_item_ids:
+            fetched_map.update(
+                (r["s"]["id"], r)
+                for r in await self._fetch_statement_records(evidence_item_ids)
             )
-            self._resolve_pending_statement_refs(search_results, fetched)
+        self._fill_evidence_item_refs(list(fetched_map.values()), fetched_map)
 
-        return search_results
+        return results
 
     @staticmethod
     def _get_pending_statement_ids(results: list[Record]) -> list[str]:
@@ -864,25 +1507,6 @@ class Neo4jRepository(AbstractRepository):
                     if isinstance(item, str) and item in fetched_map:
                         leaf_items[i] = fetched_map[item]
 
-    def _resolve_pending_statement_refs(
-        self, search_results: list[Record], fetched: list[Record]
-    ) -> None:
-        """Fill in pending statement refs in evidence lines with newly-fetched Records
-
-        :param search_results: initial search results from user-query, updated in-place
-        :param fetched: just-fetched statements to resolve pending statement references
-        """
-        fetched_map = {r["s"]["id"]: r for r in fetched}
-        for record in search_results:
-            for ev_chain in record["evidence_lines"]:
-                chain = ev_chain.get("chain", [])
-                if not chain:
-                    continue
-                leaf_items = chain[-1].get("has_evidence_items", [])
-                for i, item in enumerate(leaf_items):
-                    if isinstance(item, str) and item in fetched_map:
-                        leaf_items[i] = fetched_map[item]
-
     async def search_statements(
         self,
         variation_ids: list[str] | None = None,
@@ -892,6 +1516,7 @@ class Neo4jRepository(AbstractRepository):
         statement_ids: list[str] | None = None,
         start: int = 0,
         limit: int | None = None,
+        after_id: str | None = None,
     ) -> list[Statement]:
         """Perform entity-based search over all statements.
 
@@ -913,12 +1538,15 @@ class Neo4jRepository(AbstractRepository):
         :param statement_ids: list of source statement IDs
         :param start: pagination start point
         :param limit: page size
-        :return: list of statements matching provided criteria
+        :param after_id: if given, only include statements with IDs that sort after
+            this one. Applied before ``start``, for keyset pagination.
+        :return: list of statements matching provided criteria, ordered by ID
         """
         if limit is None:
             limit = CYPHER_PAGE_LIMIT
 
-        search_results = await self._execute_statement_search(
+        # filter and page on IDs first, so that only the requested page is hydrated
+        page_statement_ids = await self._search_statement_ids(
             variation_ids or [],
             gene_ids or [],
             therapy_ids or [],
@@ -926,9 +1554,9 @@ class Neo4jRepository(AbstractRepository):
             statement_ids or [],
             start,
             limit,
+            after_id,
         )
-
-        return self._get_statements_from_results(search_results)
+        return await self._get_built_statements(page_statement_ids)
 
     async def get_gene(self, gene_id: str) -> MappableConcept | None:
         """Attempt to retrieve a gene given exact ID match
@@ -938,8 +1566,7 @@ class Neo4jRepository(AbstractRepository):
         """
 
         async def _get_gene_tx(tx: AsyncManagedTransaction, **kwargs) -> list[Record]:
-            result = await tx.run(queries_catalog.get_gene(), **kwargs)
-            return [record async for record in result]
+            return await self._run(tx, queries_catalog.get_gene(), **kwargs)
 
         result = await self.session.execute_read(
             _get_gene_tx,
@@ -959,28 +1586,114 @@ class Neo4jRepository(AbstractRepository):
         """
 
         async def _get_stats_tx(tx: AsyncManagedTransaction) -> list[Record]:
-            result = await tx.run(queries_catalog.get_counts())
-            return [record async for record in result]
+            return await self._run(tx, queries_catalog.get_counts())
 
         result = await self.session.execute_read(_get_stats_tx)
         return RepositoryStats(
             **{i["info"]["label"]: i["info"]["count"] for i in result}
         )
 
+    async def get_assertion_hashes(self) -> dict[str, str]:
+        """Get stored content hashes for all assertions that have one
+
+        See ``set_assertion_hashes()``.
+
+        :return: mapping from assertion ID to content hash
+        """
+
+        async def _get_assertion_hashes_tx(
+            tx: AsyncManagedTransaction,
+        ) -> list[Record]:
+            return await self._run(tx, queries_catalog.get_assertion_hashes())
+
+        result = await self.session.execute_read(_get_assertion_hashes_tx)
+        return {r["s.id"]: r["s.content_hash"] for r in result}
+
+    async def set_assertion_hashes(self, hashes: dict[str, str]) -> None:
+        """Store content hashes for loaded assertions, to enable later detection of
+        unchanged assertions.
+
+        Any subsequent update to an assertion clears its hash.
+
+        :param hashes: mapping from assertion ID to content hash
+        """
+
+        async def _set_assertion_hashes_tx(tx: AsyncManagedTransaction) -> None:
+            await self._run(
+                tx,
+                queries_catalog.set_assertion_hashes(),
+                hashes=[{"id": k, "content_hash": v} for k, v in hashes.items()],
+            )
+
+        await self.session.execute_write(_set_assertion_hashes_tx)
+
+    async def get_data_version(self) -> str:
+        """Identify the current version of the stored data
+
+        :return: opaque version stamp, or an empty string if none has been recorded
+        """
+
+        async def _get_data_version_tx(tx: AsyncManagedTransaction) -> list[Record]:
+            return await self._run(tx, queries_catalog.get_data_version())
+
+        result = await self.session.execute_read(_get_data_version_tx)
+        return result[0]["version"] if result else ""
+
+    async def update_data_version(self) -> str:
+        """Record that stored data has changed, e.g. once a load is complete
+
+        This is a single shared node, so it isn't touched by individual writes, which
+        would otherwise all contend for its lock during concurrent loads.
+
+        :return: new version stamp
+        """
+
+        async def _update_data_version_tx(tx: AsyncManagedTransaction) -> list[Record]:
+            return await self._run(tx, queries_catalog.update_data_version())
+
+        result = await self.session.execute_write(_update_data_version_tx)
+        return result[0]["version"]
+
+    async def delete_assertions(self, statement_ids: list[str]) -> None:
+        """Remove assertions and their evidence lines
+
+        Contained evidence items are also removed, along with their own evidence, once
+        nothing else cites them. A given statement that is itself still an evidence
+        item elsewhere only loses its evidence lines.
+
+        :param statement_ids: IDs of assertions to remove
+        """
+
+        async def _delete_assertions_tx(tx: AsyncManagedTransaction) -> None:
+            result = await self._run(
+                tx, queries_catalog.delete_assertions(), statement_ids=statement_ids
+            )
+            # evidence items can be nested to any depth, so remove them level by level
+            while orphan_ids := sorted({i for r in result for i in r["item_ids"]}):
+                result = await self._run(
+                    tx,
+                    queries_catalog.delete_orphaned_evidence_items(),
+                    statement_ids=orphan_ids,
+                    assertion_ids=statement_ids,
+                )
+
+        await self.session.execute_write(_delete_assertions_tx)
+
     async def teardown_db(self) -> None:
         """Reset repository storage.
 
-        Delete all nodes/edges and constraints.
+        Delete all nodes/edges (including the recorded schema version), constraints, and
+        indexes.
         """
 
         # this is a write query and needs to be in its own transaction
         async def _teardown_tx(tx: AsyncManagedTransaction) -> None:
-            await tx.run("MATCH (n) DETACH DELETE n")
+            await self._run(tx, "MATCH (n) DETACH DELETE n")
 
         await self.session.execute_write(_teardown_tx)
         async with await self.session.begin_transaction() as tx:
             for query in queries_catalog.teardown():
-                await tx.run(query)
+                await self._run(tx, query)
 
     async def get_all_assertion_ids(self) -> list[str]:
         """Return all assertion IDs"""
@@ -988,8 +1701,27 @@ class Neo4jRepository(AbstractRepository):
         async def _get_all_assertion_ids_tx(
             tx: AsyncManagedTransaction,
         ) -> list[Record]:
-            result = await tx.run(queries_catalog.get_all_assertion_ids())
-            return [record async for record in result]
+            return await self._run(tx, queries_catalog.get_all_assertion_ids())
 
         result = await self.session.execute_read(_get_all_assertion_ids_tx)
         return [r["s.id"] for r in result]
+
+    async def get_citing_assertion_ids(self, statement_ids: list[str]) -> set[str]:
+        """Find assertions that include any of the given statements anywhere within
+        their evidence
+
+        :param statement_ids: IDs of statements minted by the source
+        :return: IDs of assertions citing them, directly or indirectly
+        """
+
+        async def _get_citing_assertion_ids_tx(
+            tx: AsyncManagedTransaction,
+        ) -> list[Record]:
+            return await self._run(
+                tx,
+                queries_catalog.get_citing_assertion_ids(),
+                statement_ids=statement_ids,
+            )
+
+        result = await self.session.execute_read(_get_citing_assertion_ids_tx)
+        return {r["id"] for r in result}
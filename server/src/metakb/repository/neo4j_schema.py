@@ -0,0 +1,154 @@
+"""Manage the Neo4j DB schema (constraints and indexes) as ordered migrations.
+
+Each migration is a file of idempotent schema commands under the queries directory
+(see :py:func:`metakb.repository.queries.catalog.migrations`). The version of the most
+recent migration applied is recorded on a ``SchemaVersion`` node, so that only new
+migrations need to be run against an existing DB. To change the schema, add a new
+migration file with the next version number (and drop anything it creates in
+``teardown.cypher``) rather than editing an existing one.
+"""
+
+import logging
+from typing import LiteralString, NamedTuple
+
+from neo4j import AsyncManagedTransaction, AsyncSession
+from pydantic import BaseModel
+
+from metakb.repository.queries import catalog as queries_catalog
+
+_logger = logging.getLogger(__name__)
+
+
+class SchemaMigration(NamedTuple):
+    """A set of schema commands to apply together"""
+
+    version: int
+    name: str
+    queries: list[LiteralString]
+
+
+class IndexStatus(BaseModel):
+    """Describe an index and whether it's ready for use"""
+
+    name: str
+    type: str
+    labels: list[str]
+    properties: list[str]
+    state: str
+    population_percent: float
+
+
+def get_migrations() -> list[SchemaMigration]:
+    """Get all known schema migrations
+
+    :return: migrations, in ascending version order
+    :raise ValueError: if migration versions aren't numbered consecutively from 1
+    """
+    migrations = []
+    for stem, queries in queries_catalog.migrations():
+        version, name = stem.removeprefix("migration_").split("_", 1)
+        migrations.append(SchemaMigration(int(version), name, queries))
+    versions = [m.version for m in migrations]
+    if versions != list(range(1, len(migrations) + 1)):
+        msg = f"Schema migrations must be numbered consecutively from 1, got {versions}"
+        raise ValueError(msg)
+    return migrations
+
+
+def get_latest_schema_version() -> int:
+    """Get the schema version that a fully-migrated DB should be at
+
+    :return: version of the most recent migration
+    """
+    return len(get_migrations())
+
+
+async def get_schema_version(session: AsyncSession) -> int:
+    """Get the schema version recorded in the DB
+
+    :param session: Neo4j session
+    :return: version of the most recently applied migration, or 0 if none have been
+        recorded (i.e. the DB is empty, or predates schema versioning)
+    """
+
+    async def _get_schema_version_tx(tx: AsyncManagedTransaction) -> int | None:
+        result = await tx.run(queries_catalog.get_schema_version())
+        record = await result.single()
+        return record["version"] if record else None
+
+    return await session.execute_read(_get_schema_version_tx) or 0
+
+
+async def migrate_schema(session: AsyncSession) -> list[int]:
+    """Apply any migrations newer than the DB's current schema version
+
+    Each migration is applied in its own transaction, and the schema version is
+    recorded after it completes. Migration queries are idempotent, so if a migration is
+    interrupted before its version is recorded, it's safe to apply it again.
+
+    :param session: Neo4j session
+    :return: versions of the migrations that were applied
+    """
+    current_version = await get_schema_version(session)
+    latest_version = get_latest_schema_version()
+    if current_version > latest_version:
+        _logger.warning(
+            "DB schema version %s is newer than the latest known version %s",
+            current_version,
+            latest_version,
+        )
+        return []
+
+    async def _set_schema_version_tx(tx: AsyncManagedTransaction, version: int) -> None:
+        await tx.run(queries_catalog.set_schema_version(), version=version)
+
+    applied = []
+    for migration in get_migrations()[current_version:]:
+        _logger.info(
+            "Applying schema migration %s (%s)", migration.version, migration.name
+        )
+        # schema commands can't share a transaction with data writes
+        async with await session.begin_transaction() as tx:
+            for query in migration.queries:
+                await tx.run(query)
+        await session.execute_write(_set_schema_version_tx, migration.version)
+        applied.append(migration.version)
+    return applied
+
+
+async def get_index_status(session: AsyncSession) -> list[IndexStatus]:
+    """Get the population status of each index
+
+    Newly-created indexes are populated in the background, and aren't used by queries
+    until they're online.
+
+    :param session: Neo4j session
+    :return: status of each index, including those backing constraints
+    """
+
+    async def _get_index_status_tx(tx: AsyncManagedTransaction) -> list[IndexStatus]:
+        result = await tx.run(queries_catalog.get_index_status())
+        return [
+            IndexStatus(
+                name=record["name"],
+                type=record["type"],
+                labels=record["labelsOrTypes"] or [],
+                properties=record["properties"] or [],
+                state=record["state"],
+                population_percent=record["populationPercent"],
+            )
+            async for record in result
+        ]
+
+    return await session.execute_read(_get_index_status_tx)
+
+
+async def await_indexes(session: AsyncSession, timeout_seconds: int) -> None:
+    """Wait for all indexes to come online
+
+    :param session: Neo4j session
+    :param timeout_seconds: max time to wait, in seconds
+    :raise neo4j.exceptions.Neo4jError: if indexes aren't online within the timeout
+    """
+    result = await session.run(queries_catalog.await_indexes(), timeout=timeout_seconds)
+    await result.consume()
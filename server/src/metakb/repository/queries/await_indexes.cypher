@@ -0,0 +1 @@
+CALL db.awaitIndexes($timeout)
@@ -0,0 +1,12 @@
+UNWIND $evidence_lines AS evidence_line
+MATCH (el:EvidenceLine {id: evidence_line.id})
+CALL (el, evidence_line) {
+  UNWIND evidence_line.statement_item_ids AS item_id
+  MATCH (item:Statement {id: item_id})
+  MERGE (el)-[:HAS_EVIDENCE_ITEM]->(item)
+}
+CALL (el, evidence_line) {
+  UNWIND evidence_line.evidence_line_item_ids AS item_id
+  MATCH (item:EvidenceLine {id: item_id})
+  MERGE (el)-[:HAS_EVIDENCE_ITEM]->(item)
+}
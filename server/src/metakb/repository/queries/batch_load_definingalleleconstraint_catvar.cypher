@@ -0,0 +1,113 @@
+UNWIND $catvars AS cv_input
+// ----- Declare base CV node + nodes related to constraint -----
+MERGE (cv:Variation:CategoricalVariant:ProteinSequenceConsequence {id: cv_input.id})
+  ON CREATE SET
+    cv +=
+      {
+        name: cv_input.name,
+        description: cv_input.description,
+        aliases: cv_input.aliases,
+        extensions: cv_input.extensions,
+        mappings: cv_input.mappings
+      }
+// bind `constraint_input` and `allele_input` for readability
+WITH
+  cv,
+  cv_input,
+  cv_input.has_constraint AS constraint_input,
+  cv_input.has_constraint.has_defining_allele AS allele_input
+MERGE (constr:Constraint:DefiningAlleleConstraint {id: constraint_input.id})
+  ON CREATE SET constr += {relations: constraint_input.relations}
+MERGE (cv)-[:HAS_CONSTRAINT]->(constr)
+MERGE (allele:Variation:MolecularVariation:Allele {id: allele_input.id})
+  ON CREATE SET
+    allele +=
+      {
+        name: allele_input.name,
+        digest: allele_input.digest,
+        expressions: allele_input.expressions
+      }
+MERGE (constr)-[:HAS_DEFINING_ALLELE]->(allele)
+WITH cv, cv_input, allele, allele_input, allele_input.has_location AS loc
+MERGE (sl:Location:SequenceLocation {id: loc.id})
+  ON CREATE SET sl += loc {.digest, .start, .end, .sequence}
+MERGE (allele)-[:HAS_LOCATION]->(sl)
+WITH cv, cv_input, allele, allele_input, sl, loc.has_sequence_reference AS loc_sr
+MERGE (sr:SequenceReference {refget_accession: loc_sr.refget_accession})
+MERGE (sl)-[:HAS_SEQUENCE_REFERENCE]->(sr)
+
+// handle different kinds of state objects
+FOREACH (_ IN
+CASE
+  WHEN allele_input.has_state.type = 'LiteralSequenceExpression' THEN [1]
+  ELSE []
+END |
+  MERGE
+    (lse:SequenceExpression:LiteralSequenceExpression
+      {sequence: allele_input.has_state.sequence})
+  MERGE (allele)-[:HAS_STATE]->(lse)
+)
+FOREACH (_ IN
+CASE
+  WHEN allele_input.has_state.type = 'ReferenceLengthExpression' THEN [1]
+  ELSE []
+END |
+  MERGE
+    (rle:SequenceExpression:ReferenceLengthExpression
+      {
+        length: allele_input.has_state.length,
+        repeat_subunit_length: allele_input.has_state.repeat_subunit_length,
+        sequence: allele_input.has_state.sequence
+      })
+  MERGE (allele)-[:HAS_STATE]->(rle)
+)
+
+// ----- Declare members -----
+WITH cv, cv_input
+UNWIND cv_input.has_members AS m
+MERGE (member_allele:Variation:MolecularVariation:Allele {id: m.id})
+  ON CREATE SET
+    member_allele +=
+      {name: m.name, digest: m.digest, expressions: m.expressions}
+MERGE (cv)-[:HAS_MEMBER]->(member_allele)
+MERGE (member_sl:Location:SequenceLocation {id: m.has_location.id})
+  ON CREATE SET
+    member_sl +=
+      {
+        digest: m.has_location.digest,
+        start: m.has_location.start,
+        end: m.has_location.end,
+        refget_accession: m.has_location.refget_accession,
+        sequence: m.has_location.sequence
+      }
+MERGE (member_allele)-[:HAS_LOCATION]->(member_sl)
+MERGE
+  (member_sr:SequenceReference
+    {refget_accession: m.has_location.has_sequence_reference.refget_accession})
+MERGE (member_sl)-[:HAS_SEQUENCE_REFERENCE]->(member_sr)
+
+// handle different kinds of state objects
+FOREACH (_ IN
+CASE
+  WHEN m.has_state.type = 'LiteralSequenceExpression' THEN [1]
+  ELSE []
+END |
+  MERGE
+    (member_lse:SequenceExpression:LiteralSequenceExpression
+      {sequence: m.has_state.sequence})
+  MERGE (member_allele)-[:HAS_STATE]->(member_lse)
+)
+FOREACH (_ IN
+CASE
+  WHEN m.has_state.type = 'ReferenceLengthExpression' THEN [1]
+  ELSE []
+END |
+  MERGE
+    (member_rle:SequenceExpression:ReferenceLengthExpression
+      {
+        length: m.has_state.length,
+        repeat_subunit_length: m.has_state.repeat_subunit_length,
+        sequence: m.has_state.sequence
+      })
+  MERGE (member_allele)-[:HAS_STATE]->(member_rle)
+)
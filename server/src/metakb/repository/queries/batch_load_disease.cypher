@@ -0,0 +1,4 @@
+UNWIND $diseases AS disease
+MERGE (d:Condition {id: disease.id})
+  ON CREATE SET d += {name: disease.name, mappings: disease.mappings}
+SET d: Disease
@@ -0,0 +1,10 @@
+UNWIND $drugs AS drug_input
+MERGE (drug:Therapeutic:Drug {id: drug_input.id})
+  ON CREATE SET
+    drug +=
+      {
+        name: drug_input.name,
+        mappings: drug_input.mappings,
+        aliases: drug_input.aliases,
+        extensions: drug_input.extensions
+      }
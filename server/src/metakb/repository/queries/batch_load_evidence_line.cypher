@@ -0,0 +1,24 @@
+// create evidence line nodes and their strength edges.
+// edges to contained evidence items are made separately by
+// `batch_link_evidence_items.cypher`, once every item in the batch exists
+UNWIND $evidence_lines AS evidence_line
+MERGE (el:EvidenceLine {id: evidence_line.id})
+  ON CREATE SET
+    el +=
+      {
+        extensions: evidence_line.extensions,
+        direction: evidence_line.direction,
+        evidence_outcome: evidence_line.evidence_outcome
+      }
+
+// sometimes source evidence lines don't have richer metadata so there's no
+// associated strength (eg with civic assertions)
+WITH el, evidence_line
+OPTIONAL MATCH (strength:Strength {id: evidence_line.strength_id})
+FOREACH (_ IN
+CASE
+  WHEN strength IS NULL THEN []
+  ELSE [1]
+END |
+  MERGE (el)-[:HAS_STRENGTH]->(strength)
+)
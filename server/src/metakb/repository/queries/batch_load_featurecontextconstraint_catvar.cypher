@@ -0,0 +1,25 @@
+UNWIND $catvars AS cv_input
+MERGE (cv:Variation:CategoricalVariant {id: cv_input.id})
+  ON CREATE SET
+    cv +=
+      {
+        name: cv_input.name,
+        description: cv_input.description,
+        aliases: cv_input.aliases,
+        extensions: cv_input.extensions,
+        mappings: cv_input.mappings
+      }
+MERGE
+  (constr:Constraint:FeatureContextConstraint {id: cv_input.has_constraint.id})
+MERGE (cv)-[:HAS_CONSTRAINT]->(constr)
+MERGE (g:Gene {id: cv_input.has_constraint.has_feature_context.id})
+  ON CREATE SET
+    g +=
+      {
+        description: cv_input.has_constraint.has_feature_context.description,
+        name: cv_input.has_constraint.has_feature_context.name,
+        aliases: cv_input.has_constraint.has_feature_context.aliases,
+        mappings: cv_input.has_constraint.has_feature_context.mappings,
+        extensions: cv_input.has_constraint.has_feature_context.extensions
+      }
+MERGE (constr)-[:HAS_FEATURE_CONTEXT]->(g)
@@ -0,0 +1,11 @@
+UNWIND $genes AS gene
+MERGE (g:Gene {id: gene.id})
+  ON CREATE SET
+    g +=
+      {
+        description: gene.description,
+        name: gene.name,
+        aliases: gene.aliases,
+        mappings: gene.mappings,
+        extensions: gene.extensions
+      }
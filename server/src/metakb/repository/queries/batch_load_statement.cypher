@@ -0,0 +1,157 @@
+// create or update statements and their properties
+// evidence lines must already exist -- see `batch_load_evidence_line.cypher`
+UNWIND $statements AS statement_input
+MERGE (statement:Statement {id: statement_input.id})
+SET
+  statement +=
+    {
+      url: statement_input.url,
+      description: statement_input.description,
+      extensions: statement_input.extensions,
+      predicate: statement_input.predicate,
+      proposition_type: statement_input.proposition_type,
+      allele_origin_qualifier: statement_input.allele_origin_qualifier,
+      direction: statement_input.direction,
+      // content has changed, so any stored hash or document is no longer valid
+      gks_document: null,
+      content_hash: null
+    }
+
+// documents of statements citing this one as evidence embed it, so are out of date too
+WITH statement, statement_input
+CALL (statement) {
+  MATCH (citing:Statement)-[:HAS_EVIDENCE_LINE|HAS_EVIDENCE_ITEM*]->(statement)
+  SET citing.gks_document = null
+}
+
+// sever edge to an existing strength node, and make edge to strength node
+WITH statement, statement_input
+OPTIONAL MATCH (statement)-[old_rel:HAS_STRENGTH]->(:Strength)
+DELETE old_rel
+WITH statement, statement_input
+MERGE (strength:Strength {id: statement_input.has_strength.id})
+MERGE (statement)-[:HAS_STRENGTH]->(strength)
+
+// add classification node and connect it
+WITH
+  statement,
+  statement_input,
+  statement_input.has_classification AS statement_classification
+FOREACH (_ IN
+CASE
+  WHEN statement_classification IS NOT NULL THEN [1]
+  ELSE []
+END |
+  MERGE (classification:Classification {id: statement_classification.id})
+    ON CREATE SET
+      classification += {primary_coding: statement_classification.primary_coding}
+  MERGE (statement)-[:HAS_CLASSIFICATION]->(classification)
+)
+
+// connect proposition components
+MERGE (g:Gene {id: statement_input.has_gene.id})
+MERGE (statement)-[:HAS_GENE_CONTEXT]->(g)
+WITH
+  statement,
+  statement_input,
+  statement_input.has_therapeutic AS statement_therapeutic
+FOREACH (_ IN
+CASE
+  WHEN statement_therapeutic IS NOT NULL THEN [1]
+  ELSE []
+END |
+  MERGE (t:Therapeutic {id: statement_therapeutic.id})
+  MERGE (statement)-[:HAS_THERAPEUTIC]->(t)
+)
+
+// replace condition block
+WITH statement, statement_input, statement_input.has_condition AS conditionInput
+
+CALL {
+  WITH conditionInput
+  WITH conditionInput
+  WHERE conditionInput IS NOT NULL
+
+  CALL {
+    // ConditionSet case
+    WITH conditionInput
+    WITH conditionInput
+    WHERE conditionInput.conditions IS NOT NULL
+
+    MERGE (conditionSet:ConditionSet {id: conditionInput.id})
+    SET conditionSet.membershipOperator = conditionInput.membershipOperator
+
+    WITH conditionSet, conditionInput
+    UNWIND conditionInput.conditions AS childInput
+
+    CALL {
+      // child condition set
+      WITH childInput
+      WITH childInput
+      WHERE childInput.conditions IS NOT NULL
+
+      MERGE (childConditionSet:ConditionSet {id: childInput.id})
+      SET childConditionSet.membershipOperator = childInput.membershipOperator
+
+      RETURN childConditionSet AS childNode
+
+        UNION
+
+      // child condition
+      WITH childInput
+      WITH childInput
+      WHERE childInput.conditions IS NULL
+
+      MERGE (childCondition:Condition {id: childInput.id})
+      SET childCondition += childInput
+
+      RETURN childCondition AS childNode
+    }
+
+    MERGE (conditionSet)-[:HAS_CONDITION]->(childNode)
+    RETURN conditionSet AS builtCondition
+
+      UNION
+
+    // Condition case
+    WITH conditionInput
+    WITH conditionInput
+    WHERE conditionInput.conditions IS NULL
+
+    MERGE (condition:Condition {id: conditionInput.id})
+    SET condition += conditionInput
+
+    RETURN condition AS builtCondition
+  }
+
+  RETURN builtCondition
+}
+
+WITH statement, statement_input, builtCondition
+FOREACH (_ IN
+CASE
+  WHEN builtCondition IS NOT NULL THEN [1]
+  ELSE []
+END |
+  MERGE (statement)-[:HAS_TUMOR_TYPE]->(builtCondition)
+)
+
+MERGE (method:Method {id: statement_input.has_method.id})
+MERGE (statement)-[:IS_SPECIFIED_BY]->(method)
+MERGE (cv:CategoricalVariant {id: statement_input.has_variant.id})
+MERGE (statement)-[:HAS_SUBJECT_VARIANT]->(cv)
+
+// add edges to supporting documents
+WITH DISTINCT statement, statement_input
+CALL (statement, statement_input) {
+  UNWIND coalesce(statement_input.has_documents, []) AS document
+  MERGE (doc:Document {id: document.id})
+  MERGE (statement)-[:IS_REPORTED_IN]->(doc)
+}
+
+// add edges to contained evidence lines
+CALL (statement, statement_input) {
+  UNWIND coalesce(statement_input.has_evidence_lines, []) AS ev_line
+  MATCH (el:EvidenceLine {id: ev_line.id})
+  MERGE (statement)-[:HAS_EVIDENCE_LINE]->(el)
+}
@@ -0,0 +1,13 @@
+// load strength nodes
+// since this query is responsible for actually generating the node properties,
+// it needs to be called before statements/ev lines/anything else that connects to it
+UNWIND $strengths AS strength_input
+MERGE (strength:Strength {id: strength_input.id})
+  ON CREATE SET
+    strength +=
+      {
+        name: strength_input.name,
+        mappings: strength_input.mappings,
+        primary_coding: strength_input.primary_coding,
+        extensions: strength_input.extensions
+      }
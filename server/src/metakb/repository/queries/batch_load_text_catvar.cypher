@@ -0,0 +1,11 @@
+UNWIND $catvars AS cv_input
+MERGE (cv:Variation:CategoricalVariant:TextVariant {id: cv_input.id})
+  ON CREATE SET
+    cv +=
+      {
+        name: cv_input.name,
+        description: cv_input.description,
+        aliases: cv_input.aliases,
+        extensions: cv_input.extensions,
+        mappings: cv_input.mappings
+      }
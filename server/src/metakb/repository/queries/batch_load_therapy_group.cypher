@@ -0,0 +1,21 @@
+UNWIND $therapy_groups AS tg
+MERGE (thg:Therapeutic:TherapyGroup {id: tg.id})
+  ON CREATE SET
+    thg +=
+      {
+        membership_operator: tg.membership_operator,
+        extensions: tg.extensions
+      }
+
+WITH thg, tg
+UNWIND tg.has_therapies AS m
+MERGE (member_drug:Therapeutic:Drug {id: m.id})
+  ON CREATE SET
+    member_drug +=
+      {
+        name: m.name,
+        mappings: m.mappings,
+        aliases: m.aliases,
+        extensions: m.extensions
+      }
+MERGE (thg)-[:HAS_THERAPY]->(member_drug)
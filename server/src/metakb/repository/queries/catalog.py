@@ -11,6 +11,19 @@ from typing import LiteralString, cast
 
 _query_dir = Path(str(files("metakb.repository.queries")))
 
+# query text -> name of the file it was loaded from, for instrumentation
+_query_names: dict[str, str] = {}
+
+
+def get_query_name(query: str) -> str:
+    """Identify a query provided by this module
+
+    :param query: query text
+    :return: name of the query file (without extension) that the query was loaded
+        from, or ``"unnamed"`` for queries that didn't come from this module
+    """
+    return _query_names.get(query, "unnamed")
+
 
 def _load(filename: str) -> str:
     """Load a query file
@@ -22,7 +35,9 @@ def _load(filename: str) -> str:
     path = _query_dir / filename
     if not path.exists():
         raise FileNotFoundError(path)
-    return (path).read_text(encoding="utf-8")
+    query = (path).read_text(encoding="utf-8")
+    _query_names[query] = path.stem
+    return query
 
 
 def _load_multiquery(filename: str) -> list[LiteralString]:
@@ -39,12 +54,33 @@ def _load_multiquery(filename: str) -> list[LiteralString]:
     queries = " ".join(
         filter(None, [line.split("//")[0] for line in raw_text.split("\n")])
     ).split(";")[:-1]
+    for i, query in enumerate(queries):
+        _query_names[query] = f"{Path(filename).stem}[{i}]"
     return [cast("LiteralString", q) for q in queries]
 
 
+@cache
+def migrations() -> list[tuple[str, list[LiteralString]]]:
+    """Load schema migrations, in the order they should be applied.
+
+    Migration files are named ``migration_<NNNN>_<description>.cypher``, where
+    ``<NNNN>`` is the zero-padded schema version that the migration brings the DB up to.
+
+    :return: list of (file name stem, queries) for each migration
+    """
+    return [
+        (path.stem, _load_multiquery(path.name))
+        for path in sorted(_query_dir.glob("migration_*.cypher"))
+    ]
+
+
 @cache
 def initialize() -> list[LiteralString]:
-    return _load_multiquery("initialize.cypher")
+    """Get queries to create the full DB schema from scratch
+
+    :return: queries from all migrations, in order
+    """
+    return [query for _, queries in migrations() for query in queries]
 
 
 @cache
@@ -113,8 +149,33 @@ def load_statement() -> LiteralString:
 
 
 @cache
-def search_statements() -> LiteralString:
-    return cast("LiteralString", _load("search_statements.cypher"))
+def search_statement_ids() -> LiteralString:
+    return cast("LiteralString", _load("search_statement_ids.cypher"))
+
+
+@cache
+def hydrate_statements() -> LiteralString:
+    return cast("LiteralString", _load("hydrate_statements.cypher"))
+
+
+@cache
+def get_evidence_item_ids() -> LiteralString:
+    return cast("LiteralString", _load("get_evidence_item_ids.cypher"))
+
+
+@cache
+def get_statement_documents() -> LiteralString:
+    return cast("LiteralString", _load("get_statement_documents.cypher"))
+
+
+@cache
+def get_undocumented_statement_ids() -> LiteralString:
+    return cast("LiteralString", _load("get_undocumented_statement_ids.cypher"))
+
+
+@cache
+def set_statement_documents() -> LiteralString:
+    return cast("LiteralString", _load("set_statement_documents.cypher"))
 
 
 @cache
@@ -128,8 +189,38 @@ def get_all_assertion_ids() -> LiteralString:
 
 
 @cache
-def delete_evidence_line() -> LiteralString:
-    return cast("LiteralString", _load("delete_evidence_line.cypher"))
+def get_existing_statement_ids() -> LiteralString:
+    return cast("LiteralString", _load("get_existing_statement_ids.cypher"))
+
+
+@cache
+def get_assertion_hashes() -> LiteralString:
+    return cast("LiteralString", _load("get_assertion_hashes.cypher"))
+
+
+@cache
+def set_assertion_hashes() -> LiteralString:
+    return cast("LiteralString", _load("set_assertion_hashes.cypher"))
+
+
+@cache
+def delete_assertions() -> LiteralString:
+    return cast("LiteralString", _load("delete_assertions.cypher"))
+
+
+@cache
+def delete_orphaned_evidence_items() -> LiteralString:
+    return cast("LiteralString", _load("delete_orphaned_evidence_items.cypher"))
+
+
+@cache
+def get_citing_assertion_ids() -> LiteralString:
+    return cast("LiteralString", _load("get_citing_assertion_ids.cypher"))
+
+
+@cache
+def delete_evidence_subtrees() -> LiteralString:
+    return cast("LiteralString", _load("delete_evidence_subtrees.cypher"))
 
 
 @cache
@@ -145,3 +236,132 @@ def load_strength() -> LiteralString:
 @cache
 def get_gene() -> LiteralString:
     return cast("LiteralString", _load("get_gene.cypher"))
+
+
+@cache
+def batch_load_dac_catvar() -> LiteralString:
+    return cast(
+        "LiteralString", _load("batch_load_definingalleleconstraint_catvar.cypher")
+    )
+
+
+@cache
+def batch_load_fcc_catvar() -> LiteralString:
+    return cast(
+        "LiteralString", _load("batch_load_featurecontextconstraint_catvar.cypher")
+    )
+
+
+@cache
+def batch_load_text_catvar() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_text_catvar.cypher"))
+
+
+@cache
+def batch_load_gene() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_gene.cypher"))
+
+
+@cache
+def batch_load_disease() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_disease.cypher"))
+
+
+@cache
+def batch_load_phenotype() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_phenotype.cypher"))
+
+
+@cache
+def batch_load_condition_set() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_condition_set.cypher"))
+
+
+@cache
+def batch_load_drug() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_drug.cypher"))
+
+
+@cache
+def batch_load_therapy_group() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_therapy_group.cypher"))
+
+
+@cache
+def batch_load_document() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_document.cypher"))
+
+
+@cache
+def batch_load_method() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_method.cypher"))
+
+
+@cache
+def batch_load_strength() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_strength.cypher"))
+
+
+@cache
+def batch_load_evidence_line() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_evidence_line.cypher"))
+
+
+@cache
+def batch_load_statement() -> LiteralString:
+    return cast("LiteralString", _load("batch_load_statement.cypher"))
+
+
+@cache
+def batch_link_evidence_items() -> LiteralString:
+    return cast("LiteralString", _load("batch_link_evidence_items.cypher"))
+
+
+@cache
+def get_database_alias() -> LiteralString:
+    return cast("LiteralString", _load("get_database_alias.cypher"))
+
+
+@cache
+def get_database() -> LiteralString:
+    return cast("LiteralString", _load("get_database.cypher"))
+
+
+@cache
+def create_database() -> LiteralString:
+    return cast("LiteralString", _load("create_database.cypher"))
+
+
+@cache
+def set_database_alias() -> LiteralString:
+    return cast("LiteralString", _load("set_database_alias.cypher"))
+
+
+@cache
+def get_data_version() -> LiteralString:
+    return cast("LiteralString", _load("get_data_version.cypher"))
+
+
+@cache
+def update_data_version() -> LiteralString:
+    return cast("LiteralString", _load("update_data_version.cypher"))
+
+
+@cache
+def get_schema_version() -> LiteralString:
+    return cast("LiteralString", _load("get_schema_version.cypher"))
+
+
+@cache
+def set_schema_version() -> LiteralString:
+    return cast("LiteralString", _load("set_schema_version.cypher"))
+
+
+@cache
+def get_index_status() -> LiteralString:
+    return cast("LiteralString", _load("get_index_status.cypher"))
+
+
+@cache
+def await_indexes() -> LiteralString:
+    return cast("LiteralString", _load("await_indexes.cypher"))
@@ -0,0 +1 @@
+CREATE OR REPLACE DATABASE $name WAIT
@@ -0,0 +1,25 @@
+// remove statements along with their (possibly nested) evidence lines.
+// statements that are evidence for something else keep their node. Evidence items of
+// the removed lines are returned, to be removed too if nothing else cites them.
+UNWIND $statement_ids AS statement_id
+MATCH (s:Statement {id: statement_id})
+OPTIONAL MATCH
+  (s)-[:HAS_EVIDENCE_LINE]->(:EvidenceLine)-[:HAS_EVIDENCE_ITEM*0..]->(el:EvidenceLine)
+WITH s, collect(DISTINCT el) AS evidence_lines
+CALL (evidence_lines) {
+  UNWIND evidence_lines AS el
+  OPTIONAL MATCH (el)-[:HAS_EVIDENCE_ITEM]->(item:Statement)
+  RETURN collect(DISTINCT item.id) AS item_ids
+}
+FOREACH (el IN evidence_lines | DETACH DELETE el)
+
+// documents of statements citing this one embed its evidence, so are out of date
+WITH s, item_ids
+CALL (s) {
+  MATCH (citing:Statement)-[:HAS_EVIDENCE_LINE|HAS_EVIDENCE_ITEM*]->(s)
+  SET citing.gks_document = null
+}
+SET s.gks_document = null, s.content_hash = null
+WITH s, item_ids, COUNT { ()-[:HAS_EVIDENCE_ITEM]->(s) } AS citations
+FOREACH (_ IN CASE WHEN citations = 0 THEN [1] ELSE [] END | DETACH DELETE s)
+RETURN item_ids
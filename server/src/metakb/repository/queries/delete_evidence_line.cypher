@@ -1,2 +0,0 @@
-MATCH (n:EvidenceLine {id: $evidence_line_id})
-DETACH DELETE n
@@ -0,0 +1,10 @@
+// remove every evidence line under the given statements, however deeply nested, so
+// that their evidence can be rebuilt from scratch in the same transaction.
+// evidence items (statements) themselves are left as-is.
+UNWIND $statement_ids AS statement_id
+MATCH
+  (:Statement {id: statement_id})-[:HAS_EVIDENCE_LINE]->
+  (:EvidenceLine)-[:HAS_EVIDENCE_ITEM*0..]->
+  (el:EvidenceLine)
+WITH DISTINCT el
+DETACH DELETE el
@@ -0,0 +1,20 @@
+// remove evidence items that are no longer cited by anything, along with their own
+// evidence lines. Assertions are only removed if they're among those being deleted
+// (i.e. were kept by delete_assertions for being cited by another of them).
+// Evidence items of the removed lines are returned, to be checked in turn.
+UNWIND $statement_ids AS statement_id
+MATCH (s:Statement {id: statement_id})
+WHERE
+  (NOT s.id STARTS WITH "metakb.assertion:" OR s.id IN $assertion_ids)
+  AND NOT ()-[:HAS_EVIDENCE_ITEM]->(s)
+OPTIONAL MATCH
+  (s)-[:HAS_EVIDENCE_LINE]->(:EvidenceLine)-[:HAS_EVIDENCE_ITEM*0..]->(el:EvidenceLine)
+WITH s, collect(DISTINCT el) AS evidence_lines
+CALL (evidence_lines) {
+  UNWIND evidence_lines AS el
+  OPTIONAL MATCH (el)-[:HAS_EVIDENCE_ITEM]->(item:Statement)
+  RETURN collect(DISTINCT item.id) AS item_ids
+}
+FOREACH (el IN evidence_lines | DETACH DELETE el)
+DETACH DELETE s
+RETURN item_ids
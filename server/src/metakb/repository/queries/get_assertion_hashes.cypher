@@ -0,0 +1,3 @@
+MATCH (s:Statement)
+WHERE s.content_hash IS NOT NULL
+RETURN s.id, s.content_hash
@@ -0,0 +1,7 @@
+// assertions that include any of the given statements anywhere within their evidence
+UNWIND $statement_ids AS statement_id
+MATCH
+  (citing:Statement)-[:HAS_EVIDENCE_LINE|HAS_EVIDENCE_ITEM*]->
+  (:Statement {id: statement_id})
+WHERE citing.id STARTS WITH "metakb.assertion:"
+RETURN DISTINCT citing.id AS id
@@ -0,0 +1,5 @@
+// only lists actual databases -- aliases are listed by SHOW ALIASES
+SHOW DATABASES
+YIELD name
+WHERE name = $name
+RETURN DISTINCT name
@@ -0,0 +1,4 @@
+SHOW ALIASES FOR DATABASE
+YIELD name, database
+WHERE name = $alias
+RETURN database
@@ -0,0 +1,6 @@
+// Get IDs of all statements cited as evidence items anywhere within the given
+// statements' evidence trees, at any depth
+MATCH (s:Statement)
+WHERE s.id IN $statement_ids
+MATCH (s)-[:HAS_EVIDENCE_LINE|HAS_EVIDENCE_ITEM*]->(ei:Statement)
+RETURN DISTINCT ei.id AS id
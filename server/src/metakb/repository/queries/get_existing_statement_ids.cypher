@@ -0,0 +1,3 @@
+UNWIND $statement_ids AS statement_id
+MATCH (s:Statement {id: statement_id})
+RETURN s.id
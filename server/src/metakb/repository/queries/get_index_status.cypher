@@ -0,0 +1,5 @@
+SHOW INDEXES
+YIELD name, type, labelsOrTypes, properties, state, populationPercent
+WHERE type <> "LOOKUP"
+RETURN name, type, labelsOrTypes, properties, state, populationPercent
+ORDER BY name
@@ -0,0 +1,2 @@
+MATCH (v:SchemaVersion)
+RETURN max(v.version) AS version
@@ -0,0 +1,5 @@
+// Fetch precomputed GKS documents for the given statements.
+// Statements loaded before documents were stored don't have one, and are omitted
+MATCH (s:Statement)
+WHERE s.id IN $statement_ids AND s.gks_document IS NOT NULL
+RETURN s.id AS id, s.gks_document AS gks_document
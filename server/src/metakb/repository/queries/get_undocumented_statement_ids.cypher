@@ -0,0 +1,6 @@
+// Get IDs of statements without a precomputed document, in ID order
+MATCH (s:Statement)
+WHERE s.id > $after_id AND s.gks_document IS NULL
+RETURN s.id AS id
+ORDER BY id
+LIMIT $limit
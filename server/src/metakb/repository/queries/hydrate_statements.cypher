@@ -1,46 +1,9 @@
-// ------ Process input args -----
-// Expect all params to be lists (possibly empty), never null:
-// $statement_ids, $variation_ids, $condition_ids, $gene_ids, $therapy_ids
+// Fetch full statements for the given IDs.
+// Expect $statement_ids to be a list of IDs, as returned by search_statement_ids.cypher
 MATCH (s:Statement)
-WHERE $statement_ids = [] OR s.id IN $statement_ids
-
+WHERE s.id IN $statement_ids
 MATCH (s)-[:HAS_SUBJECT_VARIANT]->(cv:CategoricalVariant)
 MATCH (s)-[:HAS_GENE_CONTEXT]->(g:Gene)
-WHERE
-  ($variation_ids = [] OR
-    EXISTS {
-      MATCH
-        (cv)-[:HAS_CONSTRAINT]->
-        (:DefiningAlleleConstraint)-[:HAS_DEFINING_ALLELE]->
-        (a:Allele)
-      WHERE a.id IN $variation_ids
-    } OR
-    EXISTS {
-      MATCH (cv)-[:HAS_MEMBER]->(a:Allele)
-      WHERE a.id IN $variation_ids
-    }) AND
-  ($condition_ids = [] OR
-    EXISTS {
-      MATCH (s)-[:HAS_TUMOR_TYPE]->(cond:Condition)
-      WHERE cond.id IN $condition_ids
-    } OR
-    EXISTS {
-      MATCH
-        (s)-[:HAS_TUMOR_TYPE]->
-        (:ConditionSet)-[:HAS_CONDITION*0..]->
-        (cond:Condition)
-      WHERE cond.id IN $condition_ids
-    }) AND
-  ($gene_ids = [] OR g.id IN $gene_ids) AND
-  ($therapy_ids = [] OR
-    EXISTS {
-      MATCH (s)-[:HAS_THERAPEUTIC]->(t:Therapeutic)
-      WHERE t.id IN $therapy_ids
-    } OR
-    EXISTS {
-      MATCH (s)-[:HAS_THERAPEUTIC]->(:TherapyGroup)-[:HAS_THERAPY]->(d:Drug)
-      WHERE d.id IN $therapy_ids
-    })
 
 //  ----- get basic statement info  -----
 MATCH (s)-[:HAS_STRENGTH]->(str:Strength)
@@ -187,8 +150,9 @@ CALL (s) {
 }
 
 // ----- return everything -----
+// leave out stored documents and hashes, which aren't needed to build statements
 RETURN DISTINCT
-  s,
+  s {.*, gks_document: null, content_hash: null} AS s,
   str,
   method,
   method_doc,
@@ -209,5 +173,4 @@ RETURN DISTINCT
   drug,
   documents,
   evidence_lines
-ORDER BY s.id SKIP $start
-LIMIT $limit;
+ORDER BY s.id;
@@ -9,9 +9,20 @@ SET
       predicate: $statement.predicate,
       proposition_type: $statement.proposition_type,
       allele_origin_qualifier: $statement.allele_origin_qualifier,
-      direction: $statement.direction
+      direction: $statement.direction,
+      // content has changed, so any stored hash or document is no longer valid
+      gks_document: null,
+      content_hash: null
     }
 
+// documents of statements citing this one as evidence embed it, so are out of date too
+WITH statement
+CALL {
+  WITH statement
+  MATCH (citing:Statement)-[:HAS_EVIDENCE_LINE|HAS_EVIDENCE_ITEM*]->(statement)
+  SET citing.gks_document = null
+}
+
 // sever edge to an existing strength node, and make edge to strength node
 // this query gets used to both create AND update statements, so we'll just eat the cost
 // of redundant queries to make things simpler
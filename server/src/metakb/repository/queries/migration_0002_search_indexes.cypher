@@ -0,0 +1,11 @@
+// Index properties used to filter statement searches and entity counts that aren't
+// already covered by a uniqueness constraint on the same label
+CREATE INDEX allele_id_index IF NOT EXISTS
+FOR (n:Allele)
+ON (n.id);
+CREATE INDEX drug_id_index IF NOT EXISTS
+FOR (n:Drug)
+ON (n.id);
+CREATE INDEX statement_proposition_type_index IF NOT EXISTS
+FOR (n:Statement)
+ON (n.proposition_type);
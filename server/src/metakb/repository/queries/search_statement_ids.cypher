@@ -0,0 +1,56 @@
+// ------ Process input args -----
+// Expect all params to be lists (possibly empty), never null:
+// $statement_ids, $variation_ids, $condition_ids, $gene_ids, $therapy_ids
+// $after_id may be null. If given, results resume after it (keyset pagination).
+// Only filter and page here; full statements are fetched for the page afterward by
+// hydrate_statements.cypher, so that cost scales with page size rather than hit count
+MATCH (s:Statement)
+WHERE
+  ($statement_ids = [] OR s.id IN $statement_ids) AND
+  ($after_id IS NULL OR s.id > $after_id)
+
+MATCH (s)-[:HAS_SUBJECT_VARIANT]->(cv:CategoricalVariant)
+MATCH (s)-[:HAS_GENE_CONTEXT]->(g:Gene)
+WHERE
+  ($variation_ids = [] OR
+    EXISTS {
+      MATCH
+        (cv)-[:HAS_CONSTRAINT]->
+        (:DefiningAlleleConstraint)-[:HAS_DEFINING_ALLELE]->
+        (a:Allele)
+      WHERE a.id IN $variation_ids
+    } OR
+    EXISTS {
+      MATCH (cv)-[:HAS_MEMBER]->(a:Allele)
+      WHERE a.id IN $variation_ids
+    }) AND
+  ($condition_ids = [] OR
+    EXISTS {
+      MATCH (s)-[:HAS_TUMOR_TYPE]->(cond:Condition)
+      WHERE cond.id IN $condition_ids
+    } OR
+    EXISTS {
+      MATCH
+        (s)-[:HAS_TUMOR_TYPE]->
+        (:ConditionSet)-[:HAS_CONDITION*0..]->
+        (cond:Condition)
+      WHERE cond.id IN $condition_ids
+    }) AND
+  ($gene_ids = [] OR g.id IN $gene_ids) AND
+  ($therapy_ids = [] OR
+    EXISTS {
+      MATCH (s)-[:HAS_THERAPEUTIC]->(t:Therapeutic)
+      WHERE t.id IN $therapy_ids
+    } OR
+    EXISTS {
+      MATCH (s)-[:HAS_THERAPEUTIC]->(:TherapyGroup)-[:HAS_THERAPY]->(d:Drug)
+      WHERE d.id IN $therapy_ids
+    }) AND
+  EXISTS { MATCH (s)-[:HAS_STRENGTH]->(:Strength) } AND
+  EXISTS {
+    MATCH (s)-[:IS_SPECIFIED_BY]->(:Method)-[:IS_REPORTED_IN]->(:Document)
+  }
+
+RETURN DISTINCT s.id AS id
+ORDER BY id SKIP $start
+LIMIT $limit;
@@ -0,0 +1,3 @@
+UNWIND $hashes AS hash
+MATCH (s:Statement {id: hash.id})
+SET s.content_hash = hash.content_hash
@@ -0,0 +1,3 @@
+// repointing an alias is atomic -- new sessions opened against it immediately see
+// the new target database
+CREATE OR REPLACE ALIAS $alias FOR DATABASE $database
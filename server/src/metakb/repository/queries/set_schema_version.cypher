@@ -0,0 +1,2 @@
+MERGE (v:SchemaVersion)
+SET v.version = $version, v.migrated_at = datetime()
@@ -0,0 +1,4 @@
+// Store precomputed GKS documents for statements
+UNWIND $documents AS document
+MATCH (s:Statement {id: document.id})
+SET s.gks_document = document.gks_document
@@ -16,3 +16,8 @@ DROP CONSTRAINT statement_id_constraint IF EXISTS;
 DROP CONSTRAINT method_id_constraint IF EXISTS;
 DROP CONSTRAINT classification_constraint IF EXISTS;
 DROP CONSTRAINT evidence_line_id_constraint IF EXISTS;
+//
+// drop indexes
+DROP INDEX allele_id_index IF EXISTS;
+DROP INDEX drug_id_index IF EXISTS;
+DROP INDEX statement_proposition_type_index IF EXISTS;
@@ -0,0 +1,3 @@
+MERGE (v:DataVersion)
+SET v.version = randomUUID(), v.updated_at = datetime()
+RETURN v.version AS version
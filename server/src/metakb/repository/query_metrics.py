@@ -0,0 +1,157 @@
+"""Collect per-query timing statistics for repository operations."""
+
+import math
+import random
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+
+# max number of durations to keep per query for estimating percentiles
+QUERY_METRICS_SAMPLE_SIZE = 1024
+
+
+class QueryStats(BaseModel):
+    """Summarize executions of a single named query
+
+    All durations are in milliseconds. Count, total, mean, and max cover every
+    execution, while percentiles are estimated from a uniform sample of up to
+    ``QUERY_METRICS_SAMPLE_SIZE`` executions. Server-reported times are summed across
+    executions, and are only available from backends that report them.
+    """
+
+    name: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    rows: int
+    server_available_after_ms: int
+    server_consumed_after_ms: int
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    """Get a percentile of some values, using the nearest-rank method
+
+    :param sorted_values: values, in ascending order. Must be non-empty.
+    :param percentile: percentile to get, from 0 to 100
+    :return: value at given percentile
+    """
+    rank = math.ceil(percentile / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+@dataclass
+class _QueryTimings:
+    """Running totals and sampled durations for a single named query"""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    sampled_durations_ms: list[float] = field(default_factory=list)
+    rows: int = 0
+    server_available_after_ms: int = 0
+    server_consumed_after_ms: int = 0
+
+
+class QueryMetrics:
+    """Accumulate timings for queries, keyed by query name.
+
+    A single instance can be shared between repository instances (e.g. one per
+    session) to get totals for an entire load or for the lifetime of the API. Memory
+    use is bounded per query name, however many executions are recorded.
+    """
+
+    def __init__(self, sample_size: int = QUERY_METRICS_SAMPLE_SIZE) -> None:
+        """Initialize empty metrics
+
+        :param sample_size: max number of durations to keep per query, for estimating
+            percentiles
+        """
+        self.sample_size = sample_size
+        self._timings: dict[str, _QueryTimings] = {}
+        # sampling isn't security-sensitive
+        self._random = random.Random()  # noqa: S311
+
+    def record(
+        self,
+        name: str,
+        duration_ms: float,
+        rows: int,
+        server_available_after_ms: int | None = None,
+        server_consumed_after_ms: int | None = None,
+    ) -> None:
+        """Record a single query execution
+
+        :param name: query name
+        :param duration_ms: client-observed time from sending the query to having
+            consumed all results
+        :param rows: number of result rows
+        :param server_available_after_ms: server-reported time until first result was
+            available
+        :param server_consumed_after_ms: server-reported time to consume all results
+        """
+        timings = self._timings.setdefault(name, _QueryTimings())
+        timings.count += 1
+        timings.total_ms += duration_ms
+        timings.max_ms = max(timings.max_ms, duration_ms)
+        # reservoir sampling, so every execution is equally likely to be kept
+        if len(timings.sampled_durations_ms) < self.sample_size:
+            timings.sampled_durations_ms.append(duration_ms)
+        else:
+            i = self._random.randrange(timings.count)
+            if i < self.sample_size:
+                timings.sampled_durations_ms[i] = duration_ms
+        timings.rows += rows
+        timings.server_available_after_ms += server_available_after_ms or 0
+        timings.server_consumed_after_ms += server_consumed_after_ms or 0
+
+    def summarize(self) -> list[QueryStats]:
+        """Get statistics for each query
+
+        :return: stats for each query that has been recorded, costliest (by total
+            time) first
+        """
+        stats = []
+        for name, timings in self._timings.items():
+            durations = sorted(timings.sampled_durations_ms)
+            stats.append(
+                QueryStats(
+                    name=name,
+                    count=timings.count,
+                    total_ms=timings.total_ms,
+                    mean_ms=timings.total_ms / timings.count,
+                    p50_ms=_percentile(durations, 50),
+                    p95_ms=_percentile(durations, 95),
+                    p99_ms=_percentile(durations, 99),
+                    max_ms=timings.max_ms,
+                    rows=timings.rows,
+                    server_available_after_ms=timings.server_available_after_ms,
+                    server_consumed_after_ms=timings.server_consumed_after_ms,
+                )
+            )
+        return sorted(stats, key=lambda s: s.total_ms, reverse=True)
+
+    def format_summary(self) -> str:
+        """Render statistics as a plain-text table
+
+        :return: table with a row per query, costliest first
+        """
+        header = (
+            f"{'query':<36} {'count':>8} {'total s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'rows':>9} {'server ms':>10}"
+        )
+        lines = [header, "-" * len(header)]
+        lines.extend(
+            f"{s.name:<36} {s.count:>8} {s.total_ms / 1000:>9.2f} {s.p50_ms:>8.1f} "
+            f"{s.p95_ms:>8.1f} {s.p99_ms:>8.1f} {s.rows:>9} "
+            f"{s.server_available_after_ms + s.server_consumed_after_ms:>10}"
+            for s in self.summarize()
+        )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Discard all recorded timings"""
+        self._timings = {}
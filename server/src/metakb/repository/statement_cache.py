@@ -0,0 +1,117 @@
+"""Cache fully-built statements between repository operations."""
+
+from collections import OrderedDict
+
+from ga4gh.va_spec.base import Statement
+from pydantic import BaseModel
+
+# default max number of statements to hold
+STATEMENT_CACHE_SIZE = 1000
+
+
+class StatementCacheStats(BaseModel):
+    """Summarize statement cache usage"""
+
+    max_size: int
+    size: int
+    data_version: str | None
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+class StatementCache:
+    """Hold recently-fetched statements, least recently used first out.
+
+    Entries are tagged with the version of the data they were built from (see
+    ``AbstractRepository.get_data_version()``). Looking up statements for a different
+    version discards everything cached so far, so a reload never serves stale data.
+
+    A single instance can be shared between repository instances (e.g. one per
+    session) for the lifetime of the API. Cached statements are shared between
+    callers, so must not be modified.
+    """
+
+    def __init__(self, max_size: int = STATEMENT_CACHE_SIZE) -> None:
+        """Initialize empty cache
+
+        :param max_size: max number of statements to hold
+        :raise ValueError: if ``max_size`` isn't positive
+        """
+        if max_size < 1:
+            msg = f"Invalid max_size value: {max_size}. Must be positive."
+            raise ValueError(msg)
+        self.max_size = max_size
+        self._statements: OrderedDict[str, Statement] = OrderedDict()
+        self._data_version: str | None = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def _check_version(self, data_version: str) -> None:
+        """Discard cached statements if they're from a different version of the data
+
+        :param data_version: current data version
+        """
+        if data_version != self._data_version:
+            if self._statements:
+                self._invalidations += 1
+            self._statements.clear()
+            self._data_version = data_version
+
+    def get_many(
+        self, statement_ids: list[str], data_version: str
+    ) -> dict[str, Statement]:
+        """Look up statements
+
+        :param statement_ids: IDs of statements to look up
+        :param data_version: current data version
+        :return: cached statements, keyed by ID. IDs that aren't cached are omitted.
+        """
+        self._check_version(data_version)
+        found = {}
+        for statement_id in statement_ids:
+            statement = self._statements.get(statement_id)
+            if statement is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._statements.move_to_end(statement_id)
+                found[statement_id] = statement
+        return found
+
+    def put_many(self, statements: list[Statement], data_version: str) -> None:
+        """Add statements, evicting the least recently used ones if full
+
+        :param statements: fully-built statements
+        :param data_version: version of the data that the statements were built from
+        """
+        self._check_version(data_version)
+        for statement in statements:
+            self._statements[statement.id] = statement
+            self._statements.move_to_end(statement.id)
+        while len(self._statements) > self.max_size:
+            self._statements.popitem(last=False)
+            self._evictions += 1
+
+    def summarize(self) -> StatementCacheStats:
+        """Get cache usage statistics
+
+        :return: current size and data version, and counts since the cache was created
+        """
+        return StatementCacheStats(
+            max_size=self.max_size,
+            size=len(self._statements),
+            data_version=self._data_version,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+        )
+
+    def clear(self) -> None:
+        """Discard all cached statements"""
+        self._statements.clear()
+        self._data_version = None
@@ -4,6 +4,7 @@ from collections.abc import AsyncGenerator
 
 from fastapi import Request
 
+from metakb.config import get_config
 from metakb.repository.base import AbstractRepository
 from metakb.repository.neo4j_repository import Neo4jRepository
 
@@ -17,8 +18,10 @@ async def get_repository(
     :return: generator yielding a repository instance. Performs cleanup when route
         invocation concludes.
     """
-    session = request.app.state.driver.session()
-    repository = Neo4jRepository(session)
+    session = request.app.state.driver.session(database=get_config().db_name)
+    repository = Neo4jRepository(
+        session, request.app.state.query_metrics, request.app.state.statement_cache
+    )
     try:
         yield repository
     finally:
@@ -2,11 +2,18 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from metakb.config import get_config
 from metakb.repository.base import AbstractRepository, RepositoryStats
+from metakb.repository.query_metrics import QueryMetrics, QueryStats
+from metakb.repository.statement_cache import StatementCache, StatementCacheStats
 from metakb.restapi.dependencies import get_repository
+from metakb.restapi.response_cache import (
+    ResponseCache,
+    ResponseCacheStats,
+    get_cached_response,
+)
 from metakb.schemas.api import ServiceInfo, ServiceOrganization, ServiceType
 
 api_router = APIRouter()
@@ -29,9 +36,50 @@ def service_info() -> ServiceInfo:
 @api_router.get(
     "/stats",
     summary="Get basic statistics about MetaKB data.",
+    response_model=RepositoryStats,
 )
 async def stats(
+    request: Request,
     repository: Annotated[AbstractRepository, Depends(get_repository)],
-) -> RepositoryStats:
+) -> Response:
     """Provide stats for MetaKB data"""
-    return await repository.get_stats()
+    return await get_cached_response(request, repository, repository.get_stats)
+
+
+@api_router.get(
+    "/metrics/queries",
+    summary="Get timing statistics for database queries.",
+    description="Retrieve per-query counts, latency percentiles, and row counts for database queries issued since the service started, costliest first. Only available when query metrics are enabled via the `METAKB_QUERY_METRICS` environment variable.",
+)
+def query_metrics(request: Request) -> list[QueryStats]:
+    """Provide per-query timing stats"""
+    metrics: QueryMetrics | None = request.app.state.query_metrics
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="Query metrics are not enabled.")
+    return metrics.summarize()
+
+
+@api_router.get(
+    "/metrics/statement_cache",
+    summary="Get usage statistics for the statement cache.",
+    description="Retrieve the size of the in-process cache of fully-built statements, along with hit, miss, and eviction counts since the service started. Only available when the cache is enabled, via the `METAKB_STATEMENT_CACHE_SIZE` environment variable.",
+)
+def statement_cache_metrics(request: Request) -> StatementCacheStats:
+    """Provide statement cache usage stats"""
+    cache: StatementCache | None = request.app.state.statement_cache
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Statement cache is not enabled.")
+    return cache.summarize()
+
+
+@api_router.get(
+    "/metrics/response_cache",
+    summary="Get usage statistics for the response cache.",
+    description="Retrieve the size of the in-process cache of search and stats responses, along with hit, miss, and conditional request counts since the service started. Only available when the cache is enabled, via the `METAKB_RESPONSE_CACHE_SIZE_MB` environment variable.",
+)
+def response_cache_metrics(request: Request) -> ResponseCacheStats:
+    """Provide response cache usage stats"""
+    cache: ResponseCache | None = request.app.state.response_cache
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Response cache is not enabled.")
+    return cache.summarize()
@@ -0,0 +1,280 @@
+"""Cache serialized API responses, and support conditional requests against them.
+
+Responses are identified by their endpoint, their (canonicalized) query parameters,
+and the current data version (see ``AbstractRepository.get_data_version()``). Where a
+response only depends on graph data, that identity is also sent as the response's
+``ETag``, so that clients and CDNs can revalidate with ``If-None-Match`` and get an
+empty ``304`` response, without the response being built at all.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from time import perf_counter
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from metakb import __version__
+from metakb.config import get_config
+from metakb.repository.base import AbstractRepository
+
+_logger = logging.getLogger(__name__)
+
+
+class ResponseCacheStats(BaseModel):
+    """Summarize response cache usage"""
+
+    max_bytes: int
+    size_bytes: int
+    entries: int
+    disk_dir: Path | None
+    data_version: str | None
+    hits: int
+    disk_hits: int
+    misses: int
+    not_modified: int
+    evictions: int
+
+
+class ResponseCache:
+    """Hold serialized response bodies, least recently used first out.
+
+    The in-memory tier is bounded by the total size of the bodies it holds. If a
+    directory is given, bodies are also written there, so that they survive restarts
+    and can be shared between server processes. Only bodies for the current data
+    version are kept, in either tier.
+    """
+
+    def __init__(self, max_bytes: int, disk_dir: Path | None = None) -> None:
+        """Initialize empty cache
+
+        :param max_bytes: max total size of response bodies to hold in memory
+        :param disk_dir: if given, also store response bodies in this directory
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._bodies: OrderedDict[str, bytes] = OrderedDict()
+        self._size_bytes = 0
+        self._data_version: str | None = None
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._not_modified = 0
+        self._evictions = 0
+
+    def _get_version_dir(self, data_version: str) -> Path | None:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / f"v_{data_version or 'none'}"
+
+    def _check_version(self, data_version: str) -> None:
+        """Discard cached bodies if they're from a different version of the data
+
+        :param data_version: current data version
+        """
+        if data_version == self._data_version:
+            return
+        self._bodies.clear()
+        self._size_bytes = 0
+        self._data_version = data_version
+        version_dir = self._get_version_dir(data_version)
+        if self.disk_dir is not None and self.disk_dir.is_dir():
+            for path in self.disk_dir.iterdir():
+                if path.is_dir() and path != version_dir:
+                    shutil.rmtree(path, ignore_errors=True)
+
+    def _put_memory(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        self._bodies[key] = body
+        self._size_bytes += len(body)
+        while self._size_bytes > self.max_bytes:
+            _, evicted = self._bodies.popitem(last=False)
+            self._size_bytes -= len(evicted)
+            self._evictions += 1
+
+    def get(self, key: str, data_version: str) -> bytes | None:
+        """Look up a response body
+
+        :param key: response identity (e.g. its ETag)
+        :param data_version: current data version
+        :return: response body, if cached
+        """
+        self._check_version(data_version)
+        body = self._bodies.get(key)
+        if body is not None:
+            self._hits += 1
+            self._bodies.move_to_end(key)
+            return body
+        version_dir = self._get_version_dir(data_version)
+        if version_dir is not None:
+            try:
+                body = (version_dir / f"{key}.json").read_bytes()
+            except FileNotFoundError:
+                pass
+            else:
+                self._disk_hits += 1
+                self._put_memory(key, body)
+                return body
+        self._misses += 1
+        return None
+
+    def put(self, key: str, data_version: str, body: bytes) -> None:
+        """Add a response body, evicting the least recently used ones if full
+
+        :param key: response identity (e.g. its ETag)
+        :param data_version: version of the data that the response was built from
+        :param body: serialized response body
+        """
+        self._check_version(data_version)
+        self._put_memory(key, body)
+        version_dir = self._get_version_dir(data_version)
+        if version_dir is not None:
+            path = version_dir / f"{key}.json"
+            tmp_path = path.with_name(f"{path.name}.part")
+            try:
+                version_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_bytes(body)
+                tmp_path.replace(path)
+            except OSError:
+                # e.g. the directory was cleared by another process for a newer version
+                _logger.warning("Unable to write cached response to %s", path)
+
+    def record_not_modified(self) -> None:
+        """Record that a conditional request was answered without a body"""
+        self._not_modified += 1
+
+    def summarize(self) -> ResponseCacheStats:
+        """Get cache usage statistics
+
+        :return: current memory use and data version, and counts since the cache was
+            created
+        """
+        return ResponseCacheStats(
+            max_bytes=self.max_bytes,
+            size_bytes=self._size_bytes,
+            entries=len(self._bodies),
+            disk_dir=self.disk_dir,
+            data_version=self._data_version,
+            hits=self._hits,
+            disk_hits=self._disk_hits,
+            misses=self._misses,
+            not_modified=self._not_modified,
+            evictions=self._evictions,
+        )
+
+
+def _get_cache_key(request: Request, data_version: str) -> str:
+    """Identify the response to a request
+
+    Query parameters are sorted and deduplicated, since no endpoint depends on their
+    order or multiplicity. Their values are otherwise used as given: search terms may
+    be case-sensitive identifiers, so differently-cased terms get separate entries.
+
+    :param request: incoming request
+    :param data_version: current data version
+    :return: hex digest identifying the response
+    """
+    identity = json.dumps(
+        [
+            __version__,
+            request.url.path,
+            sorted(set(request.query_params.multi_items())),
+            data_version,
+        ]
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+
+def _get_cache_control() -> str:
+    """Get the ``Cache-Control`` value for cacheable responses
+
+    :return: header value. With the default max age of 0, clients and CDNs may store
+        responses, but must revalidate them before each reuse.
+    """
+    max_age = get_config().response_max_age
+    return f"public, max-age={max_age}" if max_age else "public, no-cache"
+
+
+def _matches_etag(if_none_match: str | None, etag: str) -> bool:
+    """Check whether a conditional request's ``If-None-Match`` header matches
+
+    :param if_none_match: header value, if given
+    :param etag: current entity tag
+    :return: ``True`` if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _add_duration(body: bytes, field_name: str, duration_s: float) -> bytes:
+    """Add the time taken to respond to a serialized response object
+
+    :param body: serialized JSON object, without the duration field
+    :param field_name: name of the duration field
+    :param duration_s: time taken, in seconds
+    :return: serialized JSON object with the duration field last
+    """
+    separator = b"," if body != b"{}" else b""
+    return body[:-1] + separator + f'"{field_name}":{duration_s!r}}}'.encode()
+
+
+async def get_cached_response(
+    request: Request,
+    repository: AbstractRepository,
+    build_response: Callable[[], Awaitable[BaseModel]],
+    exclude_none: bool = False,
+    duration_field: str | None = None,
+    conditional: bool = True,
+) -> Response:
+    """Respond to a request from the response cache, building the response if needed
+
+    :param request: incoming request
+    :param repository: data repository instance, to check the data version with
+    :param build_response: callback to produce the response model on a cache miss.
+        Any exception it raises propagates, and nothing is cached.
+    :param exclude_none: whether to omit ``None`` values from the serialized response,
+        as with a route's ``response_model_exclude_none``
+    :param duration_field: name of a response field that reports the time taken to
+        respond, if any. It's left out of cached bodies and set for each response.
+    :param conditional: whether to send an ``ETag``, and answer conditional requests
+        with ``304`` if the client's copy is current, whether or not the response
+        cache is enabled (via ``app.state.response_cache``). Only use for responses
+        that depend on nothing but the request and the graph data, since the
+        ``ETag`` doesn't change otherwise.
+    :return: JSON response, with caching headers if conditional
+    """
+    start_time = perf_counter()
+    cache: ResponseCache | None = request.app.state.response_cache
+    data_version = await repository.get_data_version()
+    key = _get_cache_key(request, data_version)
+    headers = {}
+
+    if conditional:
+        etag = f'"{key}"'
+        headers = {"ETag": etag, "Cache-Control": _get_cache_control()}
+        if _matches_etag(request.headers.get("if-none-match"), etag):
+            if cache is not None:
+                cache.record_not_modified()
+            return Response(status_code=304, headers=headers)
+
+    body = cache.get(key, data_version) if cache is not None else None
+    if body is None:
+        model = await build_response()
+        body = model.model_dump_json(
+            by_alias=True,
+            exclude_none=exclude_none,
+            exclude={duration_field} if duration_field else None,
+        ).encode()
+        if cache is not None:
+            cache.put(key, data_version, body)
+    if duration_field:
+        body = _add_duration(body, duration_field, perf_counter() - start_time)
+    return Response(content=body, media_type="application/json", headers=headers)
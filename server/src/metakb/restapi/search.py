@@ -1,9 +1,8 @@
 """Declare search API endpoints"""
 
-from time import perf_counter
 from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from ga4gh.va_spec.base import (
     VariantDiagnosticProposition,
     VariantPrognosticProposition,
@@ -12,6 +11,7 @@ from ga4gh.va_spec.base import (
 
 from metakb.repository.base import AbstractRepository
 from metakb.restapi.dependencies import get_repository
+from metakb.restapi.response_cache import get_cached_response
 from metakb.schemas.api import (
     BatchSearchStatementsResponse,
     SearchStatementsQuery,
@@ -24,6 +24,7 @@ from metakb.services.fetch_entities import (
 )
 from metakb.services.search import (
     EmptySearchError,
+    PaginationParamError,
     batch_search_statements,
     search_statements,
 )
@@ -47,6 +48,7 @@ g_description = "Gene to search"
 s_description = "Statement ID to search."
 start_description = "The index of the first result to return. Use for pagination."
 limit_description = "The maximum number of results to return. Use for pagination."
+cursor_description = "The `next_cursor` value from a previous page of results, to fetch the page after it. Use instead of `start` to page efficiently through large result sets."
 
 
 api_router = APIRouter()
@@ -55,6 +57,7 @@ api_router = APIRouter()
 @api_router.get(
     "/search/statements",
     summary=search_stmts_summary,
+    response_model=SearchStatementsResponse,
     response_model_exclude_none=True,
     description=search_stmts_descr,
 )
@@ -68,69 +71,87 @@ async def get_statements(
     statement_id: Annotated[str | None, Query(description=s_description)] = None,
     start: Annotated[int, Query(description=start_description, ge=0)] = 0,
     limit: Annotated[int | None, Query(description=limit_description, ge=0)] = None,
-) -> SearchStatementsResponse:
+    cursor: Annotated[str | None, Query(description=cursor_description)] = None,
+) -> Response:
     """Get nested statements from queried concepts that match all conditions provided.
 
     For example, if `variation` and `therapy` are provided, will return all statements
     that have both the provided `variation` and `therapy`.
     """
-    start_time = perf_counter()
-    normalizer: ViccNormalizers = request.app.state.normalizer
-    try:
-        search_results = await search_statements(
-            repository,
-            normalizer,
-            variation,
-            disease,
-            therapy,
-            gene,
-            statement_id,
-            start,
-            limit,
-        )
-    except EmptySearchError as e:
-        raise HTTPException(
-            status_code=422,
-            detail="At least one search parameter (variation, disease, therapy, gene, statement_id) must be provided.",
-        ) from e
-
-    mapped_terms = {term.term_type.value: term for term in search_results.search_terms}
-    query = SearchStatementsQuery(**mapped_terms)
-    therapeutic_response_statements = []
-    diagnostic_statements = []
-    prognostic_statements = []
-    for statement in search_results.statements:
-        match statement.proposition:
-            case VariantTherapeuticResponseProposition():
-                therapeutic_response_statements.append(statement)
-            case VariantDiagnosticProposition():
-                diagnostic_statements.append(statement)
-            case VariantPrognosticProposition():
-                prognostic_statements.append(statement)
-            case _:
-                raise TypeError
-
-    end_time = perf_counter()
-
-    if search_results.statements:
-        if query.gene and query.gene.resolved_id:
-            resolved_gene = extract_gene_from_assertions(search_results.statements)
-            query.gene.resolved_object = resolved_gene
-        if query.variation and query.variation.resolved_id:
-            resolved_variant = extract_variation_from_assertions(
-                search_results.statements
+
+    async def _build_response() -> SearchStatementsResponse:
+        normalizer: ViccNormalizers = request.app.state.normalizer
+        try:
+            search_results = await search_statements(
+                repository,
+                normalizer,
+                variation,
+                disease,
+                therapy,
+                gene,
+                statement_id,
+                start,
+                limit,
+                cursor,
+                request.app.state.normalizer_executor,
             )
-            query.variation.resolved_object = resolved_variant
-
-    return SearchStatementsResponse(
-        query=query,
-        start=start,
-        limit=limit,
-        service_meta_=ServiceMeta(),
-        duration_s=end_time - start_time,
-        diagnostic_statements=diagnostic_statements,
-        prognostic_statements=prognostic_statements,
-        therapeutic_response_statements=therapeutic_response_statements,
+        except EmptySearchError as e:
+            raise HTTPException(
+                status_code=422,
+                detail="At least one search parameter (variation, disease, therapy, gene, statement_id) must be provided.",
+            ) from e
+        except PaginationParamError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+
+        mapped_terms = {
+            term.term_type.value: term for term in search_results.search_terms
+        }
+        query = SearchStatementsQuery(**mapped_terms)
+        therapeutic_response_statements = []
+        diagnostic_statements = []
+        prognostic_statements = []
+        for statement in search_results.statements:
+            match statement.proposition:
+                case VariantTherapeuticResponseProposition():
+                    therapeutic_response_statements.append(statement)
+                case VariantDiagnosticProposition():
+                    diagnostic_statements.append(statement)
+                case VariantPrognosticProposition():
+                    prognostic_statements.append(statement)
+                case _:
+                    raise TypeError
+
+        if search_results.statements:
+            if query.gene and query.gene.resolved_id:
+                resolved_gene = extract_gene_from_assertions(search_results.statements)
+                query.gene.resolved_object = resolved_gene
+            if query.variation and query.variation.resolved_id:
+                resolved_variant = extract_variation_from_assertions(
+                    search_results.statements
+                )
+                query.variation.resolved_object = resolved_variant
+
+        return SearchStatementsResponse(
+            query=query,
+            start=start,
+            limit=limit,
+            cursor=cursor,
+            next_cursor=search_results.next_cursor,
+            service_meta_=ServiceMeta(),
+            duration_s=0,  # set for each response by get_cached_response
+            diagnostic_statements=diagnostic_statements,
+            prognostic_statements=prognostic_statements,
+            therapeutic_response_statements=therapeutic_response_statements,
+        )
+
+    return await get_cached_response(
+        request,
+        repository,
+        _build_response,
+        exclude_none=True,
+        duration_field="duration_s",
+        # bodies include normalizer results, which can change between data reloads
+        conditional=False,
     )
 
 
@@ -140,12 +161,14 @@ _batch_descr = {
     "arg_variations": "Variations (subject) to search. Can be free text or VRS variation ID.",
     "arg_start": "The index of the first result to return. Use for pagination.",
     "arg_limit": "The maximum number of results to return. Use for pagination.",
+    "arg_cursor": cursor_description,
 }
 
 
 @api_router.get(
     "/batch_search/statements",
     summary=_batch_descr["summary"],
+    response_model=BatchSearchStatementsResponse,
     response_model_exclude_none=True,
     description=_batch_descr["description"],
 )
@@ -158,26 +181,40 @@ async def batch_get_statements(
     ] = None,
     start: Annotated[int, Query(description=_batch_descr["arg_start"])] = 0,
     limit: Annotated[int | None, Query(description=_batch_descr["arg_limit"])] = None,
-) -> BatchSearchStatementsResponse:
+    cursor: Annotated[str | None, Query(description=_batch_descr["arg_cursor"])] = None,
+) -> Response:
     """Fetch all statements associated with `any` of the provided variations."""
-    start_time = perf_counter()
 
-    normalizer: ViccNormalizers = request.app.state.normalizer
-    try:
-        results = await batch_search_statements(
-            repository, normalizer, variations, start, limit
+    async def _build_response() -> BatchSearchStatementsResponse:
+        normalizer: ViccNormalizers = request.app.state.normalizer
+        try:
+            results = await batch_search_statements(
+                repository, normalizer, variations, start, limit, cursor
+            )
+        except EmptySearchError as e:
+            raise HTTPException(
+                status_code=422,
+                detail="At least one search parameter must be provided, but no variations values have been given.",
+            ) from e
+        except PaginationParamError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        return BatchSearchStatementsResponse(
+            search_terms=results.search_terms,
+            start=start,
+            limit=limit,
+            cursor=cursor,
+            next_cursor=results.next_cursor,
+            service_meta_=ServiceMeta(),
+            statements=results.statements,
+            duration_s=0,  # set for each response by get_cached_response
         )
-    except EmptySearchError as e:
-        raise HTTPException(
-            status_code=422,
-            detail="At least one search parameter must be provided, but no variations values have been given.",
-        ) from e
-    end_time = perf_counter()
-    return BatchSearchStatementsResponse(
-        search_terms=results.search_terms,
-        start=start,
-        limit=limit,
-        service_meta_=ServiceMeta(),
-        statements=results.statements,
-        duration_s=end_time - start_time,
+
+    return await get_cached_response(
+        request,
+        repository,
+        _build_response,
+        exclude_none=True,
+        duration_field="duration_s",
+        # bodies include normalizer results, which can change between data reloads
+        conditional=False,
     )
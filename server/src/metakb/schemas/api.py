@@ -138,6 +138,8 @@ class SearchResult(BaseModel):
     statements: list[Statement] = []
     start: int = 0
     limit: int | None = None
+    cursor: str | None = None
+    next_cursor: str | None = None
 
 
 class SearchStatementsQuery(BaseModel):
@@ -156,6 +158,8 @@ class SearchStatementsResponse(BaseModel):
     query: SearchStatementsQuery
     start: int
     limit: int | None
+    cursor: str | None = None
+    next_cursor: str | None = None
     prognostic_statements: list[Statement]
     diagnostic_statements: list[Statement]
     therapeutic_response_statements: list[Statement]
@@ -169,6 +173,8 @@ class BatchSearchStatementsResponse(BaseModel):
     search_terms: list[SearchTerm]
     start: int
     limit: int | None
+    cursor: str | None = None
+    next_cursor: str | None = None
     statements: list[Statement] = []
     duration_s: float
     service_meta_: ServiceMeta
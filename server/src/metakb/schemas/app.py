@@ -37,3 +37,26 @@ class SourceName(StrEnum):
         :return: formatted enum value
         """
         return f"'{self.value}'"
+
+
+class ArtifactCompression(StrEnum):
+    """Define compression formats for saved harvest and transform artifacts"""
+
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+    @property
+    def suffix(self) -> str:
+        """Provide file extension for the compression format, to follow e.g. ``.json``
+
+        :return: extension including leading dot, or empty string if uncompressed
+        """
+        return {self.NONE: "", self.GZIP: ".gz", self.ZSTD: ".zst"}[self]
+
+
+class CdmFormat(StrEnum):
+    """Define serialization formats for transformed (CDM) data"""
+
+    JSON = "json"
+    BINARY = "binary"
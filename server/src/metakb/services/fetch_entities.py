@@ -80,7 +80,8 @@ def _update_gene_from_civic_gid(
 
 def extract_gene_from_assertions(assertions: list[Statement]) -> MappableConcept:
     """Given MetaKB assertions, gather the gene and source-provided gene concepts."""
-    gene = assertions[0].proposition.geneContextQualifier
+    # copy, since given statements may be shared (e.g. via the statement cache)
+    gene = assertions[0].proposition.geneContextQualifier.model_copy(deep=True)
     child_genes = _collect_unique_entities(assertions, "geneContextQualifier")
     for child_gene in child_genes:
         if child_gene.id.startswith("civic.gid:"):
@@ -141,7 +142,7 @@ def extract_variation_from_assertions(
     assertions: list[Statement],
 ) -> CategoricalVariant:
     """Given MetaKB assertions, gather the subject catvar with source-provided data added where needed"""
-    catvar = assertions[0].proposition.subjectVariant
+    catvar = assertions[0].proposition.subjectVariant.model_copy(deep=True)
     child_catvars = _collect_unique_entities(assertions, "subjectVariant")
     for child_catvar in child_catvars:
         if child_catvar.id.startswith("moa.variant:"):
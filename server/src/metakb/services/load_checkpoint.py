@@ -0,0 +1,119 @@
+"""Record progress of CDM loads, so that an interrupted load can be resumed."""
+
+import hashlib
+import logging
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from metakb.config import get_config
+
+_logger = logging.getLogger(__name__)
+
+
+class _FileProgress(BaseModel):
+    """Loading progress for a single CDM file"""
+
+    sha256: str
+    loaded_count: int = 0
+    complete: bool = False
+
+
+class _CheckpointState(BaseModel):
+    """Contents of a checkpoint file"""
+
+    files: dict[str, _FileProgress] = {}
+
+
+def _hash_file(path: Path) -> str:
+    """Get SHA-256 digest of a file's contents
+
+    :param path: path to file
+    :return: hex digest
+    """
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class LoadCheckpoint:
+    """Track how many assertions from each CDM file have been committed to the DB.
+
+    Progress is persisted to a local JSON file after every update, so it survives the
+    loading process dying. Each file's progress is tied to a hash of its contents, so
+    if a file has changed since it was checkpointed, it's loaded from the start.
+    """
+
+    def __init__(self, checkpoint_path: Path | None = None) -> None:
+        """Initialize checkpoint. Any existing progress is read from disk.
+
+        :param checkpoint_path: location of checkpoint file. Defaults to
+            ``load_cdm_checkpoint.json`` in the configured data directory.
+        """
+        self.checkpoint_path = checkpoint_path or (
+            get_config().data_dir / "load_cdm_checkpoint.json"
+        )
+        self._state = _CheckpointState()
+        if self.checkpoint_path.exists():
+            try:
+                self._state = _CheckpointState.model_validate_json(
+                    self.checkpoint_path.read_text()
+                )
+            except ValidationError:
+                _logger.warning(
+                    "Ignoring unreadable load checkpoint at %s", self.checkpoint_path
+                )
+
+    @staticmethod
+    def _get_key(src_transformed_cdm: Path) -> str:
+        return str(src_transformed_cdm.resolve())
+
+    def _write(self) -> None:
+        """Persist current state. Write to a temp file and then swap it in, so that
+        the checkpoint is never left half-written.
+        """
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        tmp_path.write_text(self._state.model_dump_json())
+        tmp_path.replace(self.checkpoint_path)
+
+    def start_file(self, src_transformed_cdm: Path) -> int:
+        """Begin (or resume) loading a CDM file
+
+        :param src_transformed_cdm: path to CDM file
+        :return: number of assertions at the start of the file that have already been
+            loaded. If the file has been fully loaded, this is ``-1``.
+        """
+        key = self._get_key(src_transformed_cdm)
+        sha256 = _hash_file(src_transformed_cdm)
+        progress = self._state.files.get(key)
+        if progress is not None and progress.sha256 == sha256:
+            return -1 if progress.complete else progress.loaded_count
+        if progress is not None:
+            _logger.info(
+                "%s has changed since it was checkpointed, so it will be loaded from the start",
+                src_transformed_cdm,
+            )
+        self._state.files[key] = _FileProgress(sha256=sha256)
+        self._write()
+        return 0
+
+    def update(
+        self, src_transformed_cdm: Path, loaded_count: int, complete: bool = False
+    ) -> None:
+        """Record that assertions from a file have been committed
+
+        :param src_transformed_cdm: path to CDM file. ``start_file()`` must already
+            have been called for it.
+        :param loaded_count: total number of assertions from the start of the file that
+            have been committed
+        :param complete: whether the entire file has been loaded
+        """
+        progress = self._state.files[self._get_key(src_transformed_cdm)]
+        progress.loaded_count = loaded_count
+        progress.complete = complete
+        self._write()
+
+    def clear(self) -> None:
+        """Discard all progress, e.g. once a load has finished successfully"""
+        self._state = _CheckpointState()
+        self.checkpoint_path.unlink(missing_ok=True)
@@ -1,43 +1,625 @@
 """Load and manage data for the database."""
 
+import asyncio
+import hashlib
 import json
 import logging
+from collections.abc import Callable, Iterator, Sequence
+from itertools import chain, islice
 from pathlib import Path
+from typing import Any
 
 import click
+from ga4gh.va_spec.base import EvidenceLine, Statement
 from tqdm import tqdm
 
-from metakb.repository.base import AbstractRepository
-from metakb.schemas.data import TransformedData
+from metakb.repository.base import (
+    AbstractRepository,
+    RepositoryMemoryError,
+    RepositoryStats,
+)
+from metakb.repository.neo4j_bulk_import import (
+    BulkImportFiles,
+    BulkImportGraph,
+    write_bulk_import_files,
+)
+from metakb.services.load_checkpoint import LoadCheckpoint
+from metakb.source_data import iter_cdm_assertions
 from metakb.transformers.methodology import merge_assertions
 
 _logger = logging.getLogger(__name__)
 
 
+# default number of assertions to send to the repository at once. Can be overridden
+# with the ``load_batch_size`` config setting.
+LOAD_BATCH_SIZE = 100
+
+# number of assertions to read from a CDM file and process at once
+LOAD_CHUNK_SIZE = 5000
+
+# max fraction of live assertions that a staged load may be missing before it's
+# considered incomplete, and cutover to it is refused
+MAX_STAGED_ASSERTION_LOSS = 0.1
+
+
+class StagedLoadValidationError(Exception):
+    """Raise if a staged load doesn't look complete enough to switch readers to"""
+
+
+def _get_evidence_ids(statement: Statement) -> set[str]:
+    """Get IDs of all statements and evidence lines nested within a statement
+
+    :param statement: statement to walk
+    :return: IDs of the statement itself, plus everything in its evidence tree
+    """
+    ids = {statement.id}
+    evidence_lines = list(statement.hasEvidenceLines or [])
+    while evidence_lines:
+        evidence_line = evidence_lines.pop()
+        if evidence_line.id:
+            ids.add(evidence_line.id)
+        for item in evidence_line.hasEvidenceItems or []:
+            if isinstance(item, EvidenceLine):
+                evidence_lines.append(item)
+            elif isinstance(item, Statement):
+                ids.add(item.id)
+                evidence_lines.extend(item.hasEvidenceLines or [])
+    return ids
+
+
+def _group_assertions(
+    assertions: list[Statement], batch_size: int
+) -> list[list[Statement]]:
+    """Split assertions into load batches, such that any assertions which share
+    evidence (nested statements or evidence lines) always end up in the same batch.
+
+    This allows batches to be loaded concurrently without contending over the same
+    nodes. Input order is preserved, so the same input always produces the same
+    batches. A group of connected assertions larger than ``batch_size`` is kept
+    together in a single, oversized batch.
+
+    :param assertions: assertions to load
+    :param batch_size: target number of assertions per batch
+    :return: list of batches
+    """
+    # union-find over assertion indices, linking any that share an evidence ID
+    parents = list(range(len(assertions)))
+
+    def _find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    first_seen: dict[str, int] = {}
+    for i, assertion in enumerate(assertions):
+        for evidence_id in _get_evidence_ids(assertion):
+            if evidence_id in first_seen:
+                root_a, root_b = _find(i), _find(first_seen[evidence_id])
+                parents[max(root_a, root_b)] = min(root_a, root_b)
+            else:
+                first_seen[evidence_id] = i
+
+    groups: dict[int, list[Statement]] = {}
+    for i, assertion in enumerate(assertions):
+        groups.setdefault(_find(i), []).append(assertion)
+
+    batches: list[list[Statement]] = []
+    batch: list[Statement] = []
+    for group in groups.values():
+        batch.extend(group)
+        if len(batch) >= batch_size:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def _load_batch(repository: AbstractRepository, batch: list[Statement]) -> None:
+    """Load a batch of assertions, splitting it up if it's too large for the
+    repository to write in one transaction.
+
+    Assertions that share evidence are never separated, so a batch made up of a
+    single group of connected assertions can't be split any further.
+
+    :param repository: data repository instance
+    :param batch: assertions to load
+    :raise RepositoryMemoryError: if the batch can't be split enough to fit
+    """
+    try:
+        await repository.load_assertions(batch, include_entities=False)
+    except RepositoryMemoryError:
+        groups = _group_assertions(batch, 1)
+        if len(groups) == 1:
+            raise
+        _logger.warning(
+            "Batch of %s assertions exceeded repository memory limits; retrying in halves",
+            len(batch),
+        )
+        midpoint = len(groups) // 2
+        for half in (groups[:midpoint], groups[midpoint:]):
+            await _load_batch(repository, list(chain.from_iterable(half)))
+
+
+def _merge_chunk_assertions(
+    chunk: list[Statement], get_existing: Callable[[str], Statement | None]
+) -> list[Statement]:
+    """Merge a chunk's assertions with their existing copies
+
+    An assertion ID may also be repeated within the chunk, so each copy is merged into
+    whatever has been seen so far, starting from the existing copy.
+
+    :param chunk: assertions read from a CDM file
+    :param get_existing: callback to look up the already-loaded copy of an assertion
+        by ID, if there is one
+    :return: one merged assertion per ID in the chunk, in order of first appearance
+    """
+    assertions: dict[str, Statement] = {}
+    for assertion in chunk:
+        if existing_assertion := (
+            assertions.get(assertion.id) or get_existing(assertion.id)
+        ):
+            # MUST pass the existing assertion as the first arg to ensure
+            # IDs remain consistent
+            assertion = merge_assertions(existing_assertion, assertion)  # noqa: PLW2901
+        assertions[assertion.id] = assertion
+    return list(assertions.values())
+
+
+async def _load_chunk(
+    chunk: list[Statement],
+    repository: AbstractRepository,
+    batch_size: int,
+    worker_repositories: Sequence[AbstractRepository],
+) -> None:
+    """Load a chunk of assertions read from a CDM file
+
+    Existing copies of the chunk's assertions are looked up once, before anything in
+    the chunk is written. Assertions are merged with their existing copy, and any
+    later copies of the same ID within the chunk are merged into that, so the result
+    is the same as loading each copy in turn.
+
+    :param chunk: assertions to load
+    :param repository: data repository instance
+    :param batch_size: target number of assertions to load at once
+    :param worker_repositories: repository instances to load batches with concurrently
+    """
+    await repository.load_entities(chunk)
+
+    # only hydrate assertions that need to be merged with what's already there --
+    # when loading into an empty DB, this is a single cheap ID lookup
+    existing_ids = sorted(
+        await repository.get_existing_assertion_ids([a.id for a in chunk])
+    )
+    existing_assertions = {}
+    for i in range(0, len(existing_ids), batch_size):
+        for statement in await repository.get_statements(
+            existing_ids[i : i + batch_size]
+        ):
+            existing_assertions[statement.id] = statement
+
+    assertions = _merge_chunk_assertions(chunk, existing_assertions.get)
+    batches = iter(_group_assertions(assertions, batch_size))
+
+    async def _load_batches(worker: AbstractRepository) -> None:
+        # workers pull from a shared iterator, so each batch is only loaded once
+        for batch in batches:
+            await _load_batch(worker, batch)
+
+    await asyncio.gather(*(_load_batches(worker) for worker in worker_repositories))
+
+
+def _iter_chunks(
+    src_transformed_cdm: Path, chunk_size: int, silent: bool, skip: int = 0
+) -> Iterator[list[Statement]]:
+    """Stream assertions from a CDM file in fixed-size chunks
+
+    :param src_transformed_cdm: path to CDM file
+    :param chunk_size: max number of assertions per chunk
+    :param silent: whether to suppress progress bar
+    :param skip: number of assertions at the start of the file to skip over
+    :return: iterator over lists of assertions
+    """
+    assertions = tqdm(
+        islice(iter_cdm_assertions(src_transformed_cdm), skip, None),
+        initial=skip,
+        disable=silent,
+    )
+    while chunk := list(islice(assertions, chunk_size)):
+        yield chunk
+
+
 async def load_from_json(
-    src_transformed_cdm: Path, repository: AbstractRepository, silent: bool = True
+    src_transformed_cdm: Path,
+    repository: AbstractRepository,
+    silent: bool = True,
+    batch_size: int = LOAD_BATCH_SIZE,
+    worker_repositories: Sequence[AbstractRepository] | None = None,
+    chunk_size: int = LOAD_CHUNK_SIZE,
+    checkpoint: LoadCheckpoint | None = None,
 ) -> None:
     """Load assertions and evidence into DB from given CDM JSON file.
 
+    The file is streamed, and processed in chunks of ``chunk_size`` assertions at a
+    time, so memory use is bounded regardless of file size.
+
+    Within each chunk, shared entities (genes, conditions, therapies, variants,
+    documents, etc) are written once up front via ``repository.load_entities()``,
+    rather than once for every statement that references them. Assertions are then
+    loaded in batches via ``repository.load_assertions()``, which only needs to create
+    edges to those entities.
+
+    If ``worker_repositories`` are given, batches are distributed among them and
+    loaded concurrently. Assertions that share any evidence are always placed in the
+    same batch (see ``_group_assertions()``), so concurrent batches never write the
+    same statement or evidence line.
+
     :param src_transformed_cdm: path to file for a source's transformed data to
         common data model containing statements, variation, therapies, conditions,
         genes, methods, documents, etc.
     :param repository: data repository instance
     :param silent: whether to suppress printing to console
+    :param batch_size: target number of assertions to load at once
+    :param worker_repositories: repository instances (e.g. each backed by its own
+        DB session) to load batches with concurrently. If not given, just use
+        ``repository``.
+    :param chunk_size: max number of assertions to read from the file and hold in
+        memory at once
+    :param checkpoint: if given, record progress after each chunk is committed, and
+        skip over any assertions that the checkpoint shows were already loaded from
+        this file. Loading is idempotent, so if a chunk was interrupted partway
+        through, it's safe to load it again.
+
+    Once the file is loaded, documents are precomputed for changed statements (see
+    ``repository.refresh_statement_documents()``), and the repository's data version
+    is updated, which invalidates outstanding search pagination cursors.
     """
-    _logger.info("Loading data from %s", src_transformed_cdm)
-    if not silent:
-        click.echo(f"Loading {src_transformed_cdm}")
-    with src_transformed_cdm.open() as f:
-        dumped_data = json.load(f)
-        data = TransformedData(**dumped_data)
-        loaded_stmt_count = 0
-        for assertion in tqdm(data.assertions, disable=silent):
-            if existing_assertion := await repository.get_statement(assertion.id):
-                # MUST pass the existing assertion as the first arg to ensure
-                # IDs remain consistent
-                assertion = merge_assertions(existing_assertion, assertion)  # noqa: PLW2901
-            await repository.load_assertion(assertion)
-            loaded_stmt_count += 1
+    skip = checkpoint.start_file(src_transformed_cdm) if checkpoint else 0
+    if skip == -1:
+        msg = f"Skipping {src_transformed_cdm}, which has already been loaded"
+        _logger.info(msg)
+        if not silent:
+            click.echo(msg)
+        return
+    if skip:
+        msg = f"Resuming {src_transformed_cdm} after {skip} loaded assertions"
+        _logger.info(msg)
+        if not silent:
+            click.echo(msg)
+    else:
+        _logger.info("Loading data from %s", src_transformed_cdm)
+        if not silent:
+            click.echo(f"Loading {src_transformed_cdm}")
+    loaded_stmt_count = skip
+    for chunk in _iter_chunks(src_transformed_cdm, chunk_size, silent, skip):
+        await _load_chunk(
+            chunk, repository, batch_size, worker_repositories or [repository]
+        )
+        loaded_stmt_count += len(chunk)
+        if checkpoint:
+            checkpoint.update(src_transformed_cdm, loaded_stmt_count)
+    if checkpoint:
+        checkpoint.update(src_transformed_cdm, loaded_stmt_count, complete=True)
 
+    await repository.refresh_statement_documents()
+    await repository.update_data_version()
     _logger.info("Successfully loaded %s statements.", loaded_stmt_count)
+
+
+async def _load_filtered(
+    src_transformed_cdm: Path,
+    include: Callable[[Statement], bool],
+    repository: AbstractRepository,
+    batch_size: int,
+    worker_repositories: Sequence[AbstractRepository],
+    chunk_size: int,
+    silent: bool,
+) -> int:
+    """Load only the assertions from a CDM file that pass a filter
+
+    :param src_transformed_cdm: path to CDM file
+    :param include: filter function. Return ``True`` to load an assertion.
+    :param repository: data repository instance
+    :param batch_size: target number of assertions to load at once
+    :param worker_repositories: repository instances to load batches with concurrently
+    :param chunk_size: max number of assertions to read from the file at once
+    :param silent: whether to suppress progress bar
+    :return: number of assertions loaded
+    """
+    loaded_stmt_count = 0
+    for chunk in _iter_chunks(src_transformed_cdm, chunk_size, silent):
+        filtered_chunk = [a for a in chunk if include(a)]
+        if filtered_chunk:
+            await _load_chunk(
+                filtered_chunk, repository, batch_size, worker_repositories
+            )
+            loaded_stmt_count += len(filtered_chunk)
+    return loaded_stmt_count
+
+
+async def load_from_json_concurrent(
+    src_transformed_cdms: Sequence[Path],
+    repositories: Sequence[AbstractRepository],
+    silent: bool = True,
+    batch_size: int = LOAD_BATCH_SIZE,
+    chunk_size: int = LOAD_CHUNK_SIZE,
+) -> None:
+    """Load several CDM JSON files at once.
+
+    The end result is the same as calling ``load_from_json()`` on each file in turn.
+    All files are scanned up front for IDs (of assertions, or of anything in their
+    evidence trees) that appear in more than one file. Assertions that don't contain
+    any such IDs can't affect one another, so each file's share of them is loaded
+    concurrently. The remaining assertions are then loaded file-by-file, in the given
+    order, so that they're merged with ``merge_assertions()`` exactly as they would
+    be in a sequential load.
+
+    :param src_transformed_cdms: paths to files for sources' transformed data, in
+        load order
+    :param repositories: repository instances (e.g. each backed by its own DB
+        session). There must be at least one per file; they're divided evenly among
+        files for the concurrent phase, and all used for the sequential phase.
+    :param silent: whether to suppress printing to console
+    :param batch_size: target number of assertions to load at once
+    :param chunk_size: max number of assertions to read from a file and hold in
+        memory at once, per file
+    :raise ValueError: if there are fewer repositories than files
+    """
+    if len(repositories) < len(src_transformed_cdms):
+        msg = f"Need at least {len(src_transformed_cdms)} repositories, got {len(repositories)}"
+        raise ValueError(msg)
+
+    first_seen: dict[str, int] = {}
+    shared_ids: set[str] = set()
+    for i, src_transformed_cdm in enumerate(src_transformed_cdms):
+        for assertion in iter_cdm_assertions(src_transformed_cdm):
+            for evidence_id in _get_evidence_ids(assertion):
+                if first_seen.setdefault(evidence_id, i) != i:
+                    shared_ids.add(evidence_id)
+    del first_seen
+
+    def _is_shared(assertion: Statement) -> bool:
+        return not _get_evidence_ids(assertion).isdisjoint(shared_ids)
+
+    async def _load_unshared(i: int, src_transformed_cdm: Path) -> None:
+        workers = repositories[i :: len(src_transformed_cdms)]
+        # progress bars from concurrent loads would just garble one another
+        loaded_stmt_count = await _load_filtered(
+            src_transformed_cdm,
+            lambda a: not _is_shared(a),
+            workers[0],
+            batch_size,
+            workers,
+            chunk_size,
+            True,
+        )
+        msg = f"Loaded {loaded_stmt_count} statements from {src_transformed_cdm}"
+        _logger.info(msg)
+        if not silent:
+            click.echo(msg)
+
+    msg = f"Loading {len(src_transformed_cdms)} files concurrently"
+    _logger.info(msg)
+    if not silent:
+        click.echo(msg)
+    await asyncio.gather(
+        *(
+            _load_unshared(i, src_transformed_cdm)
+            for i, src_transformed_cdm in enumerate(src_transformed_cdms)
+        )
+    )
+
+    if shared_ids:
+        for src_transformed_cdm in src_transformed_cdms:
+            _logger.info("Loading shared data from %s", src_transformed_cdm)
+            if not silent:
+                click.echo(f"Loading shared data from {src_transformed_cdm}")
+            await _load_filtered(
+                src_transformed_cdm,
+                _is_shared,
+                repositories[0],
+                batch_size,
+                repositories,
+                chunk_size,
+                silent,
+            )
+    await repositories[0].refresh_statement_documents()
+    await repositories[0].update_data_version()
+    _logger.info("Successfully loaded %s files.", len(src_transformed_cdms))
+
+
+def _strip_evidence_line_ids(value: Any) -> Any:  # noqa: ANN401
+    """Recursively remove evidence line IDs from a dumped statement
+
+    :param value: dumped statement, or some part of it
+    :return: copy of ``value`` with no evidence line ``id`` keys
+    """
+    if isinstance(value, dict):
+        return {
+            k: _strip_evidence_line_ids(v)
+            for k, v in value.items()
+            if not (k == "id" and value.get("type") == "EvidenceLine")
+        }
+    if isinstance(value, list):
+        return [_strip_evidence_line_ids(v) for v in value]
+    return value
+
+
+def compute_assertion_hash(assertion: Statement) -> str:
+    """Compute a stable hash of an assertion's contents, including its full evidence
+    tree.
+
+    Evidence line IDs are freshly generated on every transform, so they're ignored.
+
+    :param assertion: assertion to hash
+    :return: hex digest
+    """
+    dumped = _strip_evidence_line_ids(
+        assertion.model_dump(mode="json", exclude_none=True)
+    )
+    return hashlib.sha256(
+        json.dumps(dumped, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+async def load_from_json_differential(
+    src_transformed_cdms: Sequence[Path],
+    repository: AbstractRepository,
+    silent: bool = True,
+    batch_size: int = LOAD_BATCH_SIZE,
+    worker_repositories: Sequence[AbstractRepository] | None = None,
+    chunk_size: int = LOAD_CHUNK_SIZE,
+) -> None:
+    """Bring the DB in line with the given CDM JSON files, only writing assertions
+    that have changed.
+
+    The given files are treated as the complete set of data that should be in the DB.
+    Each assertion's content hash (over all of the files it appears in) is compared to
+    the hash stored the last time it was loaded this way:
+
+    * unchanged assertions are skipped entirely
+    * changed or new assertions are removed and loaded from scratch, as they would be
+      into an empty DB
+    * assertions in the DB that don't appear in any of the files are removed
+    * unchanged assertions citing any of those are reloaded too, since their copies of
+      the cited assertions are replaced
+    * evidence items that are no longer cited by anything are removed
+
+    Assertions loaded some other way (e.g. via ``load_from_json()``) have no stored
+    hash, so they're always treated as changed.
+
+    :param src_transformed_cdms: paths to files for sources' transformed data, in
+        load order
+    :param repository: data repository instance
+    :param silent: whether to suppress printing to console
+    :param batch_size: target number of assertions to load at once
+    :param worker_repositories: repository instances to load batches with
+        concurrently. If not given, just use ``repository``.
+    :param chunk_size: max number of assertions to read from a file and hold in
+        memory at once
+    """
+    assertion_hashes: dict[str, list[str]] = {}
+    for src_transformed_cdm in src_transformed_cdms:
+        for assertion in iter_cdm_assertions(src_transformed_cdm):
+            assertion_hashes.setdefault(assertion.id, []).append(
+                compute_assertion_hash(assertion)
+            )
+    content_hashes = {
+        assertion_id: hashlib.sha256(":".join(hashes).encode()).hexdigest()
+        for assertion_id, hashes in assertion_hashes.items()
+    }
+
+    stored_hashes = await repository.get_assertion_hashes()
+    changed_ids = {
+        assertion_id
+        for assertion_id, content_hash in content_hashes.items()
+        if stored_hashes.get(assertion_id) != content_hash
+    }
+    removed_ids = (
+        set(stored_hashes) | set(await repository.get_all_assertion_ids())
+    ) - content_hashes.keys()
+    # an assertion citing one that's removed or reloaded would otherwise be left with
+    # a stripped copy of it, so it's reloaded too
+    changed_ids |= content_hashes.keys() & await repository.get_citing_assertion_ids(
+        sorted(changed_ids | removed_ids)
+    )
+    stale_ids = sorted(
+        await repository.get_existing_assertion_ids(sorted(changed_ids)) | removed_ids
+    )
+    unchanged_count = len(content_hashes) - len(changed_ids)
+    msg = (
+        f"Found {len(changed_ids)} new or changed assertions, {unchanged_count} "
+        f"unchanged, and {len(removed_ids)} removed"
+    )
+    _logger.info(msg)
+    if not silent:
+        click.echo(msg)
+
+    for i in range(0, len(stale_ids), batch_size):
+        await repository.delete_assertions(stale_ids[i : i + batch_size])
+
+    for src_transformed_cdm in src_transformed_cdms:
+        _logger.info("Loading changed data from %s", src_transformed_cdm)
+        if not silent:
+            click.echo(f"Loading changed data from {src_transformed_cdm}")
+        await _load_filtered(
+            src_transformed_cdm,
+            lambda a: a.id in changed_ids,
+            repository,
+            batch_size,
+            worker_repositories or [repository],
+            chunk_size,
+            silent,
+        )
+
+    # only record hashes once everything has been loaded, so that if loading is
+    # interrupted, partially-loaded assertions are retried next time
+    sorted_changed_ids = sorted(changed_ids)
+    for i in range(0, len(sorted_changed_ids), batch_size):
+        await repository.set_assertion_hashes(
+            {a: content_hashes[a] for a in sorted_changed_ids[i : i + batch_size]}
+        )
+    await repository.refresh_statement_documents()
+    await repository.update_data_version()
+    _logger.info("Successfully applied differential load.")
+
+
+def export_bulk_import(
+    src_transformed_cdms: Sequence[Path],
+    output_dir: Path,
+    silent: bool = True,
+    chunk_size: int = LOAD_CHUNK_SIZE,
+) -> BulkImportFiles:
+    """Convert CDM JSON files into CSVs for the offline Neo4j bulk importer.
+
+    Files are processed in order, as if each were passed to ``load_from_json()`` in
+    turn, starting from an empty DB -- i.e. assertions appearing in more than one file
+    are merged in the same way. Statement documents aren't built, so once imported, run
+    ``refresh_statement_documents()`` against the graph.
+
+    :param src_transformed_cdms: paths to files for sources' transformed data
+    :param output_dir: directory to write import files to
+    :param silent: whether to suppress printing to console
+    :param chunk_size: number of assertions to process at once. Should match what
+        ``load_from_json()`` would use, for an identical result.
+    :return: paths to written files
+    """
+    graph = BulkImportGraph()
+    for src_transformed_cdm in src_transformed_cdms:
+        _logger.info("Exporting data from %s", src_transformed_cdm)
+        if not silent:
+            click.echo(f"Exporting {src_transformed_cdm}")
+        for chunk in _iter_chunks(src_transformed_cdm, chunk_size, silent):
+            graph.load_entities(chunk)
+            graph.load_assertions(_merge_chunk_assertions(chunk, graph.get_statement))
+    return write_bulk_import_files(graph, output_dir)
+
+
+def validate_staged_stats(
+    staged_stats: RepositoryStats, live_stats: RepositoryStats | None
+) -> None:
+    """Sanity-check entity counts for a freshly staged load before readers are
+    switched over to it.
+
+    Every kind of entity must be present, and the number of assertions mustn't have
+    dropped by more than ``MAX_STAGED_ASSERTION_LOSS`` relative to the live data.
+
+    :param staged_stats: counts from staged load
+    :param live_stats: counts from data currently being served, if there is any
+    :raise StagedLoadValidationError: if staged data looks incomplete
+    """
+    empty = [name for name, count in staged_stats.model_dump().items() if not count]
+    if empty:
+        msg = f"Staged load has no entities for: {', '.join(empty)}"
+        raise StagedLoadValidationError(msg)
+    if live_stats is not None:
+        min_assertions = live_stats.num_metakb_assertions * (
+            1 - MAX_STAGED_ASSERTION_LOSS
+        )
+        if staged_stats.num_metakb_assertions < min_assertions:
+            msg = (
+                f"Staged load has {staged_stats.num_metakb_assertions} assertions, "
+                f"versus {live_stats.num_metakb_assertions} currently live"
+            )
+            raise StagedLoadValidationError(msg)
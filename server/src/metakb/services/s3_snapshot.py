@@ -0,0 +1,203 @@
+"""Retrieve published CDM snapshot files from the VICC S3 bucket."""
+
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import boto3
+from botocore import UNSIGNED
+from botocore.client import BaseClient
+from botocore.config import Config
+from pydantic import BaseModel
+
+from metakb.config import get_config
+
+_logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_BUCKET = "vicc-metakb"
+
+# snapshots are grouped under dated prefixes, e.g.
+# s3://vicc-metakb/cdm/20220201/civic_cdm_20220201.json.zip
+_SNAPSHOT_PREFIX = "cdm/"
+_SNAPSHOT_DIR_PATTERN = re.compile(r"cdm/20[23]\d[01]\d[0123]\d/")
+_SNAPSHOT_KEY_PATTERN = re.compile(
+    r"cdm/20[23]\d[01]\d[0123]\d/(?P<source>.*)_cdm_(?P<version>.*)\.json\.zip"
+)
+
+# max number of snapshot files to download at once
+MAX_DOWNLOAD_WORKERS = 4
+
+
+class _SnapshotFile(BaseModel):
+    """Describe a single remote snapshot file"""
+
+    key: str
+    source: str
+    version: str
+    size: int
+    etag: str
+
+
+class SnapshotRetrieval(BaseModel):
+    """Describe the result of retrieving a snapshot"""
+
+    version: str
+    paths: dict[str, Path]
+    downloaded: list[str]
+    skipped: list[str]
+
+
+def get_s3_client(endpoint_url: str | None = None) -> BaseClient:
+    """Get an anonymous S3 client
+
+    :param endpoint_url: S3 API endpoint, e.g. for a local S3 stand-in. Defaults to the
+        ``s3_endpoint_url`` config setting, or AWS if that isn't set.
+    :return: S3 client. Clients are thread-safe, so it can be shared across downloads.
+    """
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint_url or get_config().s3_endpoint_url,
+        config=Config(region_name="us-east-2", signature_version=UNSIGNED),
+    )
+
+
+def _list_latest_snapshot(client: BaseClient, bucket: str) -> list[_SnapshotFile]:
+    """Find files belonging to the most recent snapshot
+
+    Rather than listing every object in the bucket, only the dated snapshot prefixes
+    are listed, and then the contents of the newest one.
+
+    :param client: S3 client
+    :param bucket: bucket name
+    :return: files in the newest snapshot, or an empty list if there isn't one
+    """
+    paginator = client.get_paginator("list_objects_v2")
+    snapshot_dirs = [
+        common_prefix["Prefix"]
+        for page in paginator.paginate(
+            Bucket=bucket, Prefix=_SNAPSHOT_PREFIX, Delimiter="/"
+        )
+        for common_prefix in page.get("CommonPrefixes", [])
+        if _SNAPSHOT_DIR_PATTERN.fullmatch(common_prefix["Prefix"])
+    ]
+    if not snapshot_dirs:
+        return []
+
+    files = [
+        _SnapshotFile(
+            key=obj["Key"],
+            source=match.group("source"),
+            version=match.group("version"),
+            size=obj["Size"],
+            etag=obj["ETag"].strip('"'),
+        )
+        for page in paginator.paginate(Bucket=bucket, Prefix=max(snapshot_dirs))
+        for obj in page.get("Contents", [])
+        if (match := _SNAPSHOT_KEY_PATTERN.fullmatch(obj["Key"]))
+    ]
+    if not files:
+        return []
+    newest_version = max(f.version for f in files)
+    return [f for f in files if f.version == newest_version]
+
+
+def _get_etag_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.etag")
+
+
+def _is_up_to_date(path: Path, snapshot_file: _SnapshotFile) -> bool:
+    """Check whether a local copy matches a remote snapshot file
+
+    :param path: local copy location
+    :param snapshot_file: remote file
+    :return: ``True`` if the local copy has the same size, and was downloaded from an
+        object with the same ETag
+    """
+    etag_path = _get_etag_path(path)
+    return (
+        path.is_file()
+        and path.stat().st_size == snapshot_file.size
+        and etag_path.is_file()
+        and etag_path.read_text().strip() == snapshot_file.etag
+    )
+
+
+def _download(
+    client: BaseClient, bucket: str, snapshot_file: _SnapshotFile, path: Path
+) -> None:
+    """Download a snapshot file
+
+    The object is streamed to a temporary file alongside the destination, which is
+    only swapped in once complete, so an interrupted download never leaves a partial
+    file that looks valid.
+
+    :param client: S3 client
+    :param bucket: bucket name
+    :param snapshot_file: file to download
+    :param path: destination
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.part")
+    with tmp_path.open("wb") as f:
+        client.download_fileobj(bucket, snapshot_file.key, f)
+    tmp_path.replace(path)
+    _get_etag_path(path).write_text(snapshot_file.etag)
+
+
+def retrieve_snapshot(
+    client: BaseClient | None = None,
+    bucket: str = SNAPSHOT_BUCKET,
+    data_dir: Path | None = None,
+    max_workers: int = MAX_DOWNLOAD_WORKERS,
+) -> SnapshotRetrieval:
+    """Retrieve the most recent CDM snapshot files
+
+    Files are saved as-is (zipped) to ``<data_dir>/<source>/transformers/``, since
+    they can be loaded directly from the archive. Files are downloaded concurrently,
+    and any that are already present locally with a matching size and ETag are
+    skipped.
+
+    :param client: S3 client. Defaults to ``get_s3_client()``.
+    :param bucket: bucket name
+    :param data_dir: local data directory. Defaults to the configured one.
+    :param max_workers: max number of files to download at once
+    :return: snapshot version, and the local path to each source's file
+    :raise FileNotFoundError: if unable to find files matching the expected pattern
+        in the bucket
+    """
+    client = client or get_s3_client()
+    data_dir = data_dir or get_config().data_dir
+    snapshot_files = _list_latest_snapshot(client, bucket)
+    if not snapshot_files:
+        msg = f"Unable to locate files matching expected resource pattern in s3://{bucket}"
+        raise FileNotFoundError(msg)
+
+    paths = {
+        f.source: data_dir / f.source / "transformers" / Path(f.key).name
+        for f in snapshot_files
+    }
+    to_download = [f for f in snapshot_files if not _is_up_to_date(paths[f.source], f)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # consume results to propagate any errors
+        list(
+            executor.map(
+                lambda f: _download(client, bucket, f, paths[f.source]), to_download
+            )
+        )
+
+    downloaded = sorted(f.source for f in to_download)
+    skipped = sorted(paths.keys() - set(downloaded))
+    _logger.info(
+        "Retrieved snapshot %s: downloaded %s, already up to date: %s",
+        snapshot_files[0].version,
+        downloaded,
+        skipped,
+    )
+    return SnapshotRetrieval(
+        version=snapshot_files[0].version,
+        paths=paths,
+        downloaded=downloaded,
+        skipped=skipped,
+    )
@@ -1,7 +1,15 @@
 """Provide search services."""
 
+import asyncio
+import base64
+import json
 import logging
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
 
+from ga4gh.va_spec.base import Statement
+
+from metakb.config import get_config
 from metakb.normalizers import ViccNormalizers
 from metakb.repository.base import AbstractRepository
 from metakb.schemas.api import SearchResult, SearchTerm, SearchTermType
@@ -17,6 +25,77 @@ class PaginationParamError(Exception):
     """Raise for invalid pagination parameters."""
 
 
+# default max number of blocking normalizer lookups to run at once, across all searches.
+# Each worker thread opens its own normalizer DB connections (see ``ViccNormalizers``).
+NORMALIZER_MAX_WORKERS = 8
+
+# max number of variations to normalize at once within a single batch search
+BATCH_SEARCH_MAX_CONCURRENCY = 8
+
+
+def create_normalizer_executor() -> ThreadPoolExecutor:
+    """Create a thread pool for blocking normalizer lookups, to share between searches
+
+    The caller is responsible for shutting it down.
+
+    :return: executor, bounded by the ``normalizer_max_workers`` config setting
+    """
+    max_workers = get_config().normalizer_max_workers or NORMALIZER_MAX_WORKERS
+    return ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="metakb-normalizer"
+    )
+
+
+def _encode_cursor(after_id: str, data_version: str) -> str:
+    """Create an opaque pagination cursor
+
+    :param after_id: ID of the last statement on the current page
+    :param data_version: version of the data that the page was drawn from
+    :return: URL-safe cursor token
+    """
+    payload = json.dumps([after_id, data_version], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str, data_version: str) -> str:
+    """Unpack a pagination cursor
+
+    :param cursor: cursor token, as returned with a previous page of results
+    :param data_version: current version of the data
+    :return: ID of the last statement on the previous page
+    :raise PaginationParamError: if the cursor is malformed, or was issued for a
+        different version of the data (e.g. before a reload)
+    """
+    try:
+        after_id, cursor_data_version = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+    except (ValueError, TypeError) as e:
+        msg = f"Invalid cursor value: {cursor}"
+        raise PaginationParamError(msg) from e
+    if not isinstance(after_id, str) or cursor_data_version != data_version:
+        msg = (
+            "Cursor is invalid or out of date. Restart pagination from the first page."
+        )
+        raise PaginationParamError(msg)
+    return after_id
+
+
+def _get_next_cursor(
+    statements: list[Statement], limit: int | None, data_version: str | None
+) -> str | None:
+    """Get a cursor for the page following the given one, if there may be one
+
+    :param statements: current page of results, ordered by ID
+    :param limit: page size
+    :param data_version: version of the data that the page was drawn from
+    :return: cursor token, or ``None`` if the page wasn't full
+    """
+    if not limit or data_version is None or len(statements) < limit:
+        return None
+    return _encode_cursor(statements[-1].id, data_version)
+
+
 def _get_normalized_disease(normalizer: ViccNormalizers, disease: str) -> SearchTerm:
     """Get normalized disease concept.
 
@@ -63,6 +142,26 @@ def _get_normalized_therapy(normalizer: ViccNormalizers, therapy: str) -> Search
 _GA4GH_ID_LEN = 41  # VRS IDs are always 41 characters
 
 
+async def _normalize_in_executor(
+    get_normalized: Callable[[ViccNormalizers, str], SearchTerm],
+    normalizer: ViccNormalizers,
+    term: str,
+    executor: Executor | None,
+) -> SearchTerm:
+    """Run a blocking normalizer lookup in a worker thread, so that it doesn't stall
+    other requests on the event loop
+
+    :param get_normalized: normalization function, e.g. ``_get_normalized_gene``
+    :param normalizer: normalizer container instance
+    :param term: term to normalize
+    :param executor: executor to run the lookup in. If ``None``, use the event loop's
+        default executor.
+    :return: normalized search term
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, get_normalized, normalizer, term)
+
+
 async def _get_normalized_variation(
     normalizer: ViccNormalizers, variation: str
 ) -> SearchTerm:
@@ -89,6 +188,46 @@ async def _get_normalized_variation(
     )
 
 
+def _validate_pagination(start: int, limit: int | None, cursor: str | None) -> None:
+    """Check pagination params
+
+    :param start: index of first result to fetch
+    :param limit: max number of results to fetch
+    :param cursor: pagination cursor
+    :raise PaginationParamError: if either of ``start`` or ``limit`` is negative, or
+        if both ``start`` and ``cursor`` are given
+    """
+    if start < 0:
+        msg = f"Invalid start value: {start}. Must be nonnegative."
+        raise PaginationParamError(msg)
+    if isinstance(limit, int) and limit < 0:
+        msg = f"Invalid limit value: {limit}. Must be nonnegative."
+        raise PaginationParamError(msg)
+    if cursor is not None and start:
+        msg = "Provide at most one of start and cursor."
+        raise PaginationParamError(msg)
+
+
+async def _get_cursor_state(
+    repository: AbstractRepository, limit: int | None, cursor: str | None
+) -> tuple[str | None, str | None]:
+    """Get the state needed to resume from a pagination cursor, and to issue the next
+    one
+
+    :param repository: data repository instance
+    :param limit: page size
+    :param cursor: pagination cursor, if given
+    :return: current data version (or ``None`` if no cursor is needed), and ID to
+        resume after (or ``None`` if starting from the beginning)
+    :raise PaginationParamError: if the cursor is invalid or out of date
+    """
+    if cursor is None and not limit:
+        return None, None
+    data_version = await repository.get_data_version()
+    after_id = _decode_cursor(cursor, data_version) if cursor is not None else None
+    return data_version, after_id
+
+
 async def search_statements(
     repository: AbstractRepository,
     normalizer: ViccNormalizers,
@@ -99,6 +238,8 @@ async def search_statements(
     statement_id: str | None = None,
     start: int = 0,
     limit: int | None = None,
+    cursor: str | None = None,
+    executor: Executor | None = None,
 ) -> SearchResult:
     """Get nested statements from queried concepts that match all conditions provided.
     For example, if ``variation`` and ``therapy`` are provided, will return all
@@ -131,39 +272,51 @@ async def search_statements(
     :param start: Index of first result to fetch. Must be nonnegative.
     :param limit: Max number of results to fetch. Must be nonnegative. Revert to
         default defined at class initialization if not given.
+    :param cursor: Pagination cursor returned as ``next_cursor`` with a previous page
+        of results, to fetch the page after it. Unlike ``start``, the cost of fetching
+        a page doesn't grow with its depth. Can't be combined with ``start``.
+    :param executor: executor to run blocking therapy, disease, and gene lookups in,
+        e.g. one from :py:func:`create_normalizer_executor`. If not given, use the
+        event loop's default executor.
     :return: Results including terms with normalization, and all statements
     :raise EmptySearchError: if no search params given
-    :raise PaginationParamError: if either pagination param given is negative
+    :raise PaginationParamError: if either pagination param given is negative, or if
+        the cursor is invalid or out of date
     """
     if not any((variation, disease, therapy, gene, statement_id)):
         raise EmptySearchError
-    if start < 0:
-        msg = f"Invalid start value: {start}. Must be nonnegative."
-        raise PaginationParamError(msg)
-    if isinstance(limit, int) and limit < 0:
-        msg = f"Invalid limit value: {limit}. Must be nonnegative."
-        raise PaginationParamError(msg)
+    _validate_pagination(start, limit, cursor)
 
-    # attempt normalization of entity terms
-    search_terms = []
-    (
-        normalized_therapy,
-        normalized_disease,
-        normalized_variation,
-        normalized_gene,
-    ) = None, None, None, None
+    # attempt normalization of entity terms, all at once
+    normalizations: dict[SearchTermType, Awaitable[SearchTerm]] = {}
     if therapy:
-        normalized_therapy = _get_normalized_therapy(normalizer, therapy)
-        search_terms.append(normalized_therapy)
+        normalizations[SearchTermType.THERAPY] = _normalize_in_executor(
+            _get_normalized_therapy, normalizer, therapy, executor
+        )
     if disease:
-        normalized_disease = _get_normalized_disease(normalizer, disease)
-        search_terms.append(normalized_disease)
+        normalizations[SearchTermType.DISEASE] = _normalize_in_executor(
+            _get_normalized_disease, normalizer, disease, executor
+        )
     if variation:
-        normalized_variation = await _get_normalized_variation(normalizer, variation)
-        search_terms.append(normalized_variation)
+        normalizations[SearchTermType.VARIATION] = _get_normalized_variation(
+            normalizer, variation
+        )
     if gene:
-        normalized_gene = _get_normalized_gene(normalizer, gene)
-        search_terms.append(normalized_gene)
+        normalizations[SearchTermType.GENE] = _normalize_in_executor(
+            _get_normalized_gene, normalizer, gene, executor
+        )
+    normalized_terms = dict(
+        zip(
+            normalizations,
+            await asyncio.gather(*normalizations.values()),
+            strict=True,
+        )
+    )
+    search_terms = list(normalized_terms.values())
+    normalized_therapy = normalized_terms.get(SearchTermType.THERAPY)
+    normalized_disease = normalized_terms.get(SearchTermType.DISEASE)
+    normalized_variation = normalized_terms.get(SearchTermType.VARIATION)
+    normalized_gene = normalized_terms.get(SearchTermType.GENE)
 
     # Check that queried statement_id is valid
     statement, statement_term = None, None
@@ -190,22 +343,37 @@ async def search_statements(
             "One or more search terms failed to normalize/validate: %s",
             search_terms,
         )
-        return SearchResult(search_terms=search_terms, start=start, limit=limit)
+        return SearchResult(
+            search_terms=search_terms, start=start, limit=limit, cursor=cursor
+        )
 
     if statement:
-        statements = [statement]
-    else:
-        statements = await repository.search_statements(
-            [normalized_variation.resolved_id] if normalized_variation else None,
-            [normalized_gene.resolved_id] if normalized_gene else None,
-            [normalized_therapy.resolved_id] if normalized_therapy else None,
-            [normalized_disease.resolved_id] if normalized_disease else None,
-            statement_ids=None,
+        return SearchResult(
+            search_terms=search_terms,
             start=start,
             limit=limit,
+            cursor=cursor,
+            statements=[statement],
         )
+
+    data_version, after_id = await _get_cursor_state(repository, limit, cursor)
+    statements = await repository.search_statements(
+        [normalized_variation.resolved_id] if normalized_variation else None,
+        [normalized_gene.resolved_id] if normalized_gene else None,
+        [normalized_therapy.resolved_id] if normalized_therapy else None,
+        [normalized_disease.resolved_id] if normalized_disease else None,
+        statement_ids=None,
+        start=start,
+        limit=limit,
+        after_id=after_id,
+    )
     return SearchResult(
-        search_terms=search_terms, start=start, limit=limit, statements=statements
+        search_terms=search_terms,
+        start=start,
+        limit=limit,
+        cursor=cursor,
+        next_cursor=_get_next_cursor(statements, limit, data_version),
+        statements=statements,
     )
 
 
@@ -215,6 +383,7 @@ async def batch_search_statements(
     variations: list[str] | None = None,
     start: int = 0,
     limit: int | None = None,
+    cursor: str | None = None,
 ) -> SearchResult:
     """Fetch all statements associated with any of the provided variation description
     strings.
@@ -242,32 +411,47 @@ async def batch_search_statements(
     :param start: Index of first result to fetch. Must be nonnegative.
     :param limit: Max number of results to fetch. Must be nonnegative. Revert to
         default defined at class initialization if not given.
-    :return: response object including all matching statements
+    :param cursor: Pagination cursor returned as ``next_cursor`` with a previous page
+        of results, to fetch the page after it. Can't be combined with ``start``.
+    :return: response object including all matching statements. Variations are
+        normalized concurrently, up to ``BATCH_SEARCH_MAX_CONCURRENCY`` at a time.
     :raise ValueError: if ``start`` or ``limit`` are nonnegative
     :raise EmptySearchError: if no search params given
-    :raise PaginationParamError: if either pagination param given is negative
+    :raise PaginationParamError: if either pagination param given is negative, or if
+        the cursor is invalid or out of date
     """
-    if start < 0:
-        msg = f"Invalid start value: {start}. Must be nonnegative."
-        raise PaginationParamError(msg)
-    if isinstance(limit, int) and limit < 0:
-        msg = f"Invalid limit value: {limit}. Must be nonnegative."
-        raise PaginationParamError(msg)
+    _validate_pagination(start, limit, cursor)
 
     if not variations:
-        return SearchResult(search_terms=[], start=start, limit=limit, statements=[])
+        return SearchResult(
+            search_terms=[], start=start, limit=limit, cursor=cursor, statements=[]
+        )
 
-    search_terms = [
-        await _get_normalized_variation(normalizer, v) for v in set(variations)
-    ]
+    semaphore = asyncio.Semaphore(BATCH_SEARCH_MAX_CONCURRENCY)
+
+    async def _normalize(variation: str) -> SearchTerm:
+        async with semaphore:
+            return await _get_normalized_variation(normalizer, variation)
+
+    search_terms = await asyncio.gather(*(_normalize(v) for v in set(variations)))
     variation_ids = [t.resolved_id for t in search_terms]
     if not all(variation_ids):
         return SearchResult(
-            search_terms=search_terms, start=start, limit=limit, statements=[]
+            search_terms=search_terms,
+            start=start,
+            limit=limit,
+            cursor=cursor,
+            statements=[],
         )
+    data_version, after_id = await _get_cursor_state(repository, limit, cursor)
     statements = await repository.search_statements(
-        variation_ids=variation_ids, start=start, limit=limit
+        variation_ids=variation_ids, start=start, limit=limit, after_id=after_id
     )
     return SearchResult(
-        search_terms=search_terms, start=start, limit=limit, statements=statements
+        search_terms=search_terms,
+        start=start,
+        limit=limit,
+        cursor=cursor,
+        next_cursor=_get_next_cursor(statements, limit, data_version),
+        statements=statements,
     )
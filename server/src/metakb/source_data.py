@@ -4,27 +4,188 @@ This class is useful across different parts of the ingest pipeline for standardi
 how files are saved, where they're located, etc.
 """
 
+import gzip
+import io
+import json
+import struct
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from pathlib import Path
 from shutil import copy2
-from typing import ClassVar
+from typing import Any, BinaryIO, ClassVar, Literal, TextIO
+from zipfile import ZipFile
 
-from pydantic import BaseModel
+from ga4gh.va_spec.base import Statement
+from pydantic import BaseModel, Field, TypeAdapter
 
 from metakb.config import get_config
-from metakb.schemas.app import SourceName
+from metakb.schemas.app import ArtifactCompression, CdmFormat, SourceName
 from metakb.schemas.data import TransformedData
 
+# file extension for binary CDM files
+BINARY_CDM_SUFFIX = ".cdmb"
+
+# bump whenever the layout of binary CDM files changes
+BINARY_CDM_FORMAT_VERSION = 2
+
+# binary CDM files start with this, followed by a JSON header and then records. Each
+# header and record is prefixed by its length.
+_BINARY_CDM_MAGIC = b"METAKB-CDM\n"
+_BINARY_CDM_LENGTH = struct.Struct(">Q")
+
+# max number of statements per binary CDM record. Each record is read into memory at
+# once.
+_BINARY_CDM_RECORD_SIZE = 1000
+
+_STATEMENTS_ADAPTER = TypeAdapter(list[Statement])
+
+
+class BinaryCdmVersionError(Exception):
+    """Raise if a binary CDM file was written in an incompatible layout"""
+
+
+def _get_binary_cdm_header() -> dict[str, Any]:
+    """Get header identifying the layout of a binary CDM file
+
+    :return: header contents
+    """
+    return {"format_version": BINARY_CDM_FORMAT_VERSION}
+
+
+def _write_block(f: BinaryIO, block: bytes) -> None:
+    f.write(_BINARY_CDM_LENGTH.pack(len(block)))
+    f.write(block)
+
+
+def _read_block(f: BinaryIO) -> bytes | None:
+    """Read a single length-prefixed block
+
+    :param f: binary file handle
+    :return: block contents, or ``None`` at end of file
+    :raise ValueError: if the file is truncated
+    """
+    prefix = f.read(_BINARY_CDM_LENGTH.size)
+    if not prefix:
+        return None
+    if len(prefix) == _BINARY_CDM_LENGTH.size:
+        (length,) = _BINARY_CDM_LENGTH.unpack(prefix)
+        block = f.read(length)
+        if len(block) == length:
+            return block
+    msg = f"Binary CDM file is truncated: {f.name}"
+    raise ValueError(msg)
+
+
+def write_binary_cdm(path: Path, transformed_data: TransformedData) -> None:
+    """Write transformed data in the binary CDM format
+
+    Each record holds the name of a ``TransformedData`` field, a newline, and then a
+    JSON array of up to ``_BINARY_CDM_RECORD_SIZE`` of its statements. Records are
+    length-prefixed, so reading them back needs no incremental JSON parsing in Python:
+    each record's statements are parsed and validated at once by pydantic, and records
+    that aren't needed are skipped without being parsed at all. Files only contain
+    data, so they're as safe to read as JSON CDM files.
+
+    :param path: destination path, conventionally ending in ``BINARY_CDM_SUFFIX``
+    :param transformed_data: data to write
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(_BINARY_CDM_MAGIC)
+        _write_block(f, json.dumps(_get_binary_cdm_header()).encode())
+        for field_name in TransformedData.model_fields:
+            statements = getattr(transformed_data, field_name)
+            for i in range(0, len(statements), _BINARY_CDM_RECORD_SIZE):
+                payload = _STATEMENTS_ADAPTER.dump_json(
+                    statements[i : i + _BINARY_CDM_RECORD_SIZE], exclude_none=True
+                )
+                _write_block(f, field_name.encode() + b"\n" + payload)
+
+
+def _iter_binary_cdm_records(
+    path: Path, field_names: set[str]
+) -> Iterator[tuple[str, list[Statement]]]:
+    """Read records from a binary CDM file
+
+    :param path: path to file written by ``write_binary_cdm()``
+    :param field_names: ``TransformedData`` fields to read records for. Records for
+        other fields are skipped without being parsed.
+    :return: iterator over ``(TransformedData field name, statements)`` records
+    :raise ValueError: if the file isn't a complete binary CDM file
+    :raise BinaryCdmVersionError: if the file was written in an incompatible layout
+    """
+    with path.open("rb") as f:
+        if f.read(len(_BINARY_CDM_MAGIC)) != _BINARY_CDM_MAGIC:
+            msg = f"Not a binary CDM file: {path}"
+            raise ValueError(msg)
+        header = json.loads(_read_block(f) or b"{}")
+        if header != (expected := _get_binary_cdm_header()):
+            msg = f"{path} was written with {header}, but reading it requires {expected}. Regenerate it with `metakb transform`."
+            raise BinaryCdmVersionError(msg)
+        while (block := _read_block(f)) is not None:
+            field_name, _, payload = block.partition(b"\n")
+            if field_name.decode() in field_names:
+                yield field_name.decode(), _STATEMENTS_ADAPTER.validate_json(payload)
+
+
+def open_artifact(path: Path, mode: Literal["r", "w"] = "r") -> TextIO:
+    """Open a JSON artifact as text, streaming (de)compression based on its extension
+
+    Supported extensions are ``.gz``, ``.zst`` (requires the ``zstandard`` package,
+    e.g. via ``pip install metakb[zstd]``), and, for reading only, ``.zip`` archives
+    containing a single file. Anything else is treated as uncompressed.
+
+    :param path: path to artifact
+    :param mode: ``"r"`` to read or ``"w"`` to write
+    :return: text file handle
+    :raise ValueError: if attempting to write a ``.zip`` file, or to read one that
+        doesn't contain exactly one file
+    :raise ImportError: if ``zstandard`` is needed but not installed
+    """
+    if path.suffix == ".gz":
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    if path.suffix == ".zst":
+        try:
+            import zstandard  # noqa: PLC0415
+        except ImportError as e:
+            msg = "zstandard is required for .zst files. Install with `pip install metakb[zstd]`."
+            raise ImportError(msg) from e
+        return zstandard.open(path, f"{mode}t", encoding="utf-8")
+    if path.suffix == ".zip":
+        if mode != "r":
+            msg = f"Writing zip archives isn't supported: {path}"
+            raise ValueError(msg)
+        # the member keeps the underlying file open until it's closed itself
+        with ZipFile(path) as archive:
+            names = archive.namelist()
+            if len(names) != 1:
+                msg = f"Expected exactly one file in {path}, found {len(names)}"
+                raise ValueError(msg)
+            return io.TextIOWrapper(archive.open(names[0]), encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
 
 class SourceDataStore(BaseModel):
     """Manage on-disk storage locations for source harvest and transform artifacts."""
 
     TIMESTAMP_FMT: ClassVar[str] = "%Y%m%d%H%M%S"
+    # extensions of complete CDM files, as opposed to e.g. in-progress downloads
+    CDM_SUFFIXES: ClassVar[tuple[str, ...]] = (
+        ".json",
+        ".json.gz",
+        ".json.zst",
+        ".json.zip",
+        BINARY_CDM_SUFFIX,
+    )
     _FILENAME_PART_COUNT: ClassVar[int] = 3
 
     src_name: SourceName
     harvested_dir: Path | None = None
     transformed_dir: Path | None = None
+    compression: ArtifactCompression = Field(
+        default_factory=lambda: get_config().artifact_compression
+    )
+    cdm_format: CdmFormat = Field(default_factory=lambda: get_config().cdm_format)
 
     def model_post_init(self, __context) -> None:  # noqa: ANN001
         """Ensure path existence/validity after pydantic validation happens"""
@@ -58,10 +219,11 @@ class SourceDataStore(BaseModel):
     def _parse_timestamp(cls, path: Path) -> datetime | None:
         """Parse a timestamp from a MetaKB-managed filename.
 
-        :param path: File path whose stem should contain a trailing timestamp.
+        :param path: File path whose name, up to the first extension, should contain
+            a trailing timestamp. E.g. ``moa_cdm_20250101000000.json.gz``.
         :returns: Parsed UTC timestamp, or ``None`` if parsing fails.
         """
-        parts = path.stem.split("_")
+        parts = path.name.split(".", 1)[0].split("_")
         if len(parts) < cls._FILENAME_PART_COUNT:
             return None
 
@@ -80,11 +242,14 @@ class SourceDataStore(BaseModel):
         return datetime.now(UTC).strftime(cls.TIMESTAMP_FMT)
 
     @classmethod
-    def _get_latest_file(cls, directory: Path, prefix: str) -> Path:
+    def _get_latest_file(
+        cls, directory: Path, prefix: str, suffixes: tuple[str, ...] | None = None
+    ) -> Path:
         """Return the most recent file in ``directory`` matching ``prefix``.
 
         :param directory: Directory containing candidate files.
         :param prefix: Filename prefix ending in an underscore.
+        :param suffixes: If given, only consider files with one of these extensions.
         :returns: Path to the most recent matching file.
         :raise FileNotFoundError: If no valid matching files are found.
         """
@@ -93,6 +258,8 @@ class SourceDataStore(BaseModel):
         for path in directory.glob(f"{prefix}*"):
             if not path.is_file():
                 continue
+            if suffixes and not path.name.endswith(suffixes):
+                continue
             timestamp = cls._parse_timestamp(path)
             if timestamp is not None:
                 candidates.append((path, timestamp))
@@ -105,13 +272,16 @@ class SourceDataStore(BaseModel):
 
     @staticmethod
     def _write_text(path: Path, data: str) -> None:
-        """Write text data to disk.
+        """Write text data to disk, compressing it as it's written if the path has a
+        compressed extension (see :func:`open_artifact`).
 
         :param path: Destination path.
         :param data: Text to write.
         """
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(f"{data}\n", encoding="utf-8")
+        with open_artifact(path, "w") as f:
+            f.write(data)
+            f.write("\n")
 
     def _build_harvested_path(self, suffix: str) -> Path:
         """Construct a timestamped harvested artifact path.
@@ -155,22 +325,26 @@ class SourceDataStore(BaseModel):
 
             <src_name>_cdm_<timestamp><suffix>
 
-        where ``<timestamp>`` matches :attr:`TIMESTAMP_FMT`.
+        where ``<timestamp>`` matches :attr:`TIMESTAMP_FMT` and ``<suffix>`` is one
+        of :attr:`CDM_SUFFIXES`.
 
         :returns: Path to the most recent transformed file.
         :raise FileNotFoundError: If no matching transformed files are found.
         """
         prefix = f"{self.src_name}_cdm_"
-        return self._get_latest_file(self._get_transformed_dir(), prefix)
+        return self._get_latest_file(
+            self._get_transformed_dir(), prefix, self.CDM_SUFFIXES
+        )
 
     def save_harvested_data(self, harvested_data: BaseModel) -> Path:
-        """Serialize and save harvested data as JSON.
+        """Serialize and save harvested data as JSON, compressed according to
+        :attr:`compression`.
 
         :param harvested_data: Harvested data object to serialize and save.
         :returns: Path written.
         """
         harvested_json = harvested_data.model_dump_json(exclude_none=True)
-        path = self._build_harvested_path(".json")
+        path = self._build_harvested_path(f".json{self.compression.suffix}")
         self._write_text(path, harvested_json)
         return path
 
@@ -196,12 +370,185 @@ class SourceDataStore(BaseModel):
         return destination
 
     def save_cdm(self, transformed_data: TransformedData) -> Path:
-        """Serialize and save transformed data as JSON.
+        """Serialize and save transformed data in :attr:`cdm_format`. JSON is
+        compressed according to :attr:`compression`.
 
         :param transformed_data: Transformed data object to serialize and save.
         :returns: Path written.
         """
+        if self.cdm_format == CdmFormat.BINARY:
+            path = self._build_transformed_path(BINARY_CDM_SUFFIX)
+            write_binary_cdm(path, transformed_data)
+            return path
+
         cdm_json = transformed_data.model_dump_json(exclude_none=True)
-        path = self._build_transformed_path(".json")
+        path = self._build_transformed_path(f".json{self.compression.suffix}")
         self._write_text(path, cdm_json)
         return path
+
+
+# number of characters to read from a file at a time when streaming JSON
+_STREAM_READ_SIZE = 1 << 20
+
+_JSON_WHITESPACE = " \t\n\r"
+
+
+class _StreamingJsonReader:
+    """Incrementally walk the top-level structure of a JSON document.
+
+    Only arrays and objects are walked element-by-element; each element (or any other
+    value) is decoded whole. This keeps memory use proportional to the largest single
+    element, rather than to the whole document.
+    """
+
+    def __init__(self, f: TextIO) -> None:
+        """Initialize reader
+
+        :param f: text file handle, positioned at the start of a JSON value
+        """
+        self._f = f
+        self._buffer = ""
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read more input into the buffer, discarding anything already consumed
+
+        :return: ``False`` if there's no more input
+        """
+        # read at least as much as is currently buffered, so that re-decoding a large
+        # value stays linear overall
+        chunk = self._f.read(max(_STREAM_READ_SIZE, len(self._buffer) - self._pos))
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and get the next character, without consuming it
+
+        :return: next non-whitespace character
+        :raise ValueError: if input ends first
+        """
+        while True:
+            while (
+                self._pos < len(self._buffer)
+                and self._buffer[self._pos] in _JSON_WHITESPACE
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                msg = "Unexpected end of JSON input"
+                raise ValueError(msg)
+
+    def _expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be ``char``
+
+        :raise ValueError: if next character is something else
+        """
+        if (found := self._peek()) != char:
+            msg = f"Expected '{char}' in JSON input, found '{found}'"
+            raise ValueError(msg)
+        self._pos += 1
+
+    def _consume_separator(self, closing: str) -> bool:
+        """Consume the separator after an array element or object member
+
+        :param closing: closing bracket of the enclosing container
+        :return: ``True`` if there are more elements, ``False`` if the container ended
+        """
+        if self._peek() == ",":
+            self._pos += 1
+            return True
+        self._expect(closing)
+        return False
+
+    def decode(self) -> Any:  # noqa: ANN401
+        """Decode the next complete value
+
+        :return: decoded value
+        :raise json.JSONDecodeError: if input is invalid
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # may just be incomplete -- only give up once the input is exhausted
+                if not self._fill():
+                    raise
+                continue
+            # a value running up to the end of the buffer (e.g. a number) may be cut off
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """Decode the next value, which must be an array, one element at a time
+
+        :return: iterator over decoded elements
+        """
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.decode()
+            if not self._consume_separator("]"):
+                return
+
+    def iter_object_keys(self) -> Iterator[str]:
+        """Walk the next value, which must be an object, one member at a time
+
+        The caller MUST consume each member's value (e.g. via ``decode()``,
+        ``iter_array()``, or ``skip()``) before advancing to the next key.
+
+        :return: iterator over object keys
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.decode()
+            self._expect(":")
+            yield key
+            if not self._consume_separator("}"):
+                return
+
+    def skip(self) -> None:
+        """Consume the next value without keeping it around"""
+        if self._peek() == "[":
+            for _ in self.iter_array():
+                pass
+        else:
+            self.decode()
+
+
+def iter_cdm_assertions(path: Path) -> Iterator[Statement]:
+    """Stream assertions from a transformed CDM file one at a time.
+
+    Equivalent to ``TransformedData(**json.load(f)).assertions``, but only one
+    assertion is held in memory at once, regardless of file size.
+
+    :param path: path to CDM file (see ``SourceDataStore.save_cdm()``). JSON files
+        may be compressed or archived (see ``open_artifact()``). Files ending in
+        ``BINARY_CDM_SUFFIX`` are read as binary CDM files, a record at a time.
+    :return: iterator over validated assertions
+    """
+    if path.suffix == BINARY_CDM_SUFFIX:
+        for _, statements in _iter_binary_cdm_records(path, {"assertions"}):
+            yield from statements
+        return
+
+    with open_artifact(path) as f:
+        reader = _StreamingJsonReader(f)
+        for key in reader.iter_object_keys():
+            if key == "assertions":
+                for assertion in reader.iter_array():
+                    yield Statement(**assertion)
+            else:
+                reader.skip()
@@ -20,6 +20,7 @@ from tqdm import tqdm
 
 from metakb.harvesters.fda_poda import FdaPodaHarvestedData
 from metakb.schemas.data import TransformedData
+from metakb.source_data import open_artifact
 from metakb.transformers import catvars as build_catvars
 from metakb.transformers import phenotypes
 from metakb.transformers.base import Transformer
@@ -45,7 +46,7 @@ class FdaPodaTransformer(Transformer):
         :param harvested_data: FDA-PODA harvested data
         :return: transformed statements
         """
-        with harvested_data_path.open() as f:
+        with open_artifact(harvested_data_path) as f:
             harvested_data = FdaPodaHarvestedData(**json.load(f))
         statements: list[Statement] = []
         assertions: dict[str, Statement] = {}
@@ -32,6 +32,7 @@ from ga4gh.vrs.models import Allele
 from tqdm import tqdm
 
 from metakb.schemas.data import MoaHarvestedData, TransformedData
+from metakb.source_data import open_artifact
 from metakb.transformers import catvars as build_catvars
 from metakb.transformers.base import Transformer
 from metakb.transformers.identifiers import compute_combo_id
@@ -76,7 +77,7 @@ class MoaTransformer(Transformer):
 
         :param harvested_data_path: path to MOA harvested data
         """
-        with harvested_data_path.open() as f:
+        with open_artifact(harvested_data_path) as f:
             harvested_data = MoaHarvestedData(**json.load(f))
         docs_map = {}
         for source in harvested_data.sources:
@@ -0,0 +1,228 @@
+"""Test in-memory repository implementation."""
+
+import json
+from pathlib import Path
+
+import pytest
+from ga4gh.va_spec.base import Statement
+
+from metakb.repository.base import RepositoryStats
+from metakb.repository.memory_repository import InMemoryRepository
+from metakb.repository.neo4j_repository import _make_statement_node
+from metakb.transformers.methodology import merge_assertions
+
+
+@pytest.fixture
+def repository():
+    return InMemoryRepository()
+
+
+@pytest.fixture
+def assertions(test_data_dir: Path):
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+        return {k: Statement(**v) for k, v in data.items()}
+
+
+def _roundtrip(statement: Statement) -> Statement:
+    """Get a statement as it would look after a trip through the repository"""
+    return _make_statement_node(statement).to_gks()
+
+
+@pytest.mark.asyncio
+async def test_search_statements(repository: InMemoryRepository, assertions: dict):
+    for assertion_key in (
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ):
+        await repository.load_assertion(assertions[assertion_key])
+    braf_result = [_roundtrip(assertions["BRAF mutation"])]
+
+    assert (
+        await repository.search_statements(
+            statement_ids=["metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM"]
+        )
+        == braf_result
+    )
+    assert (
+        await repository.search_statements(
+            therapy_ids=["metakb.therapy:rxcui_1147220"],
+            gene_ids=["metakb.gene:hgnc_1097"],
+            disease_ids=["metakb.disease:ncit_C3224"],
+        )
+        == braf_result
+    )
+    # therapy group ID matches as well as member drug IDs
+    assert (
+        await repository.search_statements(
+            therapy_ids=["metakb.tg:JgptHcUAwUcXajKEtKy7elEoRLldjZN3"]
+        )
+        == braf_result
+    )
+    assert (
+        await repository.search_statements(
+            therapy_ids=["metakb.tg:JgptHcUAwUcXajKEtKy7elEoRLldjZN3"],
+            gene_ids=["metakb.gene:hgnc_1092"],
+        )
+        == []
+    )
+
+    gene_result = await repository.search_statements(gene_ids=["metakb.gene:hgnc_1092"])
+    assert [s.id for s in gene_result] == [
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"
+    ]
+    assert (
+        await repository.search_statements(
+            variation_ids=["ga4gh:VA.UAquUsb5z-WfBxmE_eqEu3txfseQoRqU"]
+        )
+        == gene_result
+    )
+
+    # contained evidence items are searchable too
+    assert [
+        s.id
+        for s in await repository.search_statements(
+            therapy_ids=["moa.drug:Vemurafenib"], disease_ids=["moa.disease:Melanoma"]
+        )
+    ] == ["moa.assertion:166"]
+
+    all_results = await repository.search_statements()
+    assert len(all_results) == 4
+    assert await repository.search_statements(start=1, limit=2) == all_results[1:3]
+    assert (
+        await repository.search_statements(after_id=all_results[1].id, limit=1)
+        == all_results[2:3]
+    )
+
+
+@pytest.mark.asyncio
+async def test_merged_assertion(repository: InMemoryRepository, assertions: dict):
+    """Test reloading an assertion after merging in new evidence"""
+    assertion_id = "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi"
+    await repository.load_assertion(
+        assertions["metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic"]
+    )
+    existing = await repository.get_statement(assertion_id)
+    merged = merge_assertions(
+        existing, assertions["metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_moa"]
+    )
+    # returned statements are copies, so merging doesn't touch stored data
+    assert await repository.get_statement(assertion_id) != merged
+
+    await repository.load_assertions([merged])
+    result = await repository.get_statement(assertion_id)
+    assert result == _roundtrip(merged)
+    assert {
+        item.id
+        for line in result.hasEvidenceLines
+        for item in line.hasEvidenceItems
+        if isinstance(item, Statement)
+    } == {"civic.eid:2506", "moa.assertion:151"}
+
+
+@pytest.mark.asyncio
+async def test_get_gene(repository: InMemoryRepository, assertions: dict):
+    assert await repository.get_gene("metakb.gene:hgnc_1097") is None
+    await repository.load_assertion(assertions["BRAF mutation"])
+    gene = await repository.get_gene("metakb.gene:hgnc_1097")
+    assert gene
+    assert gene.id == "metakb.gene:hgnc_1097"
+    assert gene.extensions[-1].name == "source_gene_objects"
+    assert {g.id for g in gene.extensions[-1].value} == {
+        "metakb.gene:hgnc_1097",
+        "moa.gene:BRAF",
+    }
+
+
+@pytest.mark.asyncio
+async def test_first_seen_entities(repository: InMemoryRepository, assertions: dict):
+    """Test that statements reference the first-seen copy of each shared entity, as
+    they do in the graph
+    """
+    braf = assertions["BRAF mutation"]
+    await repository.load_assertion(braf)
+    changed = braf.model_copy(deep=True)
+    changed.id = "metakb.assertion:changed"
+    changed.proposition.geneContextQualifier.name = "changed"
+    changed.proposition.subjectVariant.name = "changed"
+    changed.proposition.objectTherapeutic.root.therapies[0].name = "changed"
+    await repository.load_assertion(changed)
+
+    stored = await repository.get_statement(changed.id)
+    assert stored
+    expected = _roundtrip(braf).proposition
+    assert stored.proposition.geneContextQualifier == expected.geneContextQualifier
+    assert stored.proposition.subjectVariant == expected.subjectVariant
+    assert stored.proposition.objectTherapeutic == expected.objectTherapeutic
+
+
+@pytest.mark.asyncio
+async def test_get_stats(repository: InMemoryRepository, assertions: dict):
+    for assertion_key in (
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ):
+        await repository.load_assertion(assertions[assertion_key])
+
+    assert await repository.get_stats() == RepositoryStats(
+        num_genes=2,
+        num_drugs=2,
+        num_diseases=2,
+        num_variations=2,
+        num_source_statements=2,
+        num_documents=5,
+        num_metakb_assertions=2,
+    )
+    assert await repository.get_all_assertion_ids() == [
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+        "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM",
+    ]
+
+    assert await repository.get_data_version() == ""
+    data_version = await repository.update_data_version()
+    assert data_version
+    assert await repository.get_data_version() == data_version
+    assert await repository.update_data_version() != data_version
+
+    await repository.teardown_db()
+    assert await repository.get_all_assertion_ids() == []
+    assert await repository.get_data_version() == ""
+
+
+@pytest.mark.asyncio
+async def test_delete_assertions(repository: InMemoryRepository, assertions: dict):
+    for assertion_key in (
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ):
+        await repository.load_assertion(assertions[assertion_key])
+    await repository.set_assertion_hashes(
+        {
+            "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM": "abc",
+            "metakb.assertion:doesnotexist": "def",
+        }
+    )
+    assert await repository.get_assertion_hashes() == {
+        "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM": "abc"
+    }
+
+    await repository.delete_assertions(
+        ["metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM", "civic.eid:6034"]
+    )
+    assert await repository.get_all_assertion_ids() == [
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"
+    ]
+    assert await repository.get_assertion_hashes() == {}
+    # evidence items that nothing else cites are removed too
+    assert await repository.get_statement("moa.assertion:166") is None
+    assert (
+        await repository.search_statements(
+            therapy_ids=["moa.tg:LEJKS-FtGtGlrC9h7i3_e9nh0xWyWnzq"]
+        )
+        == []
+    )
+    # statements cited as evidence elsewhere are kept
+    assert await repository.get_statement("civic.eid:6034")
+    assert await repository.get_statement(
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"
+    ) == _roundtrip(assertions["metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"])
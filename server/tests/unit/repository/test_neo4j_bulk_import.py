@@ -0,0 +1,372 @@
+"""Test Neo4j bulk import file generation."""
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from ga4gh.va_spec.base import Statement
+
+from metakb.repository.neo4j_bulk_import import (
+    ARRAY_DELIMITER,
+    BulkImportGraph,
+    write_bulk_import_files,
+)
+from metakb.repository.neo4j_repository import (
+    Neo4jRepository,
+    _AssertionBatchParams,
+    get_driver,
+)
+from metakb.services.load_data import export_bulk_import
+from metakb.transformers.methodology import merge_assertions
+
+
+@pytest_asyncio.fixture
+async def repository():
+    """Provide a new repository session. Wipe all existing DB data and re-initialize."""
+    driver = get_driver()
+    session = driver.session()
+
+    repository = Neo4jRepository(session)
+    await repository.teardown_db()
+    await repository.initialize()
+
+    yield repository
+
+    await session.close()
+    await driver.close()
+
+
+@pytest.fixture
+def assertions(test_data_dir: Path):
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+        return {k: Statement(**v) for k, v in data.items()}
+
+
+@pytest.fixture
+def cdms(assertions: dict) -> list[list[Statement]]:
+    """Provide assertions split across two CDM files, with one that's in both"""
+    return [
+        [
+            assertions["metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_moa"],
+            assertions["BRAF mutation"],
+        ],
+        [
+            assertions["metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic"],
+            assertions["metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"],
+        ],
+    ]
+
+
+def _build_graph(cdms: list[list[Statement]]) -> BulkImportGraph:
+    graph = BulkImportGraph()
+    for cdm in cdms:
+        graph.load_entities(cdm)
+        graph.load_assertions(
+            [
+                merge_assertions(existing, a)
+                if (existing := graph.get_statement(a.id))
+                else a
+                for a in cdm
+            ]
+        )
+    return graph
+
+
+def _summarize_graph(
+    nodes: list[tuple[list[str], dict]], relationships: list[tuple[dict, str, dict]]
+) -> tuple[list, list]:
+    """Get a comparable summary of graph contents
+
+    Evidence line IDs are randomly generated, so they're ignored, and relationships to
+    evidence lines are only compared by type.
+    """
+
+    def _node_repr(labels: list[str], properties: dict) -> str:
+        if "EvidenceLine" in labels:
+            properties = {k: v for k, v in properties.items() if k != "id"}
+        return json.dumps([sorted(labels), properties], sort_keys=True)
+
+    return (
+        sorted(_node_repr(labels, props) for labels, props in nodes),
+        sorted(
+            json.dumps(
+                [start.get("id"), rel_type, end.get("id")]
+                if "metakb.evline" not in f"{start.get('id')}{end.get('id')}"
+                else [rel_type]
+            )
+            for start, rel_type, end in relationships
+        ),
+    )
+
+
+def test_bulk_import_graph(cdms: list[list[Statement]]):
+    """Test construction of in-memory graph"""
+    graph = _build_graph(cdms)
+
+    assertion = graph.nodes[
+        ("Statement", "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi")
+    ]
+    assert assertion.labels == {"Statement"}
+    assert assertion.properties["proposition_type"] == (
+        "VariantTherapeuticResponseProposition"
+    )
+    gene = graph.nodes[("Gene", "metakb.gene:hgnc_1097")]
+    assert gene.labels == {"Gene"}
+    assert gene.properties["id"] == "metakb.gene:hgnc_1097"
+    assert "aliases" not in gene.properties
+
+    # merged assertion keeps evidence from both files
+    evidence_items = {
+        end[1]
+        for start, rel_type, end in graph.relationships
+        if rel_type == "HAS_EVIDENCE_ITEM"
+    }
+    assert {"civic.eid:2506", "moa.assertion:151"} <= evidence_items
+
+    # evidence lines replaced on reload aren't left dangling
+    evidence_lines = [k for k in graph.nodes if k[0] == "EvidenceLine"]
+    assert len(evidence_lines) == len(
+        {
+            end
+            for _, rel_type, end in graph.relationships
+            if rel_type == "HAS_EVIDENCE_LINE"
+        }
+    )
+
+
+# param collections/fields holding nodes that are merged on ID, and their node groups
+_PARAM_NODE_GROUPS = {
+    "dac_catvars": "Variation",
+    "fcc_catvars": "Variation",
+    "text_catvars": "Variation",
+    "genes": "Gene",
+    "diseases": "Condition",
+    "phenotypes": "Condition",
+    "condition_sets": "Condition",
+    "drugs": "Therapeutic",
+    "therapy_groups": "Therapeutic",
+    "documents": "Document",
+    "strengths": "Strength",
+    "methods": "Method",
+    "statements": "Statement",
+    "has_constraint": "Constraint",
+    "has_defining_allele": "Variation",
+    "has_members": "Variation",
+    "has_location": "Location",
+    "has_therapies": "Therapeutic",
+    "conditions": "Condition",
+}
+
+# param fields that are made into relationships rather than properties
+_PARAM_RELATIONSHIP_FIELDS = {
+    "conditions",
+    "strength_id",
+    "statement_item_ids",
+    "evidence_line_item_ids",
+}
+
+
+def _get_param_properties(row: dict) -> dict:
+    return {
+        k: v
+        for k, v in row.items()
+        if v is not None
+        and not k.startswith("has_")
+        and k not in _PARAM_RELATIONSHIP_FIELDS
+    }
+
+
+def _check_param_nodes(graph: BulkImportGraph, group: str, rows: list[dict]) -> None:
+    for row in rows:
+        node = graph.nodes[(group, row["id"])]
+        assert node.properties == _get_param_properties(row), row["id"]
+        if group == "Statement":
+            # other fields reference entities loaded separately
+            continue
+        for name, value in row.items():
+            if name in _PARAM_NODE_GROUPS and value:
+                nested = value if isinstance(value, list) else [value]
+                _check_param_nodes(graph, _PARAM_NODE_GROUPS[name], nested)
+
+
+def test_bulk_import_graph_matches_params(cdms: list[list[Statement]], assertions):
+    """Test that nodes get the same properties as the batch load queries give them,
+    without needing a DB
+    """
+    cdm = [*cdms[0], assertions["metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"]]
+    graph = _build_graph([cdm])
+    params = _AssertionBatchParams()
+    for assertion in cdm:
+        params.add_assertion(assertion)
+
+    for name in vars(params):
+        if name in _PARAM_NODE_GROUPS:
+            rows = list(getattr(params, name).values())
+            _check_param_nodes(graph, _PARAM_NODE_GROUPS[name], rows)
+
+    # evidence line IDs are generated on each load, so only compare contents
+    evidence_lines = [
+        json.dumps(_get_param_properties(row) | {"id": None}, sort_keys=True)
+        for row in params.evidence_lines.values()
+    ]
+    assert sorted(evidence_lines) == sorted(
+        json.dumps(node.properties | {"id": None}, sort_keys=True)
+        for key, node in graph.nodes.items()
+        if key[0] == "EvidenceLine"
+    )
+
+
+def test_write_bulk_import_files(cdms: list[list[Statement]], tmp_path: Path):
+    """Test writing of import CSVs"""
+    graph = _build_graph(cdms)
+    files = write_bulk_import_files(graph, tmp_path)
+
+    import_ids = set()
+    for path in files.nodes:
+        with path.open() as f:
+            rows = list(csv.DictReader(f))
+        assert rows
+        for row in rows:
+            import_ids.add(row[":ID"])
+        if path.name == "nodes_Document.csv":
+            assert "urls:string[]" in rows[0]
+            document = next(r for r in rows if r["id"] == "doi:10.5281/zenodo.15675452")
+            assert document[":LABEL"] == "Document"
+        elif path.name == "nodes_Location_SequenceLocation.csv":
+            assert "start:long" in rows[0]
+        elif path.name == "nodes_Drug_Therapeutic.csv":
+            assert rows[0][":LABEL"] == f"Drug{ARRAY_DELIMITER}Therapeutic"
+        elif path.name == "nodes_DataVersion.csv":
+            assert len(rows) == 1
+            data_version = rows[0]["version"]
+    # graph nodes, plus the data version
+    assert len(import_ids) == len(graph.nodes) + 1
+
+    # each export gets a new data version
+    files = write_bulk_import_files(graph, tmp_path)
+    with (tmp_path / "nodes_DataVersion.csv").open() as f:
+        assert next(csv.DictReader(f))["version"] != data_version
+
+    with files.relationships[0].open() as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(list(graph.relationships))
+    for row in rows:
+        assert row[":START_ID"] in import_ids
+        assert row[":END_ID"] in import_ids
+
+    assert "CREATE CONSTRAINT" in files.schema.read_text()
+
+
+def _get_evidence_line_links(tmp_path: Path, cdms: list[list[Statement]]) -> dict:
+    """Export CDM files, and count statements linked to each exported evidence line"""
+    paths = []
+    for i, cdm in enumerate(cdms):
+        path = tmp_path / f"cdm_{i}.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "assertions": [
+                        a.model_dump(mode="json", exclude_none=True) for a in cdm
+                    ]
+                }
+            )
+        )
+        paths.append(path)
+    files = export_bulk_import(paths, tmp_path / f"import_{len(cdms)}")
+
+    links = {}
+    for path in files.nodes:
+        if path.name.startswith("nodes_EvidenceLine"):
+            with path.open() as f:
+                links.update({row[":ID"]: 0 for row in csv.DictReader(f)})
+    for path in files.relationships:
+        with path.open() as f:
+            for row in csv.DictReader(f):
+                if row[":TYPE"] == "HAS_EVIDENCE_LINE" and row[":END_ID"] in links:
+                    links[row[":END_ID"]] += 1
+    return links
+
+
+def test_export_bulk_import_repeated_assertion(tmp_path: Path, assertions):
+    """Test that an assertion repeated within one file is exported the same as one
+    repeated across files
+    """
+    moa = assertions["metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_moa"]
+    civic = assertions["metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic"]
+    one_file_links = _get_evidence_line_links(tmp_path, [[moa, civic]])
+    two_file_links = _get_evidence_line_links(tmp_path, [[moa], [civic]])
+    assert len(one_file_links) == len(two_file_links) == 2
+    assert all(one_file_links.values())
+    assert all(two_file_links.values())
+
+
+def test_write_bulk_import_files_types(tmp_path: Path):
+    """Test that columns are typed so that property values import unchanged"""
+    graph = BulkImportGraph()
+    for gene_id, properties in (
+        ("a", {"aliases": [], "score": 1, "flags": [True, False]}),
+        ("b", {"aliases": ["B"], "score": 0.5, "weights": [0.25, 1e-05]}),
+        ("c", {"aliases": [], "score": 2}),
+    ):
+        graph._merge_node(("Gene", gene_id), ("Gene",), properties=properties)
+    files = write_bulk_import_files(graph, tmp_path)
+
+    # integer and float scores can't share a column
+    assert [p.name for p in files.nodes] == [
+        "nodes_Gene.csv",
+        "nodes_Gene_1.csv",
+        "nodes_DataVersion.csv",
+    ]
+    lines = files.nodes[0].read_text().splitlines()
+    assert lines[0] == ":ID,:LABEL,aliases:string[],flags:boolean[],id,score:long"
+    # empty lists are quoted, so they're imported as empty arrays
+    assert lines[1] == f'0,"Gene","","true{ARRAY_DELIMITER}false","a",1'
+    assert lines[2] == '2,"Gene","",,"c",2'
+    lines = files.nodes[1].read_text().splitlines()
+    assert lines[0] == ":ID,:LABEL,aliases:string[],id,score:double,weights:double[]"
+    assert lines[1] == f'1,"Gene","B","b",0.5,"0.25{ARRAY_DELIMITER}1e-05"'
+
+    graph._merge_node(("Gene", "d"), ("Gene",), properties={"aliases": ["D", 1]})
+    with pytest.raises(ValueError, match="mixed"):
+        write_bulk_import_files(graph, tmp_path)
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_bulk_import_graph_matches_load(
+    repository: Neo4jRepository, cdms: list[list[Statement]]
+):
+    """Test that the in-memory graph matches what's produced by loading normally"""
+    for cdm in cdms:
+        await repository.load_entities(cdm)
+        existing = {
+            s.id: s for s in await repository.get_statements([a.id for a in cdm])
+        }
+        await repository.load_assertions(
+            [
+                merge_assertions(existing[a.id], a) if a.id in existing else a
+                for a in cdm
+            ],
+            include_entities=False,
+        )
+
+    result = await repository.session.run(
+        "MATCH (n) RETURN labels(n) AS labels, properties(n) AS props"
+    )
+    db_nodes = [(r["labels"], r["props"]) async for r in result]
+    result = await repository.session.run(
+        "MATCH (a)-[r]->(b) RETURN properties(a) AS a, type(r) AS r, properties(b) AS b"
+    )
+    db_relationships = [(r["a"], r["r"], r["b"]) async for r in result]
+
+    graph = _build_graph(cdms)
+    assert _summarize_graph(db_nodes, db_relationships) == _summarize_graph(
+        [(list(n.labels), n.properties) for n in graph.nodes.values()],
+        [
+            (graph.nodes[start].properties, rel_type, graph.nodes[end].properties)
+            for start, rel_type, end in graph.relationships
+        ],
+    )
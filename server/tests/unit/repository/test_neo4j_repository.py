@@ -8,7 +8,13 @@ import pytest_asyncio
 from ga4gh.va_spec.base import Statement
 
 from metakb.repository.base import RepositoryStats
-from metakb.repository.neo4j_repository import Neo4jRepository, get_driver
+from metakb.repository.neo4j_repository import (
+    Neo4jRepository,
+    _AssertionBatchParams,
+    get_driver,
+)
+from metakb.repository.query_metrics import QueryMetrics
+from metakb.repository.statement_cache import StatementCache
 
 
 @pytest_asyncio.fixture
@@ -172,6 +178,27 @@ async def test_assertion_update(repository: Neo4jRepository, assertions: dict):
     # TODO
 
 
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_reload_replaces_evidence_lines(
+    repository: Neo4jRepository, assertions: dict
+):
+    """Test that reloading an assertion with new evidence lines drops the old ones"""
+    assertion = assertions["metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic"]
+    await repository.load_assertion(assertion)
+
+    reloaded = assertion.model_copy(deep=True)
+    reloaded.hasEvidenceLines[0].id = "metakb.evline:replacement"
+    await repository.load_assertions([reloaded])
+
+    result = await repository.session.run(
+        "MATCH (el:EvidenceLine) RETURN collect(el.id) AS ids"
+    )
+    record = await result.single()
+    assert record["ids"] == ["metakb.evline:replacement"]
+    assert await repository.get_statement(assertion.id) == reloaded
+
+
 @pytest.mark.ci_only
 @pytest.mark.asyncio
 async def test_diagnostic_assertion(repository: Neo4jRepository, assertions: dict):
@@ -240,3 +267,257 @@ async def test_get_all_assertion_ids(repository: Neo4jRepository, assertions: di
         "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM",
         "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
     }
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_get_statements(repository: Neo4jRepository, assertions: dict):
+    statement_ids = [
+        "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+        "civic.eid:6034",
+        "metakb.assertion:doesnotexist",
+    ]
+    assert await repository.get_existing_assertion_ids(statement_ids) == set()
+    assert await repository.get_statements(statement_ids) == []
+
+    for assertion_key in (
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ):
+        await repository.load_assertion(assertions[assertion_key])
+
+    assert await repository.get_existing_assertion_ids(statement_ids) == set(
+        statement_ids[:3]
+    )
+    statements = await repository.get_statements(statement_ids)
+    assert {s.id for s in statements} == set(statement_ids[:3])
+    for statement in statements:
+        assert statement == await repository.get_statement(statement.id)
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_search_statements_pagination(
+    repository: Neo4jRepository, assertions: dict
+):
+    for assertion_key in (
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ):
+        await repository.load_assertion(assertions[assertion_key])
+
+    all_results = await repository.search_statements()
+    assert [s.id for s in all_results] == sorted(s.id for s in all_results)
+    assert await repository.search_statements(start=1, limit=2) == all_results[1:3]
+    assert await repository.search_statements(start=len(all_results)) == []
+
+    gene_results = await repository.search_statements(
+        gene_ids=["metakb.gene:hgnc_1097"]
+    )
+    assert gene_results
+    assert (
+        await repository.search_statements(gene_ids=["metakb.gene:hgnc_1097"], limit=1)
+        == gene_results[:1]
+    )
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_evidence_resolution_queries(
+    repository: Neo4jRepository, assertions: dict
+):
+    """Evidence trees should be resolved in a fixed number of queries"""
+    for assertion_key in (
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ):
+        await repository.load_assertion(assertions[assertion_key])
+    # evidence items aren't part of the page, so need to be fetched separately
+    statement_ids = [
+        "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ]
+    expected = await repository.search_statements(statement_ids=statement_ids)
+
+    repository.query_metrics = QueryMetrics()
+    results = await repository._hydrate_statements(statement_ids)
+    assert repository._get_statements_from_results(results) == expected
+    counts = {s.name: s.count for s in repository.query_metrics.summarize()}
+    assert counts == {"hydrate_statements": 2, "get_evidence_item_ids": 1}
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_statement_documents(repository: Neo4jRepository, assertions: dict):
+    """Statements should be read from documents once they're refreshed, and rebuilt
+    from the graph if they don't have a current one
+    """
+    await repository.load_assertion(assertions["BRAF mutation"])
+    statement_ids = ["metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM"]
+    results = await repository._hydrate_statements(statement_ids)
+    expected = repository._get_statements_from_results(results)
+
+    # not yet refreshed
+    repository.query_metrics = QueryMetrics()
+    assert await repository.search_statements(statement_ids=statement_ids) == expected
+    counts = {s.name: s.count for s in repository.query_metrics.summarize()}
+    assert counts["hydrate_statements"] == 2
+
+    assert await repository.refresh_statement_documents() == 2
+    assert await repository.refresh_statement_documents() == 0
+    repository.query_metrics = QueryMetrics()
+    assert await repository.search_statements(statement_ids=statement_ids) == expected
+    counts = {s.name: s.count for s in repository.query_metrics.summarize()}
+    assert counts == {"search_statement_ids": 1, "get_statement_documents": 1}
+
+    # reloading an evidence item invalidates the documents of statements citing it
+    evidence_item = assertions["BRAF mutation"].hasEvidenceLines[0].hasEvidenceItems[0]
+    await repository.load_assertion(evidence_item)
+    assert await repository.refresh_statement_documents() == 2
+    repository.query_metrics = QueryMetrics()
+    assert await repository.search_statements(statement_ids=statement_ids) == expected
+    counts = {s.name: s.count for s in repository.query_metrics.summarize()}
+    assert counts == {"search_statement_ids": 1, "get_statement_documents": 1}
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_statement_cache(repository: Neo4jRepository, assertions: dict):
+    await repository.load_assertion(assertions["BRAF mutation"])
+    await repository.update_data_version()
+    expected = await repository.search_statements()
+
+    repository.statement_cache = StatementCache()
+    assert await repository.search_statements() == expected
+    repository.query_metrics = QueryMetrics()
+    assert await repository.search_statements() == expected
+    counts = {s.name: s.count for s in repository.query_metrics.summarize()}
+    assert "get_statement_documents" not in counts
+
+    # reloading invalidates cached statements
+    await repository.update_data_version()
+    assert await repository.search_statements() == expected
+    assert repository.statement_cache.summarize().invalidations == 1
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_delete_assertions(repository: Neo4jRepository, assertions: dict):
+    for assertion_key in (
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ):
+        await repository.load_assertion(assertions[assertion_key])
+    await repository.set_assertion_hashes(
+        {"metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM": "abc"}
+    )
+    assert await repository.get_assertion_hashes() == {
+        "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM": "abc"
+    }
+
+    await repository.delete_assertions(
+        ["metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM"]
+    )
+    assert await repository.get_all_assertion_ids() == [
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"
+    ]
+    assert await repository.get_assertion_hashes() == {}
+    # evidence items that nothing else cites are removed too
+    assert await repository.get_statement("moa.assertion:166") is None
+    assert await repository.get_citing_assertion_ids(["civic.eid:6034"]) == {
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"
+    }
+    assert (
+        await repository.get_statement(
+            "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"
+        )
+        == assertions["metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"]
+    )
+
+
+def test_assertion_batch_params(assertions: dict):
+    """Test that batch load params dedupe shared entities and reference nested evidence"""
+    params = _AssertionBatchParams()
+    for assertion_key in (
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic",
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ):
+        params.add_assertion(assertions[assertion_key])
+
+    # shared entities are only included once
+    assert list(params.methods).count("metakb.method:1") == 1
+    assert "metakb.gene:hgnc_1097" in params.genes
+    assert "metakb.cv:FC.metakb.gene_hgnc_1097" in params.fcc_catvars
+    assert "metakb.cv:PSQ.VA.pfWn9x9oFBRzGda1xXcOrE-BrX0R__N8" in params.dac_catvars
+    assert "metakb.tg:JgptHcUAwUcXajKEtKy7elEoRLldjZN3" in params.therapy_groups
+    assert "doi:10.5281/zenodo.15675452" in params.documents
+
+    assert set(params.statements) >= {
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi",
+        "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+        "civic.eid:2506",
+        "moa.assertion:166",
+        "civic.eid:6034",
+    }
+    # evidence is referenced by ID rather than nested in the statement params
+    assertion_params = params.statements[
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi"
+    ]
+    assert len(assertion_params["has_evidence_lines"]) == 1
+    # documents are built from the graph once loaded, rather than from the input
+    assert "gks_document" not in assertion_params
+    evidence_line_id = assertion_params["has_evidence_lines"][0]["id"]
+    assert params.evidence_lines[evidence_line_id]["statement_item_ids"] == [
+        "civic.eid:2506"
+    ]
+    # existing evidence trees are replaced wholesale, rather than line-by-line
+    assert list(params.replaced_statement_ids) == [
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi",
+        "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    ]
+
+    # statement-level queries don't write any shared entities
+    entity_params = {name for _, name, _ in params.entity_queries()}
+    evidence_params = {name for _, name, _ in params.evidence_queries()}
+    assert entity_params.isdisjoint(evidence_params)
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_load_assertions(repository: Neo4jRepository, assertions: dict):
+    """Test that batch loading produces the same results as individual loading"""
+    assertion_keys = (
+        "BRAF mutation",
+        "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+    )
+    for assertion_key in assertion_keys:
+        await repository.load_assertion(assertions[assertion_key])
+    expected_stats = await repository.get_stats()
+    expected_statements = await repository.search_statements(
+        statement_ids=[
+            "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM",
+            "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+        ]
+    )
+
+    batch = [assertions[k] for k in assertion_keys]
+    for preload_entities in (False, True):
+        await repository.teardown_db()
+        await repository.initialize()
+        if preload_entities:
+            await repository.load_entities(batch, chunk_size=2)
+        await repository.load_assertions(batch, include_entities=not preload_entities)
+        assert await repository.get_stats() == expected_stats
+        assert (
+            await repository.search_statements(
+                statement_ids=[
+                    "metakb.assertion:RXgu1CLSyUKNM3c7-YfTF_lh5meCOnSM",
+                    "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+                ]
+            )
+            == expected_statements
+        )
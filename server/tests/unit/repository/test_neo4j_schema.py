@@ -0,0 +1,82 @@
+"""Test Neo4j schema migrations."""
+
+import re
+
+import pytest
+import pytest_asyncio
+
+from metakb.repository.neo4j_repository import Neo4jRepository, get_driver
+from metakb.repository.neo4j_schema import (
+    get_index_status,
+    get_latest_schema_version,
+    get_migrations,
+    get_schema_version,
+    migrate_schema,
+)
+from metakb.repository.queries import catalog as queries_catalog
+
+
+@pytest_asyncio.fixture
+async def repository():
+    """Provide a new repository session. Wipe all existing DB data and schema."""
+    driver = get_driver()
+    session = driver.session()
+
+    repository = Neo4jRepository(session)
+    await repository.teardown_db()
+
+    yield repository
+
+    await session.close()
+    await driver.close()
+
+
+def test_get_migrations():
+    migrations = get_migrations()
+    assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+    assert get_latest_schema_version() == len(migrations)
+    assert migrations[0].name == "uniqueness_constraints"
+    assert all(m.queries for m in migrations)
+    assert queries_catalog.initialize() == [q for m in migrations for q in m.queries]
+
+
+def test_teardown_drops_migrated_schema():
+    """Anything created by a migration should be removed by teardown"""
+    create_pattern = re.compile(r"CREATE (CONSTRAINT|INDEX) (\w+) IF NOT EXISTS")
+    drop_pattern = re.compile(r"DROP (CONSTRAINT|INDEX) (\w+) IF EXISTS")
+    created = {
+        match.groups()
+        for migration in get_migrations()
+        for query in migration.queries
+        if (match := create_pattern.search(query))
+    }
+    dropped = {
+        match.groups()
+        for query in queries_catalog.teardown()
+        if (match := drop_pattern.search(query))
+    }
+    assert created
+    assert created == dropped
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_migrate_schema(repository: Neo4jRepository):
+    session = repository.session
+    assert await get_schema_version(session) == 0
+
+    latest_version = get_latest_schema_version()
+    assert await migrate_schema(session) == list(range(1, latest_version + 1))
+    assert await get_schema_version(session) == latest_version
+    assert await migrate_schema(session) == []
+
+    indexes = {index.name: index for index in await get_index_status(session)}
+    assert indexes["statement_proposition_type_index"].labels == ["Statement"]
+    assert indexes["statement_proposition_type_index"].properties == [
+        "proposition_type"
+    ]
+    assert {"allele_id_index", "drug_id_index", "gene_id_constraint"} <= set(indexes)
+
+    await repository.teardown_db()
+    assert await get_schema_version(session) == 0
+    assert await get_index_status(session) == []
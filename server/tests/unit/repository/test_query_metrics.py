@@ -0,0 +1,72 @@
+"""Test query timing instrumentation."""
+
+import pytest
+
+from metakb.repository.queries import catalog as queries_catalog
+from metakb.repository.query_metrics import QueryMetrics
+
+
+def test_query_metrics():
+    metrics = QueryMetrics()
+    assert metrics.summarize() == []
+
+    for duration in range(1, 101):
+        metrics.record("search_statements", float(duration), 2, 1, 3)
+    metrics.record("get_gene", 10000.0, 1)
+
+    stats = metrics.summarize()
+    assert [s.name for s in stats] == ["get_gene", "search_statements"]
+    search_stats = stats[1]
+    assert search_stats.count == 100
+    assert search_stats.total_ms == 5050.0
+    assert search_stats.mean_ms == 50.5
+    assert search_stats.p50_ms == 50.0
+    assert search_stats.p95_ms == 95.0
+    assert search_stats.p99_ms == 99.0
+    assert search_stats.max_ms == 100.0
+    assert search_stats.rows == 200
+    assert search_stats.server_available_after_ms == 100
+    assert search_stats.server_consumed_after_ms == 300
+    assert stats[0].p50_ms == stats[0].p99_ms == 10000.0
+    assert stats[0].server_available_after_ms == 0
+
+    summary = metrics.format_summary().splitlines()
+    assert len(summary) == 4
+    assert summary[2].startswith("get_gene")
+
+    metrics.reset()
+    assert metrics.summarize() == []
+
+
+def test_query_metrics_sampling():
+    """Test that memory use is bounded, with totals still covering every execution"""
+    metrics = QueryMetrics(sample_size=100)
+    for duration in range(1, 10001):
+        metrics.record("search_statements", float(duration), 1)
+
+    assert len(metrics._timings["search_statements"].sampled_durations_ms) == 100
+    stats = metrics.summarize()[0]
+    assert stats.count == 10000
+    assert stats.total_ms == 50005000.0
+    assert stats.mean_ms == 5000.5
+    assert stats.max_ms == 10000.0
+    assert stats.rows == 10000
+    # sample is uniform, so percentiles are close to the true values
+    assert 2500 < stats.p50_ms < 7500
+    assert stats.p50_ms <= stats.p95_ms <= stats.p99_ms <= stats.max_ms
+
+
+@pytest.mark.parametrize(
+    ("query", "expected_name"),
+    [
+        (queries_catalog.search_statement_ids(), "search_statement_ids"),
+        (queries_catalog.batch_load_gene(), "batch_load_gene"),
+        (
+            queries_catalog.initialize()[0],
+            "migration_0001_uniqueness_constraints[0]",
+        ),
+        ("MATCH (n) RETURN n", "unnamed"),
+    ],
+)
+def test_get_query_name(query: str, expected_name: str):
+    assert queries_catalog.get_query_name(query) == expected_name
@@ -0,0 +1,50 @@
+"""Test statement cache."""
+
+import json
+from pathlib import Path
+
+import pytest
+from ga4gh.va_spec.base import Statement
+
+from metakb.repository.statement_cache import StatementCache
+
+
+@pytest.fixture
+def statements(test_data_dir: Path):
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    return [
+        Statement(**data[k])
+        for k in (
+            "BRAF mutation",
+            "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+        )
+    ]
+
+
+def test_statement_cache(statements: list[Statement]):
+    cache = StatementCache(max_size=1)
+    ids = [s.id for s in statements]
+    assert cache.get_many(ids, "v1") == {}
+
+    cache.put_many(statements[:1], "v1")
+    assert cache.get_many(ids, "v1") == {ids[0]: statements[0]}
+
+    # least recently used statement is evicted
+    cache.put_many(statements[1:], "v1")
+    assert cache.get_many(ids, "v1") == {ids[1]: statements[1]}
+
+    # new data version discards everything
+    assert cache.get_many(ids, "v2") == {}
+
+    stats = cache.summarize()
+    assert stats.max_size == 1
+    assert stats.size == 0
+    assert stats.data_version == "v2"
+    assert stats.hits == 2
+    assert stats.misses == 6
+    assert stats.evictions == 1
+    assert stats.invalidations == 1
+
+    with pytest.raises(ValueError, match="Must be positive"):
+        StatementCache(max_size=0)
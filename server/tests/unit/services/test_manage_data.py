@@ -1,9 +1,52 @@
 import json
+import zipfile
 from pathlib import Path
 
 import pytest
+import pytest_asyncio
 from ga4gh.va_spec.base import Statement
 
+from metakb import source_data
+from metakb.repository.base import RepositoryMemoryError, RepositoryStats
+from metakb.repository.memory_repository import InMemoryRepository
+from metakb.repository.neo4j_repository import Neo4jRepository, get_driver
+from metakb.schemas.app import ArtifactCompression, CdmFormat, SourceName
+from metakb.schemas.data import TransformedData
+from metakb.services.load_checkpoint import LoadCheckpoint
+from metakb.services.load_data import (
+    StagedLoadValidationError,
+    _get_evidence_ids,
+    _group_assertions,
+    _load_batch,
+    compute_assertion_hash,
+    load_from_json,
+    load_from_json_concurrent,
+    load_from_json_differential,
+    validate_staged_stats,
+)
+from metakb.source_data import (
+    BinaryCdmVersionError,
+    SourceDataStore,
+    iter_cdm_assertions,
+    open_artifact,
+)
+
+
+@pytest_asyncio.fixture
+async def repository():
+    """Provide a new repository session. Wipe all existing DB data and re-initialize."""
+    driver = get_driver()
+    session = driver.session()
+
+    repository = Neo4jRepository(session)
+    await repository.teardown_db()
+    await repository.initialize()
+
+    yield repository
+
+    await session.close()
+    await driver.close()
+
 
 @pytest.fixture(scope="session")
 def statements(test_data_dir: Path):
@@ -14,3 +57,472 @@ def statements(test_data_dir: Path):
 
 def test_load_from_json():
     pass  # TODO
+
+
+def test_group_assertions(test_data_dir: Path):
+    """Test that assertions sharing evidence are always batched together"""
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    moa_assertion, civic_assertion, braf_assertion, other_assertion = (
+        Statement(**data[k])
+        for k in (
+            "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_moa",
+            "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic",
+            "BRAF mutation",
+            "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+        )
+    )
+    assert "civic.eid:2506" in _get_evidence_ids(civic_assertion)
+    assert "moa.assertion:151" in _get_evidence_ids(moa_assertion)
+
+    # both versions of the UYyEPT assertion share an ID, so they stay together even
+    # though they're not adjacent, and the resulting batch exceeds the batch size
+    batches = _group_assertions(
+        [moa_assertion, braf_assertion, civic_assertion, other_assertion], 1
+    )
+    assert batches == [
+        [moa_assertion, civic_assertion],
+        [braf_assertion],
+        [other_assertion],
+    ]
+
+    batches = _group_assertions([braf_assertion, other_assertion, moa_assertion], 2)
+    assert batches == [[braf_assertion, other_assertion], [moa_assertion]]
+
+
+@pytest.mark.asyncio
+async def test_load_from_json_repeated_assertion(test_data_dir: Path, tmp_path: Path):
+    """Test that copies of an assertion within a single file are merged, as they are
+    when the copies are loaded from separate files
+    """
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    assertion_keys = (
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic",
+        "BRAF mutation",
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_moa",
+    )
+    expected = InMemoryRepository()
+    for i, key in enumerate(assertion_keys):
+        cdm = tmp_path / f"cdm_{i}.json"
+        cdm.write_text(
+            TransformedData(assertions=[Statement(**data[key])]).model_dump_json()
+        )
+        await load_from_json(cdm, expected)
+
+    cdm = tmp_path / "cdm.json"
+    cdm.write_text(
+        TransformedData(
+            assertions=[Statement(**data[k]) for k in assertion_keys]
+        ).model_dump_json()
+    )
+    repository = InMemoryRepository()
+    await load_from_json(cdm, repository)
+
+    assert await repository.get_all_assertion_ids() == (
+        await expected.get_all_assertion_ids()
+    )
+    merged = await repository.get_statement(
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi"
+    )
+    assert merged
+    assert len(merged.hasEvidenceLines) == 2
+    # merging mints new evidence line IDs, so compare content only
+    assert [
+        compute_assertion_hash(s) for s in await repository.search_statements()
+    ] == [compute_assertion_hash(s) for s in await expected.search_statements()]
+
+    # copies already in the DB are merged first, then each copy in the file in turn
+    repository = InMemoryRepository()
+    await load_from_json(tmp_path / "cdm_0.json", repository)
+    cdm.write_text(
+        TransformedData(
+            assertions=[Statement(**data[k]) for k in reversed(assertion_keys)]
+        ).model_dump_json()
+    )
+    await load_from_json(cdm, repository)
+    merged = await repository.get_statement(
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi"
+    )
+    assert merged
+    assert len(merged.hasEvidenceLines) == 2
+    assert [
+        compute_assertion_hash(s) for s in await repository.search_statements()
+    ] == [compute_assertion_hash(s) for s in await expected.search_statements()]
+
+
+class _LimitedRepository(InMemoryRepository):
+    """Simulate a DB with a cap on how many assertions fit in one transaction"""
+
+    def __init__(self, max_batch_size: int) -> None:
+        super().__init__()
+        self.max_batch_size = max_batch_size
+        self.batch_sizes = []
+
+    async def load_assertions(
+        self, assertions: list[Statement], include_entities: bool = True
+    ) -> None:
+        if len(assertions) > self.max_batch_size:
+            raise RepositoryMemoryError
+        self.batch_sizes.append(len(assertions))
+        await super().load_assertions(assertions, include_entities)
+
+
+@pytest.mark.asyncio
+async def test_load_batch_split(test_data_dir: Path):
+    """Test that batches which are too big for the repository are split up"""
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    moa_assertion, civic_assertion, braf_assertion, other_assertion = (
+        Statement(**data[k])
+        for k in (
+            "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_moa",
+            "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic",
+            "BRAF mutation",
+            "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+        )
+    )
+
+    repository = _LimitedRepository(1)
+    await _load_batch(repository, [braf_assertion, other_assertion, moa_assertion])
+    assert repository.batch_sizes == [1, 1, 1]
+    assert len(await repository.get_all_assertion_ids()) == 3
+
+    # assertions sharing evidence can't be separated
+    repository = _LimitedRepository(1)
+    with pytest.raises(RepositoryMemoryError):
+        await _load_batch(repository, [braf_assertion, moa_assertion, civic_assertion])
+    assert repository.batch_sizes == [1]
+
+    repository = _LimitedRepository(2)
+    await _load_batch(repository, [braf_assertion, moa_assertion, civic_assertion])
+    assert repository.batch_sizes == [1, 2]
+
+
+def test_iter_cdm_assertions(
+    statements: dict, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that streamed assertions match those from reading the whole file"""
+    # force values to be split across many reads
+    monkeypatch.setattr(source_data, "_STREAM_READ_SIZE", 16)
+    data = TransformedData(
+        evidence=list(statements.values()), assertions=list(statements.values())
+    )
+    path = tmp_path / "cdm.json"
+    path.write_text(data.model_dump_json(exclude_none=True, indent=2))
+    assert list(iter_cdm_assertions(path)) == data.assertions
+
+    path.write_text(json.dumps({"assertions": []}))
+    assert list(iter_cdm_assertions(path)) == []
+
+    path.write_text(data.model_dump_json(exclude_none=True)[:-100])
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_cdm_assertions(path))
+
+
+@pytest.mark.parametrize(
+    "compression", [ArtifactCompression.GZIP, ArtifactCompression.ZSTD]
+)
+def test_compressed_cdm(
+    statements: dict, tmp_path: Path, compression: ArtifactCompression
+):
+    """Test saving and streaming back compressed CDM files"""
+    if compression == ArtifactCompression.ZSTD:
+        pytest.importorskip("zstandard")
+    data = TransformedData(assertions=list(statements.values()))
+    store = SourceDataStore(
+        src_name=SourceName.MOA, transformed_dir=tmp_path, compression=compression
+    )
+    path = store.save_cdm(data)
+    assert path.name.endswith(f".json{compression.suffix}")
+    assert store.get_latest_transformed_file() == path
+    assert list(iter_cdm_assertions(path)) == data.assertions
+    with open_artifact(path) as f:
+        assert f.read().startswith("{")
+
+
+def test_latest_transformed_file(tmp_path: Path):
+    """Test that only complete CDM files are picked, by timestamp"""
+    store = SourceDataStore(src_name=SourceName.MOA, transformed_dir=tmp_path)
+    for name in (
+        "moa_cdm_20250101000000.json.zip",
+        "moa_cdm_20250102000000.json",
+        "moa_cdm_20250103000000.json.zip.part",
+        "moa_cdm_20250103000000.json.zip.etag",
+        "moa_cdm_latest.json",
+    ):
+        (tmp_path / name).write_text("{}")
+    assert store.get_latest_transformed_file() == tmp_path / (
+        "moa_cdm_20250102000000.json"
+    )
+
+
+def test_zipped_cdm(statements: dict, tmp_path: Path):
+    """Test streaming assertions straight out of a zip archive"""
+    data = TransformedData(assertions=list(statements.values()))
+    path = tmp_path / "moa_cdm_20250101000000.json.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "moa_cdm_20250101000000.json", data.model_dump_json(exclude_none=True)
+        )
+    assert list(iter_cdm_assertions(path)) == data.assertions
+
+    with zipfile.ZipFile(path, "a") as archive:
+        archive.writestr("other.json", "{}")
+    with pytest.raises(ValueError, match="exactly one file"):
+        open_artifact(path)
+
+
+def test_binary_cdm(statements: dict, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test saving and streaming back binary CDM files"""
+    monkeypatch.setattr(source_data, "_BINARY_CDM_RECORD_SIZE", 2)
+    data = TransformedData(
+        evidence=list(statements.values())[:1], assertions=list(statements.values())
+    )
+    store = SourceDataStore(
+        src_name=SourceName.MOA, transformed_dir=tmp_path, cdm_format=CdmFormat.BINARY
+    )
+    path = store.save_cdm(data)
+    assert path.suffix == ".cdmb"
+    assert store.get_latest_transformed_file() == path
+    assert list(iter_cdm_assertions(path)) == data.assertions
+
+    # files written in other layouts are refused
+    monkeypatch.setattr(source_data, "BINARY_CDM_FORMAT_VERSION", 1)
+    with pytest.raises(BinaryCdmVersionError, match="Regenerate"):
+        list(iter_cdm_assertions(path))
+    monkeypatch.undo()
+
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(ValueError, match="truncated"):
+        list(iter_cdm_assertions(path))
+    path.write_bytes(b"{}")
+    with pytest.raises(ValueError, match="Not a binary CDM file"):
+        list(iter_cdm_assertions(path))
+
+
+def test_compute_assertion_hash(test_data_dir: Path):
+    """Test that assertion hashes only reflect meaningful content"""
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    assertion = Statement(**data["BRAF mutation"])
+    original_hash = compute_assertion_hash(assertion)
+    assert compute_assertion_hash(Statement(**data["BRAF mutation"])) == original_hash
+
+    # evidence line IDs are regenerated on every transform
+    assertion.hasEvidenceLines[0].id = "metakb.evline:something-else"
+    assert compute_assertion_hash(assertion) == original_hash
+
+    assertion.hasEvidenceLines[0].hasEvidenceItems[0].description = "changed"
+    assert compute_assertion_hash(assertion) != original_hash
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_load_from_json_differential(
+    repository: Neo4jRepository, test_data_dir: Path, tmp_path: Path
+):
+    """Test that differential loads only touch changed assertions"""
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    braf = Statement(**data["BRAF mutation"])
+    other = Statement(**data["metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"])
+    cdm = tmp_path / "cdm.json"
+
+    cdm.write_text(TransformedData(assertions=[braf, other]).model_dump_json())
+    await load_from_json_differential([cdm], repository)
+    hashes = await repository.get_assertion_hashes()
+    assert hashes == {
+        braf.id: hashes[braf.id],
+        other.id: hashes[other.id],
+    }
+    expected_stats = await repository.get_stats()
+
+    # unchanged assertions are skipped, so their stored hashes remain in place
+    await load_from_json_differential([cdm], repository)
+    assert await repository.get_assertion_hashes() == hashes
+    assert await repository.get_stats() == expected_stats
+
+    # changed assertions are rewritten, and missing assertions are removed
+    braf.description = "changed"
+    cdm.write_text(TransformedData(assertions=[braf]).model_dump_json())
+    await load_from_json_differential([cdm], repository)
+    new_hashes = await repository.get_assertion_hashes()
+    assert new_hashes.keys() == {braf.id}
+    assert new_hashes[braf.id] != hashes[braf.id]
+    assert await repository.get_all_assertion_ids() == [braf.id]
+    stored_braf = await repository.get_statement(braf.id)
+    assert stored_braf
+    assert stored_braf.description == "changed"
+
+
+@pytest.mark.asyncio
+async def test_load_from_json_differential_matches_full_load(
+    test_data_dir: Path, tmp_path: Path
+):
+    """Test that a differential load leaves the same statements as a full load of the
+    same files, with no leftover evidence items or stripped copies of assertions
+    """
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    braf = Statement(**data["BRAF mutation"])
+    other = Statement(**data["metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"])
+    # assertion citing another assertion as evidence
+    citing = braf.model_copy(deep=True)
+    citing.id = "metakb.assertion:citing"
+    citing.hasEvidenceLines[0].hasEvidenceItems = [other.model_copy(deep=True)]
+    cdm = tmp_path / "cdm.json"
+
+    repository = InMemoryRepository()
+    cdm.write_text(TransformedData(assertions=[braf, other, citing]).model_dump_json())
+    await load_from_json_differential([cdm], repository)
+
+    # removing `braf` orphans its evidence item, and removing `other` would strip the
+    # copy that `citing` has
+    cdm.write_text(TransformedData(assertions=[citing]).model_dump_json())
+    await load_from_json_differential([cdm], repository)
+    expected = InMemoryRepository()
+    await load_from_json(cdm, expected)
+
+    statements = await repository.search_statements()
+    expected_statements = await expected.search_statements()
+    assert [s.id for s in statements] == [s.id for s in expected_statements]
+    assert [compute_assertion_hash(s) for s in statements] == [
+        compute_assertion_hash(s) for s in expected_statements
+    ]
+    assert (await repository.get_assertion_hashes()).keys() == {citing.id}
+
+
+@pytest.mark.asyncio
+async def test_load_from_json_concurrent(test_data_dir: Path, tmp_path: Path):
+    """Test that loading files concurrently gives the same result as loading them in
+    turn, including for assertions that appear in both
+    """
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    cdms = [tmp_path / "civic_cdm.json", tmp_path / "moa_cdm.json"]
+    cdms[0].write_text(
+        TransformedData(
+            assertions=[
+                Statement(**data[k])
+                for k in (
+                    "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_civic",
+                    "metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz",
+                )
+            ]
+        ).model_dump_json()
+    )
+    cdms[1].write_text(
+        TransformedData(
+            assertions=[
+                Statement(**data[k])
+                for k in (
+                    "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi_moa",
+                    "BRAF mutation",
+                )
+            ]
+        ).model_dump_json()
+    )
+
+    expected = InMemoryRepository()
+    for cdm in cdms:
+        await load_from_json(cdm, expected)
+
+    assert await expected.get_data_version()
+
+    repository = InMemoryRepository()
+    await load_from_json_concurrent(cdms, [repository, repository])
+    assert await repository.get_data_version()
+    assert await repository.get_all_assertion_ids() == (
+        await expected.get_all_assertion_ids()
+    )
+    # merging mints new evidence line IDs, so compare content only
+    assert [
+        compute_assertion_hash(s) for s in await repository.search_statements()
+    ] == [compute_assertion_hash(s) for s in await expected.search_statements()]
+    merged = await repository.get_statement(
+        "metakb.assertion:UYyEPTPQPtrMEQjTbat9Ka396w5YKrCi"
+    )
+    assert merged
+    assert len(merged.hasEvidenceLines) == 2
+
+    with pytest.raises(ValueError, match="at least 2 repositories"):
+        await load_from_json_concurrent(cdms, [repository])
+
+
+def test_load_checkpoint(tmp_path: Path):
+    """Test recording and reading back load progress"""
+    checkpoint_path = tmp_path / "checkpoint.json"
+    cdm = tmp_path / "cdm.json"
+    cdm.write_text(TransformedData().model_dump_json())
+
+    checkpoint = LoadCheckpoint(checkpoint_path)
+    assert checkpoint.start_file(cdm) == 0
+    checkpoint.update(cdm, 100)
+    assert LoadCheckpoint(checkpoint_path).start_file(cdm) == 100
+    checkpoint.update(cdm, 150, complete=True)
+    assert LoadCheckpoint(checkpoint_path).start_file(cdm) == -1
+
+    # progress on a file whose contents have since changed is discarded
+    cdm.write_text(TransformedData(assertions=[]).model_dump_json(indent=2))
+    checkpoint = LoadCheckpoint(checkpoint_path)
+    assert checkpoint.start_file(cdm) == 0
+
+    checkpoint.clear()
+    assert not checkpoint_path.exists()
+    assert LoadCheckpoint(checkpoint_path).start_file(cdm) == 0
+
+    checkpoint_path.write_text("{not json")
+    assert LoadCheckpoint(checkpoint_path).start_file(cdm) == 0
+
+
+@pytest.mark.ci_only
+@pytest.mark.asyncio
+async def test_load_from_json_resume(
+    repository: Neo4jRepository, test_data_dir: Path, tmp_path: Path
+):
+    """Test that a checkpointed load skips assertions which were already committed"""
+    with (test_data_dir / "repository" / "assertions.json").open() as f:
+        data = json.load(f)
+    braf = Statement(**data["BRAF mutation"])
+    other = Statement(**data["metakb.assertion:Bc6f65XfxIgXv77i5sNsJh0lLaLRIPyz"])
+    cdm = tmp_path / "cdm.json"
+    cdm.write_text(TransformedData(assertions=[braf, other]).model_dump_json())
+
+    # simulate a load that was interrupted after committing the first assertion
+    checkpoint = LoadCheckpoint(tmp_path / "checkpoint.json")
+    checkpoint.start_file(cdm)
+    checkpoint.update(cdm, 1)
+
+    await load_from_json(cdm, repository, chunk_size=1, checkpoint=checkpoint)
+    assert await repository.get_all_assertion_ids() == [other.id]
+    assert LoadCheckpoint(tmp_path / "checkpoint.json").start_file(cdm) == -1
+
+    # loading an already-completed file is a no-op
+    await load_from_json(cdm, repository, checkpoint=checkpoint)
+    assert await repository.get_all_assertion_ids() == [other.id]
+
+
+def test_validate_staged_stats():
+    """Test sanity checks on staged loads before cutover"""
+    live_stats = RepositoryStats(
+        num_genes=10,
+        num_drugs=10,
+        num_diseases=10,
+        num_variations=10,
+        num_source_statements=100,
+        num_documents=10,
+        num_metakb_assertions=100,
+    )
+    validate_staged_stats(live_stats, None)
+    validate_staged_stats(live_stats, live_stats)
+    validate_staged_stats(
+        live_stats.model_copy(update={"num_metakb_assertions": 90}), live_stats
+    )
+
+    with pytest.raises(StagedLoadValidationError, match="89 assertions"):
+        validate_staged_stats(
+            live_stats.model_copy(update={"num_metakb_assertions": 89}), live_stats
+        )
+    with pytest.raises(StagedLoadValidationError, match="num_genes"):
+        validate_staged_stats(live_stats.model_copy(update={"num_genes": 0}), None)
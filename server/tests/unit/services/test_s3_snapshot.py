@@ -0,0 +1,109 @@
+"""Test retrieval of CDM snapshots from S3."""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import BinaryIO
+
+import pytest
+
+from metakb.services.s3_snapshot import retrieve_snapshot
+
+
+class _FakePaginator:
+    def __init__(self, client: "_FakeS3Client") -> None:
+        self.client = client
+
+    def paginate(self, Bucket: str, Prefix: str, Delimiter: str | None = None):  # noqa: N803
+        self.client.list_calls.append((Prefix, Delimiter))
+        keys = sorted(k for k in self.client.objects[Bucket] if k.startswith(Prefix))
+        if Delimiter:
+            prefixes = sorted(
+                {
+                    Prefix + k[len(Prefix) :].split(Delimiter)[0] + Delimiter
+                    for k in keys
+                }
+            )
+            yield {"CommonPrefixes": [{"Prefix": p} for p in prefixes]}
+        else:
+            yield {
+                "Contents": [
+                    {
+                        "Key": k,
+                        "Size": len(self.client.objects[Bucket][k]),
+                        "ETag": f'"{hashlib.md5(self.client.objects[Bucket][k]).hexdigest()}"',  # noqa: S324
+                    }
+                    for k in keys
+                ]
+            }
+
+
+class _FakeS3Client:
+    """Minimal in-memory stand-in for the parts of the S3 client that are used"""
+
+    def __init__(self, objects: dict[str, dict[str, bytes]]) -> None:
+        self.objects = objects
+        self.list_calls = []
+        self.downloads = []
+        self._lock = threading.Lock()
+
+    def get_paginator(self, operation_name: str) -> _FakePaginator:
+        assert operation_name == "list_objects_v2"
+        return _FakePaginator(self)
+
+    def download_fileobj(self, Bucket: str, Key: str, Fileobj: BinaryIO) -> None:  # noqa: N803
+        with self._lock:
+            self.downloads.append(Key)
+        Fileobj.write(self.objects[Bucket][Key])
+
+
+@pytest.fixture
+def s3_client():
+    return _FakeS3Client(
+        {
+            "vicc-metakb": {
+                "cdm/20240101/civic_cdm_20240101.json.zip": b"old civic",
+                "cdm/20250101/civic_cdm_20250101.json.zip": b"civic",
+                "cdm/20250101/moa_cdm_20250101.json.zip": b"moa",
+                "cdm/20250101/README.md": b"readme",
+                "cdm/latest.txt": b"20250101",
+            }
+        }
+    )
+
+
+def test_retrieve_snapshot(s3_client: _FakeS3Client, tmp_path: Path):
+    retrieval = retrieve_snapshot(s3_client, data_dir=tmp_path)
+    assert retrieval.version == "20250101"
+    assert retrieval.paths == {
+        "civic": tmp_path / "civic" / "transformers" / "civic_cdm_20250101.json.zip",
+        "moa": tmp_path / "moa" / "transformers" / "moa_cdm_20250101.json.zip",
+    }
+    assert retrieval.downloaded == ["civic", "moa"]
+    assert retrieval.paths["civic"].read_bytes() == b"civic"
+    # only the newest snapshot's contents are listed
+    assert s3_client.list_calls == [("cdm/", "/"), ("cdm/20250101/", None)]
+    assert sorted(s3_client.downloads) == [
+        "cdm/20250101/civic_cdm_20250101.json.zip",
+        "cdm/20250101/moa_cdm_20250101.json.zip",
+    ]
+
+    # files that are already present are skipped
+    s3_client.downloads = []
+    retrieval = retrieve_snapshot(s3_client, data_dir=tmp_path)
+    assert retrieval.skipped == ["civic", "moa"]
+    assert s3_client.downloads == []
+
+    # ...unless they've changed
+    s3_client.objects["vicc-metakb"]["cdm/20250101/moa_cdm_20250101.json.zip"] = b"MOA"
+    retrieval = retrieve_snapshot(s3_client, data_dir=tmp_path)
+    assert retrieval.downloaded == ["moa"]
+    assert retrieval.paths["moa"].read_bytes() == b"MOA"
+    assert not list(tmp_path.glob("**/*.part"))
+
+
+def test_retrieve_snapshot_missing(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        retrieve_snapshot(
+            _FakeS3Client({"vicc-metakb": {"cdm/README.md": b""}}), data_dir=tmp_path
+        )
@@ -1,13 +1,21 @@
 """Test search statement methods"""
 
+import asyncio
 import re
+import threading
+from unittest.mock import MagicMock
 
 import pytest
 
+from metakb import normalizers
 from metakb.repository.base import AbstractRepository
+from metakb.schemas.api import SearchTerm, SearchTermType
 from metakb.services.search import (
+    BATCH_SEARCH_MAX_CONCURRENCY,
     PaginationParamError,
+    _normalize_in_executor,
     batch_search_statements,
+    create_normalizer_executor,
     search_statements,
 )
 
@@ -82,6 +90,33 @@ async def test_paginate_search(repository, normalizers):
     ):
         await search_statements(repository, normalizers, variation=braf_va_id, limit=-1)
 
+    # test cursor
+    cursor_response = await search_statements(
+        repository, normalizers, variation=braf_va_id, limit=1
+    )
+    assert cursor_response.next_cursor
+    next_response = await search_statements(
+        repository,
+        normalizers,
+        variation=braf_va_id,
+        limit=1,
+        cursor=cursor_response.next_cursor,
+    )
+    assert next_response.statements == full_response.statements[1:2]
+    assert huge_page_response.next_cursor is None
+    with pytest.raises(PaginationParamError, match="at most one of start and cursor"):
+        await search_statements(
+            repository,
+            normalizers,
+            variation=braf_va_id,
+            start=1,
+            cursor=cursor_response.next_cursor,
+        )
+    with pytest.raises(PaginationParamError, match="Invalid cursor value"):
+        await search_statements(
+            repository, normalizers, variation=braf_va_id, cursor="notacursor"
+        )
+
 
 @pytest.mark.asyncio(scope="module")
 async def test_paginate_batch_search(repository: AbstractRepository, normalizers):
@@ -138,3 +173,111 @@ async def test_paginate_batch_search(repository: AbstractRepository, normalizers
         match=re.escape("Invalid limit value: -1. Must be nonnegative."),
     ):
         await batch_search_statements(repository, normalizers, [braf_va_id], limit=-1)
+
+    # walk all pages with a cursor
+    cursor_statements = []
+    cursor = None
+    while True:
+        page = await batch_search_statements(
+            repository, normalizers, [braf_va_id], limit=2, cursor=cursor
+        )
+        cursor_statements.extend(page.statements)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert cursor_statements == full_response.statements
+
+
+@pytest.mark.asyncio
+async def test_normalize_in_executor():
+    """Blocking normalizer lookups should be run off of the event loop"""
+
+    def get_normalized(normalizer, term: str) -> SearchTerm:
+        return SearchTerm(
+            term=term,
+            term_type=SearchTermType.GENE,
+            resolved_id=threading.current_thread().name,
+        )
+
+    executor = create_normalizer_executor()
+    try:
+        search_term = await _normalize_in_executor(
+            get_normalized, None, "BRAF", executor
+        )
+    finally:
+        executor.shutdown()
+    assert search_term.term == "BRAF"
+    assert search_term.resolved_id.startswith("metakb-normalizer")
+
+
+@pytest.mark.asyncio
+async def test_normalizer_thread_query_handlers(monkeypatch):
+    """Each thread should look up concepts with its own normalizer instances, and
+    share cached results
+    """
+    lookups = []
+
+    class _QueryHandler:
+        def __init__(self, db) -> None:
+            self.db = db
+
+        def normalize(self, query: str) -> MagicMock:
+            lookups.append((threading.current_thread().name, query))
+            return MagicMock(match_type=0)
+
+    for concept in ("gene", "disease", "therapy"):
+        monkeypatch.setattr(normalizers, f"create_{concept}_db", lambda _: object())
+        monkeypatch.setattr(
+            normalizers, f"{concept.capitalize()}QueryHandler", _QueryHandler
+        )
+
+    async def normalize_variation(_query: str) -> None:
+        return None
+
+    variation_query_handler = MagicMock()
+    variation_query_handler.return_value.normalize_handler.normalize = (
+        normalize_variation
+    )
+    monkeypatch.setattr(normalizers, "VariationQueryHandler", variation_query_handler)
+    normalizer = normalizers.ViccNormalizers()
+    main_handlers = normalizer._get_query_handlers()
+    assert normalizer._get_query_handlers() is main_handlers
+
+    executor = create_normalizer_executor()
+    try:
+        loop = asyncio.get_running_loop()
+        worker_handlers = await loop.run_in_executor(
+            executor, normalizer._get_query_handlers
+        )
+        await loop.run_in_executor(executor, normalizer.normalize_gene, "BRAF")
+    finally:
+        executor.shutdown()
+    assert worker_handlers.gene is not main_handlers.gene
+    assert worker_handlers.gene.db is not main_handlers.gene.db
+
+    normalizer.normalize_gene("BRAF")
+    assert len(lookups) == 1
+    assert lookups[0][0].startswith("metakb-normalizer")
+
+
+@pytest.mark.asyncio
+async def test_batch_search_concurrency():
+    """Batch search should only normalize a bounded number of variations at once"""
+
+    class _Normalizer:
+        def __init__(self) -> None:
+            self.running = 0
+            self.max_running = 0
+
+        async def normalize_variation(self, _query: str) -> None:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            await asyncio.sleep(0)
+            self.running -= 1
+
+    normalizer = _Normalizer()
+    variations = [f"BRAF V{i}E" for i in range(BATCH_SEARCH_MAX_CONCURRENCY * 3)]
+    result = await batch_search_statements(None, normalizer, variations)
+    assert len(result.search_terms) == len(variations)
+    assert not result.statements
+    assert normalizer.max_running == BATCH_SEARCH_MAX_CONCURRENCY
@@ -1,5 +1,7 @@
 """Check basic functions of general endpoint(s)"""
 
+import asyncio
+import json
 from pathlib import Path
 
 import jsonschema
@@ -8,6 +10,11 @@ import yaml
 from fastapi.testclient import TestClient
 
 from metakb.main import app
+from metakb.repository.memory_repository import InMemoryRepository
+from metakb.repository.query_metrics import QueryMetrics
+from metakb.repository.statement_cache import StatementCache
+from metakb.restapi.dependencies import get_repository
+from metakb.restapi.response_cache import ResponseCache, _add_duration
 
 
 @pytest.fixture(scope="module")
@@ -32,3 +39,123 @@ def test_service_info(client: TestClient, test_data_dir: Path):
     resolver = jsonschema.RefResolver.from_schema(spec)
     data = response.json()
     jsonschema.validate(instance=data, schema=resp_schema, resolver=resolver)
+
+
+def test_query_metrics(client: TestClient):
+    app.state.query_metrics = None
+    response = client.get("/api/metrics/queries")
+    assert response.status_code == 404
+
+    app.state.query_metrics = QueryMetrics()
+    app.state.query_metrics.record("get_counts", 12.5, 7)
+    response = client.get("/api/metrics/queries")
+    response.raise_for_status()
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["name"] == "get_counts"
+    assert data[0]["count"] == 1
+    assert data[0]["rows"] == 7
+
+
+def test_statement_cache_metrics(client: TestClient):
+    app.state.statement_cache = None
+    response = client.get("/api/metrics/statement_cache")
+    assert response.status_code == 404
+
+    app.state.statement_cache = StatementCache(max_size=10)
+    app.state.statement_cache.get_many(["civic.eid:1"], "abc")
+    response = client.get("/api/metrics/statement_cache")
+    response.raise_for_status()
+    data = response.json()
+    assert data["max_size"] == 10
+    assert data["size"] == 0
+    assert data["data_version"] == "abc"
+    assert data["misses"] == 1
+
+
+def test_response_cache(tmp_path: Path):
+    cache = ResponseCache(max_bytes=10, disk_dir=tmp_path)
+    assert cache.get("a", "v1") is None
+    cache.put("a", "v1", b"12345")
+    cache.put("b", "v1", b"67890")
+    assert cache.get("a", "v1") == b"12345"
+
+    # least recently used body is evicted from memory, but kept on disk
+    cache.put("c", "v1", b"abc")
+    stats = cache.summarize()
+    assert stats.entries == 2
+    assert stats.evictions == 1
+    assert cache.get("b", "v1") == b"67890"
+    assert cache.summarize().disk_hits == 1
+
+    # a new data version discards bodies for the old one, in both tiers
+    assert cache.get("a", "v2") is None
+    assert not (tmp_path / "v_v1").exists()
+    assert ResponseCache(max_bytes=10, disk_dir=tmp_path).get("a", "v1") is None
+    cache.put("a", "v2", b"xyz")
+    assert ResponseCache(max_bytes=10, disk_dir=tmp_path).get("a", "v2") == b"xyz"
+
+
+def test_add_duration():
+    assert json.loads(_add_duration(b'{"a":[1]}', "duration_s", 0.25)) == {
+        "a": [1],
+        "duration_s": 0.25,
+    }
+    assert json.loads(_add_duration(b"{}", "duration_s", 1.5)) == {"duration_s": 1.5}
+
+
+def test_stats_conditional_request(client: TestClient):
+    repository = InMemoryRepository()
+    app.dependency_overrides[get_repository] = lambda: repository
+    app.state.response_cache = ResponseCache(max_bytes=1024 * 1024)
+    try:
+        response = client.get("/api/stats")
+        response.raise_for_status()
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "public, no-cache"
+        assert response.json() == (
+            client.get("/api/stats", headers={"If-None-Match": "x"}).json()
+        )
+
+        response = client.get("/api/stats", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert not response.content
+
+        cache_response = client.get("/api/metrics/response_cache")
+        cache_response.raise_for_status()
+        data = cache_response.json()
+        assert data["entries"] == 1
+        assert data["hits"] == 1
+        assert data["misses"] == 1
+        assert data["not_modified"] == 1
+
+        # reloading data changes the version, so cached copies are out of date
+        asyncio.run(repository.update_data_version())
+        response = client.get("/api/stats", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    finally:
+        app.dependency_overrides.clear()
+        app.state.response_cache = None
+
+
+def test_search_not_conditional(client: TestClient):
+    """Search responses depend on normalizer data, so shouldn't be revalidated"""
+    repository = InMemoryRepository()
+    app.dependency_overrides[get_repository] = lambda: repository
+    app.state.normalizer = None
+    app.state.normalizer_executor = None
+    try:
+        response = client.get(
+            "/api/batch_search/statements", headers={"If-None-Match": "*"}
+        )
+        response.raise_for_status()
+        assert "etag" not in response.headers
+        assert "duration_s" in response.json()
+
+        # invalid params are still rejected
+        response = client.get("/api/search/statements", headers={"If-None-Match": "*"})
+        assert response.status_code == 422
+    finally:
+        app.dependency_overrides.clear()